@@ -0,0 +1,281 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from geo import LatLon, geocode, haversine_miles_many, parse_place
+
+DEFAULT_PAIR_CACHE = 1 << 18  # Location pairs kept in the LRU
+
+# Row key: (kind, asset id), e.g. ('driver', 'D001') or ('truck', 'T001')
+RowKey = Tuple[str, str]
+
+
+class _AssetRows:
+    """Table observer feeding one kind of asset (drivers or trucks) into a DistanceMatrix."""
+
+    def __init__(self, matrix: "DistanceMatrix", kind: str, id_attr: str, location_attr: str):
+        self.matrix = matrix
+        self.kind = kind
+        self.id_attr = id_attr
+        self.location_attr = location_attr
+
+    def upsert(self, entity: Any) -> None:
+        self.matrix.set_row((self.kind, getattr(entity, self.id_attr)), getattr(entity, self.location_attr, None))
+
+    def remove(self, entity_id: str) -> None:
+        self.matrix.remove_row((self.kind, entity_id))
+
+    def clear(self) -> None:
+        self.matrix.clear_rows(self.kind)
+
+
+class DistanceMatrix:
+    """
+    Many-to-many distance and drive-time matrix: asset locations (rows) by
+    load origins (columns).
+
+    Places are interned to location ids, so "Dallas, TX" and "DALLAS,TX/"
+    share one id and one set of coordinates. Distances are kept per
+    (row location id, column location id) pair in an LRU cache and only
+    missing pairs are computed, in one vectorized haversine. The
+    materialized matrix is updated row by row: an asset whose location did
+    not change is never recomputed, and a moved asset only recomputes its
+    own row. Replacing the columns recomputes every row from the pair cache.
+    """
+
+    def __init__(self, pair_cache_size: int = DEFAULT_PAIR_CACHE):
+        self.pair_cache_size = pair_cache_size
+        self._lock = threading.RLock()
+        self._place_ids: Dict[Tuple[Any, ...], int] = {}
+        self._spellings: Dict[str, int] = {}
+        self._points: List[LatLon] = []
+        self._pairs: "OrderedDict[Tuple[int, int], float]" = OrderedDict()
+        self._row_keys: List[RowKey] = []
+        self._rows: Dict[RowKey, int] = {}
+        self._row_locations: List[int] = []
+        self._column_ids: List[str] = []
+        self._column_locations: List[int] = []
+        self._miles = np.empty((0, 0))
+        self._dirty: set = set()
+        self.hits = 0
+        self.misses = 0
+
+    # Locations
+    def location_id(self, place: Optional[str]) -> int:
+        """
+        Intern a place.
+
+        Args:
+            place (str): Place as written (city and state, or ZIP)
+
+        Returns:
+            int: Location id shared by every spelling of the place
+        """
+        place = place or ""
+        location_id = self._spellings.get(place)
+        if location_id is not None:
+            return location_id
+        key = parse_place(place)
+        with self._lock:
+            location_id = self._place_ids.get(key)
+            if location_id is None:
+                location_id = len(self._points)
+                self._points.append(geocode(place) or (math.nan, math.nan))
+                self._place_ids[key] = location_id
+            self._spellings[place] = location_id
+        return location_id
+
+    def _pair_block(self, origins: Sequence[int], destinations: Sequence[int]) -> np.ndarray:
+        # Miles for every (origin, destination) location pair, from the LRU where possible
+        block = np.empty((len(origins), len(destinations)))
+        missing: List[Tuple[int, int]] = []
+        pairs = self._pairs
+        for i, origin in enumerate(origins):
+            for j, destination in enumerate(destinations):
+                miles = pairs.get((origin, destination))
+                if miles is None:
+                    missing.append((i, j))
+                else:
+                    pairs.move_to_end((origin, destination))
+                    block[i, j] = miles
+        self.hits += len(origins) * len(destinations) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            points = np.asarray(self._points)
+            rows, cols = np.asarray(missing).T
+            origin_ids = np.asarray(origins)[rows]
+            destination_ids = np.asarray(destinations)[cols]
+            starts, ends = points[origin_ids], points[destination_ids]
+            computed = haversine_miles_many((starts[:, 0], starts[:, 1]), ends[:, 0], ends[:, 1])
+            block[rows, cols] = computed
+            for origin, destination, miles in zip(origin_ids.tolist(), destination_ids.tolist(), computed.tolist()):
+                pairs[(origin, destination)] = miles
+            while len(pairs) > self.pair_cache_size:
+                pairs.popitem(last=False)
+        return block
+
+    # Rows
+    def set_row(self, key: RowKey, place: Optional[str]) -> None:
+        """
+        Add an asset row or move it; nothing is recomputed if the location is unchanged.
+
+        Args:
+            key (tuple): (kind, asset id)
+            place (str): The asset's current location
+        """
+        location_id = self.location_id(place)
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self._row_keys)
+                self._rows[key] = row
+                self._row_keys.append(key)
+                self._row_locations.append(location_id)
+            elif self._row_locations[row] == location_id:
+                return
+            else:
+                self._row_locations[row] = location_id
+            self._dirty.add(row)
+
+    def remove_row(self, key: RowKey) -> None:
+        """
+        Drop an asset row, moving the last row into its place.
+
+        Args:
+            key (tuple): (kind, asset id)
+        """
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return
+            last = len(self._row_keys) - 1
+            if row != last:
+                moved = self._row_keys[last]
+                self._row_keys[row] = moved
+                self._row_locations[row] = self._row_locations[last]
+                self._rows[moved] = row
+                if last < len(self._miles):
+                    self._miles[row] = self._miles[last]
+                if last in self._dirty:
+                    self._dirty.add(row)
+            self._row_keys.pop()
+            self._row_locations.pop()
+            self._dirty.discard(last)
+
+    def clear_rows(self, kind: str) -> None:
+        """Drop every row of one kind of asset."""
+        with self._lock:
+            for key in [key for key in self._row_keys if key[0] == kind]:
+                self.remove_row(key)
+
+    def observer(self, kind: str, id_attr: str, location_attr: str) -> _AssetRows:
+        """
+        Get a table observer (upsert, remove, clear) that keeps one kind of asset's rows current.
+
+        Args:
+            kind (str): Row kind, e.g. 'driver'
+            id_attr (str): Entity id attribute
+            location_attr (str): Entity location attribute
+
+        Returns:
+            The observer to append to the table's observers
+        """
+        return _AssetRows(self, kind, id_attr, location_attr)
+
+    # Columns
+    def set_columns(self, columns: Sequence[Tuple[str, Optional[str]]]) -> None:
+        """
+        Replace the columns; every row is recomputed unless they are unchanged.
+
+        Args:
+            columns (list): (column id, place) pairs, e.g. (order number, shipper city)
+        """
+        column_ids = [column_id for column_id, _ in columns]
+        locations = [self.location_id(place) for _, place in columns]
+        with self._lock:
+            if column_ids == self._column_ids and locations == self._column_locations:
+                return
+            self._column_ids = column_ids
+            self._column_locations = locations
+            self._miles = np.empty((0, len(column_ids)))
+            self._dirty = set(range(len(self._row_keys)))
+
+    # Results
+    def _refresh(self) -> None:
+        size = len(self._row_keys)
+        if len(self._miles) < size:
+            grown = np.empty((max(size, 2 * len(self._miles), 64), len(self._column_ids)))
+            grown[:len(self._miles)] = self._miles
+            self._miles = grown
+        if not self._dirty:
+            return
+        rows = np.fromiter(self._dirty, dtype=np.int64, count=len(self._dirty))
+        origins, inverse = np.unique(np.asarray(self._row_locations)[rows], return_inverse=True)
+        destinations, columns = np.unique(np.asarray(self._column_locations, dtype=np.int64), return_inverse=True)
+        block = self._pair_block(origins.tolist(), destinations.tolist())
+        self._miles[rows] = block[inverse.reshape(-1)][:, columns.reshape(-1)]
+        self._dirty.clear()
+
+    def miles(self) -> Tuple[List[RowKey], List[str], np.ndarray]:
+        """
+        Get the current matrix, recomputing only the rows that changed.
+
+        Returns:
+            tuple: Row keys, column ids and a (rows x columns) copy of the
+            miles, NaN where either place is not in the gazetteer
+        """
+        with self._lock:
+            self._refresh()
+            return list(self._row_keys), list(self._column_ids), self._miles[:len(self._row_keys)].copy()
+
+    def nearest(self, kind: str, limit: int) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Get the closest assets of one kind to each column.
+
+        Args:
+            kind (str): Row kind, e.g. 'driver'
+            limit (int): Assets per column
+
+        Returns:
+            dict: Column id to (asset id, miles) pairs, nearest first; assets
+            whose location is not in the gazetteer are left out
+
+        Raises:
+            ValueError: If the limit is negative
+        """
+        if limit < 0:
+            raise ValueError("limit must not be negative")
+        with self._lock:
+            self._refresh()
+            rows = np.fromiter((key[0] == kind for key in self._row_keys), dtype=bool, count=len(self._row_keys))
+            asset_ids = np.asarray([key[1] for key in self._row_keys], dtype=object)[rows]
+            miles = self._miles[:len(self._row_keys)][rows]
+            column_ids = list(self._column_ids)
+        by_column = np.ascontiguousarray(miles.T)  # One contiguous row of distances per column
+        by_column[np.isnan(by_column)] = np.inf  # Unknown places rank last
+        if limit < by_column.shape[1]:
+            candidates = np.argpartition(by_column, limit - 1, axis=1)[:, :limit]
+        else:
+            candidates = np.broadcast_to(np.arange(by_column.shape[1]), by_column.shape)
+        nearest = {}
+        for j, column_id in enumerate(column_ids):
+            distances = by_column[j]
+            order = candidates[j][np.argsort(distances[candidates[j]], kind='stable')]
+            order = order[np.isfinite(distances[order])]
+            nearest[column_id] = list(zip(asset_ids[order].tolist(), distances[order].tolist()))
+        return nearest
+
+    def stats(self) -> Dict[str, int]:
+        """Get the matrix shape and pair cache counters."""
+        return {
+            'rows': len(self._row_keys),
+            'columns': len(self._column_ids),
+            'locations': len(self._points),
+            'cached_pairs': len(self._pairs),
+            'pair_hits': self.hits,
+            'pair_misses': self.misses
+        }
+
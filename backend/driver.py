@@ -1,18 +1,22 @@
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel
+from typing import Optional, List, Dict, Any, Callable, ClassVar
 import logging
+from versioning import Versioned
+from events import emit
+from expiries import ParsedDate
+from eligibility import failed_rules
+from geo import distance_miles, within_range
 
 # Get logger
 logger = logging.getLogger('dispatch_logger')
 
 
-class Driver(BaseModel):
+class Driver(Versioned):
     driver_id: str
     first_name: str
     last_name: str
     license_number: str
-    license_expiry: Optional[str] = None
+    license_expiry: Optional[str]
     email: str
     current_location: str
     is_available: bool
@@ -22,15 +26,45 @@ class Driver(BaseModel):
     assigned_truck_id_string: str
     phone_number: str
     emergency_contact: str
-    hire_date: Optional[str] = None
+    hire_date: Optional[str]
     background_check_valid: bool
     hours_worked_today: float
     certifications: List[str]
-    last_rest_period: Optional[str] = None
+    last_rest_period: Optional[str]
     certifications_list_strings: List[str]
     drug_test_current: bool
-    employment_status: str
-    hire_date_string: Optional[str] = None
+    medical_cert_current: bool
+    assigned_fleet: Optional[str]
+    medical_cert_expiry: Optional[str]
+
+    # Callbacks fired as (driver, old_location, new_location) after update_location
+    location_listeners: ClassVar[List[Callable[["Driver", str, str], None]]] = []
+
+    # Callbacks fired as (driver, field_name) after a license or certificate is renewed
+    expiry_listeners: ClassVar[List[Callable[["Driver", str], None]]] = []
+
+    # Attributes persisted by to_record/from_record
+    RECORD_FIELDS: ClassVar[tuple] = (
+        'driver_id', 'first_name', 'last_name', 'license_number', 'license_expiry', 'email',
+        'current_location', 'is_available', 'driver_reports_ready', 'assigned_truck_id',
+        'has_personal_needs', 'assigned_truck_id_string', 'phone_number', 'emergency_contact',
+        'hire_date', 'background_check_valid', 'hours_worked_today', 'certifications',
+        'last_rest_period', 'certifications_list_strings', 'drug_test_current', 'medical_cert_current',
+        'assigned_fleet', 'medical_cert_expiry'
+    )
+
+    # Defaults for fields added after records were first persisted
+    RECORD_DEFAULTS: ClassVar[dict] = {'assigned_fleet': None, 'medical_cert_expiry': None}
+
+    # Fixed attribute layout instead of a per-instance __dict__; the pydantic
+    # schema used at the API boundary lives in schemas.DriverSchema. Expiry
+    # dates live in _license_expiry / _medical_cert_expiry with their parsed day
+    __slots__ = tuple(field for field in RECORD_FIELDS if field not in ('license_expiry', 'medical_cert_expiry')) + (
+        '_license_expiry', '_medical_cert_expiry', '_eligibility')
+
+    # Parsed once on assignment; read the dates with license_expiry_date / medical_cert_expiry_date
+    license_expiry = ParsedDate()
+    medical_cert_expiry = ParsedDate()
 
     def __init__(self, driver_id: str, first_name: str, last_name: str, license_number: str):
         """
@@ -64,8 +98,10 @@ class Driver(BaseModel):
         self.certifications_list_strings = []  # Alternative certifications list
         self.drug_test_current = False  # Default to False
         self.medical_cert_current = False  # Default to False
+        self.medical_cert_expiry = None
+        self.assigned_fleet = None  # Fleet this driver belongs to; None when unassigned
         
-        logger.info(f"Driver {self.driver_id} initialized: {self.first_name} {self.last_name} (License: {self.license_number})")
+        emit(logging.INFO, "Driver %s initialized: %s %s (License: %s)", self.driver_id, self.first_name, self.last_name, self.license_number, console=False)
     
     def assign_to_truck(self, truck_id: str) -> bool:
         """
@@ -78,23 +114,22 @@ class Driver(BaseModel):
             bool: True if successful, False otherwise
         """
         if self.assigned_truck_id:
-            print(f"Driver {self.driver_id} is already assigned to truck {self.assigned_truck_id}")
+            emit(None, "Driver %s is already assigned to truck %s", self.driver_id, self.assigned_truck_id)
             return False
         
         if not self.is_available:
-            print(f"Driver {self.driver_id} is not available for assignment")
+            emit(None, "Driver %s is not available for assignment", self.driver_id)
             return False
         
         if not self.check_driving_eligibility():
-            print(f"Driver {self.driver_id} is not eligible to drive")
+            emit(None, "Driver %s is not eligible to drive", self.driver_id)
             return False
         
         # TODO: Validate truck_id exists when Truck class integration is complete
         self.assigned_truck_id = truck_id
         self.assigned_truck_id_string = truck_id  # Keep both fields in sync
         self.is_available = False
-        logger.info(f"Driver {self.driver_id} ({self.first_name} {self.last_name}) assigned to truck {truck_id}")
-        print(f"Driver {self.driver_id} assigned to truck {truck_id}")
+        emit(logging.INFO, "Driver %s (%s %s) assigned to truck %s", self.driver_id, self.first_name, self.last_name, truck_id)
         return True
     
     def unassign_from_truck(self) -> bool:
@@ -105,15 +140,14 @@ class Driver(BaseModel):
             bool: True if successful, False otherwise
         """
         if not self.assigned_truck_id:
-            print(f"Driver {self.driver_id} is not assigned to any truck")
+            emit(None, "Driver %s is not assigned to any truck", self.driver_id)
             return False
         
         old_truck = self.assigned_truck_id
         self.assigned_truck_id = ""
         self.assigned_truck_id_string = ""
         self.is_available = True
-        logger.info(f"Driver {self.driver_id} ({self.first_name} {self.last_name}) unassigned from truck {old_truck}")
-        print(f"Driver {self.driver_id} unassigned from truck {old_truck}")
+        emit(logging.INFO, "Driver %s (%s %s) unassigned from truck %s", self.driver_id, self.first_name, self.last_name, old_truck)
         return True
     
     def check_license_validity(self) -> bool:
@@ -125,11 +159,11 @@ class Driver(BaseModel):
         """
         # TODO: Implement actual date checking when license_expiry is properly set
         if not self.license_expiry:
-            print(f"License expiry date not set for driver {self.driver_id}")
+            emit(None, "License expiry date not set for driver %s", self.driver_id)
             return False
         
         # Placeholder implementation - would check against current date
-        print(f"License validity checked for driver {self.driver_id}")
+        emit(None, "License validity checked for driver %s", self.driver_id)
         return True
     
     def check_medical_certification(self) -> bool:
@@ -150,12 +184,12 @@ class Driver(BaseModel):
         """
         # Cannot set available if assigned to truck
         if available and self.assigned_truck_id:
-            print(f"Cannot set driver {self.driver_id} as available while assigned to truck {self.assigned_truck_id}")
+            emit(None, "Cannot set driver %s as available while assigned to truck %s", self.driver_id, self.assigned_truck_id)
             return
         
         self.is_available = available
         status_text = "available" if available else "unavailable"
-        print(f"Driver {self.driver_id} is now {status_text}")
+        emit(None, "Driver %s is now %s", self.driver_id, status_text)
     
     def check_drug_test_status(self) -> bool:
         """
@@ -176,10 +210,10 @@ class Driver(BaseModel):
         # TODO: Implement certification validation logic
         # This would check expiry dates for each certification
         if not self.certifications and not self.certifications_list_strings:
-            print(f"No certifications found for driver {self.driver_id}")
+            emit(None, "No certifications found for driver %s", self.driver_id)
             return False
         
-        print(f"Certifications checked for driver {self.driver_id}")
+        emit(None, "Certifications checked for driver %s", self.driver_id)
         return True
     
     def check_driving_eligibility(self) -> bool:
@@ -189,20 +223,31 @@ class Driver(BaseModel):
         Returns:
             bool: True if eligible, False otherwise
         """
-        eligibility_checks = [
-            self.check_license_validity(),
-            self.check_medical_certification(),
-            self.check_drug_test_status(),
-            self.background_check_valid,
-            self.is_available
-        ]
-        
-        is_eligible = all(eligibility_checks)
+        is_eligible = not self.eligibility_failures()
         eligibility_text = "eligible" if is_eligible else "not eligible"
-        logger.info(f"Driver {self.driver_id} driving eligibility check: {eligibility_text}")
-        print(f"Driver {self.driver_id} is {eligibility_text} to drive")
+        emit(logging.INFO, "Driver %s driving eligibility check: %s", self.driver_id, eligibility_text)
         return is_eligible
     
+    def eligibility_failures(self, all_reasons: bool = False) -> List[str]:
+        """
+        Get the eligibility rules this driver fails (see eligibility.DRIVER_RULES).
+        
+        The result is cached until one of the driver's attributes changes, so
+        repeated checks during assignment and reporting cost a tuple compare.
+        
+        Args:
+            all_reasons (bool): Report every failed rule instead of only the first
+            
+        Returns:
+            list: Reason codes, e.g. ['MEDICAL_CERT_NOT_CURRENT']; empty when eligible
+        """
+        key = (self.version, all_reasons)
+        cached = getattr(self, '_eligibility', None)
+        if cached is None or cached[0] != key:
+            cached = (key, failed_rules(self, all_reasons))
+            object.__setattr__(self, '_eligibility', cached)
+        return list(cached[1])
+    
     def log_driving_hours(self, hours: float) -> bool:
         """
         Log driving hours for the day and check compliance.
@@ -214,19 +259,17 @@ class Driver(BaseModel):
             bool: True if within legal limits, False otherwise
         """
         if hours < 0:
-            print("Invalid hours value")
+            emit(None, "Invalid hours value")
             return False
         
         self.hours_worked_today += hours
         
         # DOT regulations: 11 hours driving, 14 hours on-duty
         if self.hours_worked_today > 11.0:
-            logger.warning(f"Driver {self.driver_id} has exceeded 11-hour driving limit. Total: {self.hours_worked_today} hours")
-            print(f"WARNING: Driver {self.driver_id} has exceeded 11-hour driving limit")
+            emit(logging.WARNING, "Driver %s has exceeded 11-hour driving limit. Total: %s hours", self.driver_id, self.hours_worked_today)
             return False
         
-        logger.info(f"Logged {hours} hours for driver {self.driver_id}. Total today: {self.hours_worked_today}")
-        print(f"Logged {hours} hours for driver {self.driver_id}. Total today: {self.hours_worked_today}")
+        emit(logging.INFO, "Logged %s hours for driver %s. Total today: %s", hours, self.driver_id, self.hours_worked_today)
         return True
     
     def take_rest_period(self) -> None:
@@ -236,7 +279,7 @@ class Driver(BaseModel):
         # TODO: Implement proper date handling
         self.last_rest_period = datetime.now().date()
         self.hours_worked_today = 0.0  # Reset daily hours after rest
-        print(f"Rest period recorded for driver {self.driver_id}. Daily hours reset.")
+        emit(None, "Rest period recorded for driver %s. Daily hours reset.", self.driver_id)
     
     def submit_driver_reports(self) -> bool:
         """
@@ -247,7 +290,7 @@ class Driver(BaseModel):
         """
         # TODO: Implement actual report submission logic
         self.driver_reports_ready = True
-        print(f"Driver reports submitted for driver {self.driver_id}")
+        emit(None, "Driver reports submitted for driver %s", self.driver_id)
         return True
     
     def check_personal_needs(self) -> bool:
@@ -264,7 +307,7 @@ class Driver(BaseModel):
         Mark that driver's personal needs have been addressed.
         """
         self.has_personal_needs = False
-        print(f"Personal needs addressed for driver {self.driver_id}")
+        emit(None, "Personal needs addressed for driver %s", self.driver_id)
     
     def resolve_personal_needs(self) -> None:
         """
@@ -281,8 +324,9 @@ class Driver(BaseModel):
         """
         old_location = self.current_location
         self.current_location = new_location
-        logger.info(f"Driver {self.driver_id} location updated from '{old_location}' to '{new_location}'")
-        print(f"Driver {self.driver_id} location updated from '{old_location}' to '{new_location}'")
+        for listener in self.location_listeners:
+            listener(self, old_location, new_location)
+        emit(logging.INFO, "Driver %s location updated from '%s' to '%s'", self.driver_id, old_location, new_location)
     
     def renew_medical_certificate(self, expiry_date=None) -> None:
         """
@@ -291,9 +335,34 @@ class Driver(BaseModel):
         Args:
             expiry_date: New expiry date for medical certificate
         """
-        # TODO: Implement proper date handling
         self.medical_cert_current = True
-        print(f"Medical certificate renewed for driver {self.driver_id}")
+        if expiry_date is not None:
+            self.medical_cert_expiry = expiry_date
+        for listener in self.expiry_listeners:
+            listener(self, 'medical_cert_expiry')
+        emit(None, "Medical certificate renewed for driver %s", self.driver_id)
+    
+    @property
+    def license_expiry_date(self) -> Optional[date]:
+        """License expiry as parsed when it was assigned; None if unset or unparseable."""
+        return Driver.license_expiry.parsed(self)
+    
+    @property
+    def medical_cert_expiry_date(self) -> Optional[date]:
+        """Medical certificate expiry as parsed when it was assigned; None if unset or unparseable."""
+        return Driver.medical_cert_expiry.parsed(self)
+    
+    def renew_license(self, expiry_date) -> None:
+        """
+        Renew the driver's license.
+        
+        Args:
+            expiry_date: New expiry date for the license
+        """
+        self.license_expiry = expiry_date
+        for listener in self.expiry_listeners:
+            listener(self, 'license_expiry')
+        emit(None, "License renewed for driver %s", self.driver_id)
     
     def update_certifications(self, cert_list: List[str]) -> None:
         """
@@ -304,7 +373,7 @@ class Driver(BaseModel):
         """
         self.certifications = cert_list.copy()
         self.certifications_list_strings = cert_list.copy()  # Keep both in sync
-        print(f"Certifications updated for driver {self.driver_id}: {cert_list}")
+        emit(None, "Certifications updated for driver %s: %s", self.driver_id, cert_list)
     
     def add_certification(self, certification: str) -> None:
         """
@@ -316,9 +385,9 @@ class Driver(BaseModel):
         if certification not in self.certifications:
             self.certifications.append(certification)
             self.certifications_list_strings.append(certification)
-            print(f"Added certification '{certification}' for driver {self.driver_id}")
+            emit(None, "Added certification '%s' for driver %s", certification, self.driver_id)
     
-    def calculate_distance_to(self, destination: str) -> float:
+    def calculate_distance_to(self, destination: str) -> Optional[float]:
         """
         Calculate distance from current location to destination.
         
@@ -326,16 +395,38 @@ class Driver(BaseModel):
             destination (str): Destination location
             
         Returns:
-            float: Distance in miles (placeholder implementation)
+            float: Great-circle distance in miles, or None when either place
+            cannot be geocoded
         """
-        # TODO: Implement actual GPS/mapping calculation
         if not self.current_location:
-            print(f"Cannot calculate distance - driver {self.driver_id} location unknown")
+            emit(None, "Cannot calculate distance - driver %s location unknown", self.driver_id)
             return 0.0
         
-        placeholder_distance = 50.0  # Default placeholder distance
-        print(f"Distance from {self.current_location} to {destination}: {placeholder_distance} miles")
-        return placeholder_distance
+        distance = distance_miles(self.current_location, destination)
+        if distance is None:
+            emit(None, "Cannot calculate distance - %s or %s not in gazetteer", self.current_location, destination)
+            return None
+        emit(None, "Distance from %s to %s: %.1f miles", self.current_location, destination, distance)
+        return distance
+    
+    def check_in_range_to(self, destination: str, max_miles: Optional[float] = None,
+                          max_hours: Optional[float] = None) -> bool:
+        """
+        Check if the driver is in range of a destination.
+        
+        Args:
+            destination (str): Destination location
+            max_miles (float): Greatest distance in range (default geo.RANGE_MILES)
+            max_hours (float): Greatest estimated drive time in range
+            
+        Returns:
+            bool: True if the distance is within the limits; False when the
+            driver has no location or either place is not in the gazetteer
+        """
+        if not self.current_location:
+            emit(None, "Cannot determine range - driver %s location unknown", self.driver_id)
+            return False
+        return bool(within_range(distance_miles(self.current_location, destination), max_miles, max_hours))
     
     def check_work_eligibility(self) -> bool:
         """
@@ -350,9 +441,14 @@ class Driver(BaseModel):
         """
         Get comprehensive status information about the driver.
         
+        The result is cached until one of the driver's attributes changes.
+        
         Returns:
             dict: Dictionary containing driver status information
         """
+        return self._memoized((), self._build_driver_status)
+    
+    def _build_driver_status(self) -> Dict[str, Any]:
         return {
             'driver_id': self.driver_id,
             'full_name': f"{self.first_name} {self.last_name}",
@@ -385,9 +481,40 @@ class Driver(BaseModel):
             'background_check_valid': self.background_check_valid,
             'certifications': self.certifications,
             'hours_compliance': self.hours_worked_today <= 11.0,
-            'overall_compliance': self.check_driving_eligibility()
+            'overall_compliance': self.check_driving_eligibility(),
+            'eligibility_reasons': self.eligibility_failures(all_reasons=True)
         }
     
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Get the driver's persisted attributes as a plain dict.
+        
+        Returns:
+            dict: Attribute name to value for every field in RECORD_FIELDS
+        """
+        record = {field: getattr(self, field) for field in self.RECORD_FIELDS}
+        record['certifications'] = list(self.certifications)
+        record['certifications_list_strings'] = list(self.certifications_list_strings)
+        return record
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Driver":
+        """
+        Rebuild a driver from a dict produced by to_record, without re-running __init__.
+        
+        Args:
+            record (dict): Persisted driver attributes
+            
+        Returns:
+            Driver: The restored driver
+        """
+        driver = cls.__new__(cls)
+        for field in cls.RECORD_FIELDS:
+            setattr(driver, field, record[field] if field in record else cls.RECORD_DEFAULTS[field])
+        driver.certifications = list(driver.certifications)
+        driver.certifications_list_strings = list(driver.certifications_list_strings)
+        return driver
+    
     def __str__(self) -> str:
         """
         String representation of the driver.
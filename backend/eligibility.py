@@ -0,0 +1,44 @@
+from typing import Any, Callable, List, Tuple
+
+# Reason codes returned when a driver fails an eligibility rule
+LICENSE_NOT_SET = 'LICENSE_NOT_SET'
+MEDICAL_CERT_NOT_CURRENT = 'MEDICAL_CERT_NOT_CURRENT'
+DRUG_TEST_NOT_CURRENT = 'DRUG_TEST_NOT_CURRENT'
+BACKGROUND_CHECK_INVALID = 'BACKGROUND_CHECK_INVALID'
+NOT_AVAILABLE = 'NOT_AVAILABLE'
+
+# Rule: (reason code, fleet_columns driver column holding the same check, predicate)
+Rule = Tuple[str, str, Callable[[Any], bool]]
+
+# The rules of Driver.check_driving_eligibility, in evaluation order. Both the
+# per-driver check and the batch pass in FleetColumns.driver_eligibility read
+# this table, so the API and the dashboards apply the same rules.
+DRIVER_RULES: List[Rule] = [
+    (LICENSE_NOT_SET, 'license_set', lambda d: bool(d.license_expiry)),
+    (MEDICAL_CERT_NOT_CURRENT, 'medical_cert_current', lambda d: bool(d.medical_cert_current)),
+    (DRUG_TEST_NOT_CURRENT, 'drug_test_current', lambda d: bool(d.drug_test_current)),
+    (BACKGROUND_CHECK_INVALID, 'background_check_valid', lambda d: bool(d.background_check_valid)),
+    (NOT_AVAILABLE, 'is_available', lambda d: bool(d.is_available)),
+]
+
+REASON_CODES: Tuple[str, ...] = tuple(code for code, _, _ in DRIVER_RULES)
+
+
+def failed_rules(driver: Any, all_reasons: bool = False) -> List[str]:
+    """
+    Evaluate the eligibility rules for one driver.
+
+    Args:
+        driver: The driver to check
+        all_reasons (bool): Evaluate every rule instead of stopping at the first failure
+
+    Returns:
+        list: Reason codes of the failed rules, in rule order; empty when eligible
+    """
+    reasons = []
+    for code, _, passes in DRIVER_RULES:
+        if not passes(driver):
+            reasons.append(code)
+            if not all_reasons:
+                break
+    return reasons
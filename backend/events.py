@@ -0,0 +1,90 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+# Get logger
+logger = logging.getLogger('dispatch_logger')
+
+# A sink receives (level, message, args, console): level is a logging level,
+# or None for console-only messages; message is a %-style template that has
+# not been formatted yet; console says whether the event used to be printed.
+EventSink = Callable[[Optional[int], str, Tuple[Any, ...], bool], None]
+
+
+def console_sink(level: Optional[int], message: str, args: Tuple[Any, ...], console: bool) -> None:
+    """
+    Default sink: log the event and echo it to stdout, as entities always have.
+
+    Args:
+        level (int): Logging level, or None to skip the log
+        message (str): %-style template
+        args (tuple): Template arguments
+        console (bool): Also print the message
+    """
+    if level is not None:
+        logger.log(level, message, *args)
+    if console:
+        print(message % args if args else message)
+
+
+def log_only_sink(level: Optional[int], message: str, args: Tuple[Any, ...], console: bool) -> None:
+    """Sink for services: keep the log records, drop the console echo."""
+    if level is not None:
+        logger.log(level, message, *args)
+
+
+# FLEET_EVENTS=off starts with no sink (silent), =log with log_only_sink
+_SINKS_BY_NAME = {'console': console_sink, 'log': log_only_sink, 'off': None}
+_sink: Optional[EventSink] = _SINKS_BY_NAME.get(os.getenv("FLEET_EVENTS", "console"), console_sink)
+_state = threading.local()
+
+
+def emit(level: Optional[int], message: str, *args: Any, console: bool = True) -> None:
+    """
+    Report an entity state transition to the current sink.
+
+    Formatting is left to the sink, so when events are off (or silenced on
+    this thread) a call costs one check and nothing is formatted or written.
+
+    Args:
+        level (int): Logging level (logging.INFO, ...), or None for console-only messages
+        message (str): %-style template, e.g. "Truck %s drove to %s"
+        *args: Template arguments
+        console (bool): Whether the message is also meant for the console
+    """
+    sink = _sink
+    if sink is None or getattr(_state, 'silenced', False):
+        return
+    sink(level, message, args, console)
+
+
+def set_event_sink(sink: Optional[EventSink]) -> Optional[EventSink]:
+    """
+    Replace the process-wide sink.
+
+    Args:
+        sink: New sink, or None to turn entity events off
+
+    Returns:
+        The previous sink
+    """
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def get_event_sink() -> Optional[EventSink]:
+    return _sink
+
+
+@contextmanager
+def silenced() -> Iterator[None]:
+    """Drop every entity event raised by the current thread for the duration of a with block."""
+    previous = getattr(_state, 'silenced', False)
+    _state.silenced = True
+    try:
+        yield
+    finally:
+        _state.silenced = previous
@@ -0,0 +1,187 @@
+import threading
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Entry in an ExpiryIndex: (expiry day, entity id, field name)
+ExpiryEntry = Tuple[date, str, str]
+
+# Expiry attributes tracked for each entity kind
+EXPIRY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'driver': ('license_expiry', 'medical_cert_expiry'),
+    'truck': ('registration_expiry',),
+    'trailer': ('registration_expiry',),
+}
+
+
+def parse_expiry(value: Any) -> Optional[date]:
+    """
+    Convert an expiry attribute into a date.
+
+    Accepts the same values as Truck.check_registration: date or datetime
+    objects, and strings in YYYY-MM-DD or MM/DD/YYYY format.
+
+    Args:
+        value: Stored expiry value
+
+    Returns:
+        date: The expiry day, or None if unset or unparseable
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                continue
+    return None
+
+
+class ParsedDate:
+    """
+    Expiry attribute that is parsed into a date once, when it is assigned.
+
+    Reads return the value exactly as assigned, so records, reports and API
+    payloads are unchanged; the parsed day is kept next to it in a private
+    slot ("_" + attribute name) and read with parsed(), so validity checks
+    and fleet-wide sweeps never re-run strptime.
+    """
+
+    def __init__(self, parse: Callable[[Any], Optional[date]] = parse_expiry):
+        self.parse = parse
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.slot = '_' + name
+
+    def __get__(self, entity: Any, owner: Optional[type] = None) -> Any:
+        if entity is None:
+            return self
+        try:
+            return getattr(entity, self.slot)[0]
+        except AttributeError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, entity: Any, value: Any) -> None:
+        object.__setattr__(entity, self.slot, (value, self.parse(value)))
+
+    def parsed(self, entity: Any) -> Optional[date]:
+        """
+        Get the day parsed when the attribute was last assigned.
+
+        Args:
+            entity: Entity holding the attribute
+
+        Returns:
+            date: The expiry day, or None if unset or unparseable
+        """
+        return getattr(entity, self.slot, (None, None))[1]
+
+
+def expiry_day(entity: Any, field: str) -> Optional[date]:
+    """
+    Get an entity's expiry as a date, using the value parsed at assignment
+    when the field is a ParsedDate.
+
+    Args:
+        entity: Driver, truck or trailer
+        field (str): Expiry attribute name
+
+    Returns:
+        date: The expiry day, or None if unset or unparseable
+    """
+    descriptor = getattr(type(entity), field, None)
+    if isinstance(descriptor, ParsedDate):
+        return descriptor.parsed(entity)
+    return parse_expiry(getattr(entity, field, None))
+
+
+class ExpiryIndex:
+    """
+    Time-ordered index of upcoming expiries for one entity kind.
+
+    Keeps a sorted list of (day, id, field) entries plus a reverse map from
+    (id, field) to day, so "what expires between two days" is a pair of
+    binary searches and a slice rather than a scan over the fleet.
+
+    Implements the table observer interface (upsert, remove, clear), so it
+    stays current as entities are stored, saved or deleted. Writers from
+    different threads are serialized by an internal lock.
+    """
+
+    def __init__(self, id_attr: str, fields: Iterable[str]):
+        self.id_attr = id_attr
+        self.fields = tuple(fields)
+        self._entries: List[ExpiryEntry] = []
+        self._days: Dict[Tuple[str, str], date] = {}
+        self._lock = threading.Lock()
+
+    def _set(self, entity_id: str, field: str, day: Optional[date]) -> None:
+        old_day = self._days.get((entity_id, field))
+        if old_day == day:
+            return
+        if old_day is not None:
+            del self._entries[bisect_left(self._entries, (old_day, entity_id, field))]
+            del self._days[(entity_id, field)]
+        if day is not None:
+            insort(self._entries, (day, entity_id, field))
+            self._days[(entity_id, field)] = day
+
+    # Table observer interface
+    def upsert(self, entity: Any) -> None:
+        entity_id = getattr(entity, self.id_attr)
+        days = [expiry_day(entity, field) for field in self.fields]
+        with self._lock:
+            for field, day in zip(self.fields, days):
+                self._set(entity_id, field, day)
+
+    def remove(self, entity_id: str) -> None:
+        with self._lock:
+            for field in self.fields:
+                self._set(entity_id, field, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._days.clear()
+
+    def rebuild(self, entities: Iterable[Any]) -> None:
+        """Re-index every entity from scratch."""
+        days = {}
+        for entity in entities:
+            entity_id = getattr(entity, self.id_attr)
+            for field in self.fields:
+                day = expiry_day(entity, field)
+                if day is not None:
+                    days[(entity_id, field)] = day
+        entries = sorted((day, entity_id, field) for (entity_id, field), day in days.items())
+        with self._lock:
+            self._days, self._entries = days, entries
+
+    def between(self, start: Optional[date], end: date) -> List[ExpiryEntry]:
+        """
+        Get every expiry falling on or between two days, soonest first.
+
+        Args:
+            start (date): First day of the range, or None for everything already expired too
+            end (date): Last day of the range (inclusive)
+
+        Returns:
+            list: (day, entity id, field) entries
+        """
+        with self._lock:
+            low = 0 if start is None else bisect_left(self._entries, (start,))
+            high = bisect_left(self._entries, (end + timedelta(days=1),))
+            return self._entries[low:high]
+
+    def expiry_of(self, entity_id: str, field: str) -> Optional[date]:
+        """Get the indexed expiry day of one entity's field, or None."""
+        return self._days.get((entity_id, field))
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,462 @@
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from eligibility import DRIVER_RULES, REASON_CODES
+from geo import LatLon, coordinates, haversine_miles_many, within_range
+
+# Column spec: (name, dtype, extractor). dtype "category" stores int32 codes
+# into a per-column table of normalized strings.
+ColumnSpec = Tuple[str, Any, Callable[[Any], Any]]
+
+CATEGORY = "category"
+NAT = np.datetime64("NaT", "D")
+
+
+def _location_key(location: Optional[str]) -> str:
+    return (location or "").lower()
+
+
+def _registration_day(entity: Any) -> np.datetime64:
+    # Day parsed when the expiry was assigned (see expiries.ParsedDate); NaT if unset or unparseable
+    day = entity.registration_expiry_date
+    return NAT if day is None else np.datetime64(day, "D")
+
+
+def _registration_parsed(entity: Any) -> bool:
+    # A missing expiry is fine; a set one must have parsed
+    return not entity.registration_expiry or entity.registration_expiry_date is not None
+
+
+DRIVER_COLUMNS: List[ColumnSpec] = [
+    ('is_available', np.bool_, lambda d: bool(d.is_available)),
+    ('has_truck', np.bool_, lambda d: bool(d.assigned_truck_id)),
+    ('license_set', np.bool_, lambda d: bool(d.license_expiry)),
+    ('medical_cert_current', np.bool_, lambda d: bool(d.medical_cert_current)),
+    ('drug_test_current', np.bool_, lambda d: bool(d.drug_test_current)),
+    ('background_check_valid', np.bool_, lambda d: bool(d.background_check_valid)),
+    ('hours_worked_today', np.float32, lambda d: d.hours_worked_today),
+    ('location', CATEGORY, lambda d: _location_key(d.current_location)),
+]
+
+TRUCK_COLUMNS: List[ColumnSpec] = [
+    ('is_drivable', np.bool_, lambda t: bool(t.is_drivable)),
+    ('has_registration', np.bool_, lambda t: bool(t.has_registration)),
+    ('registration_expiry', "datetime64[D]", _registration_day),
+    ('registration_parsed', np.bool_, _registration_parsed),
+    ('has_driver', np.bool_, lambda t: bool(t.driver_id)),
+    ('has_trailer', np.bool_, lambda t: bool(t.attached_trailer_id)),
+    ('max_capacity', np.float64, lambda t: t.max_capacity),
+    ('mileage', np.int64, lambda t: t.mileage),
+    ('year', np.int32, lambda t: t.year),
+    ('location', CATEGORY, lambda t: _location_key(t.location)),
+]
+
+TRAILER_COLUMNS: List[ColumnSpec] = [
+    ('is_working_condition', np.bool_, lambda t: bool(t.is_working_condition)),
+    ('is_attached', np.bool_, lambda t: bool(t.attached_truck_id)),
+    ('has_registration', np.bool_, lambda t: bool(t.has_registration)),
+    ('registration_expiry', "datetime64[D]", _registration_day),
+    ('registration_parsed', np.bool_, _registration_parsed),
+    ('insurance_valid', np.bool_, lambda t: bool(t.insurance_valid)),
+    ('max_cargo_capacity', np.float64, lambda t: t.max_cargo_capacity),
+    ('current_cargo_weight', np.float64, lambda t: t.current_cargo_weight),
+    ('location', CATEGORY, lambda t: _location_key(t.location)),
+]
+
+
+class ColumnTable:
+    """
+    Struct-of-arrays copy of one entity type.
+
+    Each column is a NumPy array with one row per entity; rows are appended at
+    the end and removed by moving the last row into the hole, so every column
+    stays dense. Storage tables call upsert/remove/clear as entities change,
+    from whichever writer thread made the change. generation counts those
+    changes, so results derived from the columns can be cached until it moves.
+
+    Unlike entity reads in storage, reads here take the writers' lock: a
+    growing table resizes its columns one at a time, and a reader slicing in
+    between would get columns of different lengths. Readers hold it only to
+    take a view or copy of the rows, and do the vectorized work after
+    releasing it, so a read waits for at most one row write or grow.
+    """
+
+    def __init__(self, id_attr: str, spec: List[ColumnSpec], capacity: int = 1024):
+        self.id_attr = id_attr
+        self.spec = spec
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._size = 0
+        self._rows: Dict[str, int] = {}
+        self._ids = np.empty(capacity, dtype=object)
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+        for name, dtype, _ in spec:
+            if dtype == CATEGORY:
+                self._arrays[name] = np.zeros(capacity, dtype=np.int32)
+                self._codes[name] = {}
+            else:
+                self._arrays[name] = np.zeros(capacity, dtype=dtype)
+
+    def _grow(self) -> None:
+        capacity = len(self._ids) * 2
+        self._ids = np.resize(self._ids, capacity)
+        for name, array in self._arrays.items():
+            self._arrays[name] = np.resize(array, capacity)
+
+    def _code(self, name: str, value: str) -> int:
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def upsert(self, entity: Any) -> None:
+        """
+        Write an entity's current values into its row, adding the row if needed.
+
+        Args:
+            entity: The entity to copy into the columns
+        """
+        entity_id = getattr(entity, self.id_attr)
+        values = [extract(entity) for _, _, extract in self.spec]
+        with self._lock:
+            self.generation += 1
+            row = self._rows.get(entity_id)
+            if row is None:
+                if self._size == len(self._ids):
+                    self._grow()
+                row = self._size
+                self._size += 1
+                self._rows[entity_id] = row
+                self._ids[row] = entity_id
+            for (name, dtype, _), value in zip(self.spec, values):
+                if dtype == CATEGORY:
+                    value = self._code(name, value)
+                self._arrays[name][row] = value
+
+    def remove(self, entity_id: str) -> None:
+        """
+        Drop an entity's row, moving the last row into its place.
+
+        Args:
+            entity_id (str): Id of the entity to drop
+        """
+        with self._lock:
+            row = self._rows.pop(entity_id, None)
+            if row is None:
+                return
+            self.generation += 1
+            last = self._size - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._ids[row] = moved_id
+                for array in self._arrays.values():
+                    array[row] = array[last]
+                self._rows[moved_id] = row
+            self._ids[last] = None
+            self._size = last
+
+    def clear(self) -> None:
+        """Drop every row."""
+        with self._lock:
+            self.generation += 1
+            self._rows.clear()
+            self._ids[:self._size] = None
+            self._size = 0
+
+    def rebuild(self, entities: Iterable[Any]) -> None:
+        """
+        Replace every row with the given entities.
+
+        Args:
+            entities: Entities to load
+        """
+        with self._lock:
+            self.clear()
+            for entity in entities:
+                self.upsert(entity)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get a read-only view of one column, one element per stored entity.
+
+        Args:
+            name (str): Column name
+
+        Returns:
+            np.ndarray: Column values
+        """
+        with self._lock:
+            view = self._arrays[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def equals(self, name: str, value: str) -> np.ndarray:
+        """
+        Get a mask of rows whose categorical column equals a value.
+
+        Args:
+            name (str): Categorical column name
+            value (str): Normalized value to match
+
+        Returns:
+            np.ndarray: Boolean mask
+        """
+        with self._lock:
+            code = self._codes[name].get(value)
+            if code is None:
+                return np.zeros(self._size, dtype=bool)
+            view = self.column(name)
+        return view == code
+
+    def categories(self, name: str) -> List[str]:
+        """
+        Get the normalized values of a categorical column, indexed by code.
+
+        Codes are only ever added, so a list fetched earlier stays a prefix of this one.
+
+        Args:
+            name (str): Categorical column name
+
+        Returns:
+            list: Value of each code
+        """
+        with self._lock:
+            return list(self._codes[name])
+
+    def ids(self, mask: Optional[np.ndarray] = None) -> List[str]:
+        """
+        Get the ids of the rows selected by a mask.
+
+        Args:
+            mask (np.ndarray): Boolean mask over the rows (default every row);
+                rows added or dropped since it was built are left out
+
+        Returns:
+            list: Entity ids in row order
+        """
+        with self._lock:
+            if mask is None:
+                return self._ids[:self._size].tolist()
+            rows = min(len(mask), self._size)
+            return self._ids[:rows][mask[:rows]].tolist()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._rows
+
+
+class FleetColumns:
+    """
+    Columnar view of drivers, trucks and trailers for vectorized filtering.
+
+    The masks below mirror the per-object checks in storage (is_available,
+    is_roadworthy, is_working_condition, ...) without calling any entity
+    methods, so they do no printing or logging.
+    """
+
+    def __init__(self):
+        self.drivers = ColumnTable('driver_id', DRIVER_COLUMNS)
+        self.trucks = ColumnTable('truck_id', TRUCK_COLUMNS)
+        self.trailers = ColumnTable('trailer_id', TRAILER_COLUMNS)
+        self._eligibility: Dict[bool, Tuple[int, np.ndarray]] = {}
+        self._location_points: Dict[int, np.ndarray] = {}
+
+    # Drivers
+    def available_drivers_mask(self) -> np.ndarray:
+        return self.drivers.column('is_available').copy()
+
+    def driver_eligibility(self, all_reasons: bool = False) -> np.ndarray:
+        """
+        Evaluate eligibility.DRIVER_RULES for every driver row in one pass.
+
+        Rules run in order; unless all_reasons is set, each rule only reads
+        the rows that passed every earlier rule, and a row's first failure is
+        the only one reported. The result is cached until a driver row changes.
+
+        Args:
+            all_reasons (bool): Evaluate every rule on every row
+
+        Returns:
+            np.ndarray: Read-only (rows x rules) boolean matrix, True where a row fails a rule
+        """
+        d = self.drivers
+        cached = self._eligibility.get(all_reasons)
+        if cached is not None and cached[0] == d.generation:
+            return cached[1]
+        generation = d.generation
+        failures = np.zeros((len(d), len(DRIVER_RULES)), dtype=bool)
+        rows = np.arange(len(d))
+        for i, (_, column, _) in enumerate(DRIVER_RULES):
+            if all_reasons:
+                failures[:, i] = ~d.column(column)
+                continue
+            if not rows.size:
+                break
+            passed = d.column(column)[rows]
+            failures[rows[~passed], i] = True
+            rows = rows[passed]
+        failures.flags.writeable = False
+        self._eligibility[all_reasons] = (generation, failures)
+        return failures
+
+    def ineligible_drivers(self, all_reasons: bool = False) -> Dict[str, List[str]]:
+        """
+        Get the failed rules of every ineligible driver.
+
+        Args:
+            all_reasons (bool): Report every failed rule instead of only the first
+
+        Returns:
+            dict: Driver id to reason codes, in rule order
+        """
+        failures = self.driver_eligibility(all_reasons)
+        rows = np.flatnonzero(failures.any(axis=1))
+        ids = self.drivers._ids[rows]
+        return {driver_id: [REASON_CODES[i] for i in np.flatnonzero(failures[row])]
+                for driver_id, row in zip(ids.tolist(), rows)}
+
+    def eligible_drivers_mask(self) -> np.ndarray:
+        """Same rule as Driver.check_driving_eligibility."""
+        return ~self.driver_eligibility().any(axis=1)
+
+    def drivers_at_mask(self, location: str) -> np.ndarray:
+        return self.drivers.equals('location', _location_key(location))
+
+    # Locations (every table has a categorical location column)
+    def location_points(self, table: ColumnTable) -> np.ndarray:
+        """
+        Get the coordinates of every location code of a table.
+
+        Each distinct location is geocoded once, when it first appears.
+
+        Args:
+            table (ColumnTable): The drivers, trucks or trailers table
+
+        Returns:
+            np.ndarray: (codes x 2) lat/lon array, NaN for places not in the gazetteer
+        """
+        places = table.categories('location')
+        points = self._location_points.get(id(table), np.empty((0, 2)))
+        if len(points) < len(places):
+            points = np.vstack([points, coordinates(places[len(points):])])
+            self._location_points[id(table)] = points
+        return points
+
+    def distances_to(self, table: ColumnTable, point: LatLon) -> np.ndarray:
+        """
+        Great-circle miles from every row's location to a point.
+
+        Distances are computed once per distinct location, then spread to
+        the rows, so a roster of thousands in a few hundred cities costs a few
+        hundred haversines.
+
+        Args:
+            table (ColumnTable): The drivers, trucks or trailers table
+            point (tuple): (lat, lon) in degrees
+
+        Returns:
+            np.ndarray: Distance per row, NaN where the location is not in the gazetteer
+        """
+        points = self.location_points(table)
+        return haversine_miles_many(point, points[:, 0], points[:, 1])[table.column('location')]
+
+    def in_range(self, table: ColumnTable, point: LatLon, max_miles: Optional[float] = None,
+                 max_hours: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Check every row's reach to a point in one pass.
+
+        Rows whose location is blank or not in the gazetteer have no distance
+        and are never in range, matching the per-object range checks.
+
+        Args:
+            table (ColumnTable): The drivers, trucks or trailers table
+            point (tuple): (lat, lon) in degrees
+            max_miles (float): Greatest distance in range (see geo.within_range)
+            max_hours (float): Greatest estimated drive time in range
+
+        Returns:
+            tuple: Distance per row (NaN where it cannot be measured) and the in-range mask
+        """
+        miles = self.distances_to(table, point)
+        return miles, within_range(miles, max_miles, max_hours)
+
+    def by_distance(self, table: ColumnTable, point: LatLon, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Get the rows with a known location ordered by distance to a point.
+
+        Args:
+            table (ColumnTable): The drivers, trucks or trailers table
+            point (tuple): (lat, lon) in degrees
+            limit (int): Return at most this many rows
+
+        Returns:
+            list: (entity id, miles) pairs, nearest first
+        """
+        distances = self.distances_to(table, point)
+        located = ~np.isnan(distances)
+        miles = distances[located]
+        order = np.argsort(miles, kind='stable')[:limit]
+        ids = table._ids[:len(table)][located][order]
+        return list(zip(ids.tolist(), miles[order].tolist()))
+
+    # Registrations (trucks and trailers share the registration columns)
+    @staticmethod
+    def registration_status_masks(table: ColumnTable, as_of: Optional[date] = None) -> Dict[str, np.ndarray]:
+        """
+        Classify every row's registration as of a given day (default today).
+
+        Args:
+            table (ColumnTable): The trucks or trailers table
+            as_of (date): Day to check against
+
+        Returns:
+            dict: Disjoint masks for valid, expired, unreadable (expiry set but
+            not a date) and unregistered rows
+        """
+        today = np.datetime64(as_of or date.today(), "D")
+        expiry = table.column('registration_expiry')
+        registered = table.column('has_registration')
+        parsed = table.column('registration_parsed')
+        expired = registered & parsed & ~np.isnat(expiry) & (expiry < today)
+        unreadable = registered & ~parsed
+        return {
+            'valid': registered & parsed & ~expired,
+            'expired': expired,
+            'unreadable': unreadable,
+            'unregistered': ~registered
+        }
+
+    # Trucks
+    def registration_valid_mask(self, as_of: Optional[date] = None) -> np.ndarray:
+        """Same rule as Truck.check_registration, evaluated as of a given day (default today)."""
+        return self.registration_status_masks(self.trucks, as_of)['valid']
+
+    def roadworthy_trucks_mask(self, as_of: Optional[date] = None) -> np.ndarray:
+        return self.trucks.column('is_drivable') & self.registration_valid_mask(as_of)
+
+    def available_trucks_mask(self, as_of: Optional[date] = None) -> np.ndarray:
+        """Roadworthy and no driver, as in storage.get_available_trucks."""
+        return self.roadworthy_trucks_mask(as_of) & ~self.trucks.column('has_driver')
+
+    def trucks_with_capacity_mask(self, min_capacity: float) -> np.ndarray:
+        return self.trucks.column('max_capacity') >= min_capacity
+
+    # Trailers
+    def available_trailers_mask(self, min_free_capacity: float = 0.0) -> np.ndarray:
+        """Working and unattached, as in storage.get_available_trailers, with optional free capacity."""
+        t = self.trailers
+        mask = t.column('is_working_condition') & ~t.column('is_attached')
+        if min_free_capacity > 0:
+            mask &= (t.column('max_cargo_capacity') - t.column('current_cargo_weight')) >= min_free_capacity
+        return mask
+
+    def compliant_trailers_mask(self) -> np.ndarray:
+        """Same rule as Trailer.check_bureaucratic_status."""
+        return self.trailers.column('has_registration') & self.trailers.column('insurance_valid')
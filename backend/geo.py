@@ -0,0 +1,268 @@
+import csv
+import math
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Bundled US gazetteer: one row per city (city, state, zip, lat, lon). Point
+# FLEET_GAZETTEER_PATH at a larger file with the same columns (e.g. a full
+# ZIP centroid table) to cover more places.
+GAZETTEER_PATH = os.getenv("FLEET_GAZETTEER_PATH", os.path.join(os.path.dirname(__file__), "gazetteer.csv"))
+
+EARTH_RADIUS_MILES = 3958.8
+ROAD_CIRCUITY = 1.2       # Road miles per great-circle mile
+AVERAGE_SPEED_MPH = 55.0  # Used to turn road miles into drive hours
+
+# Reach used by in-range checks when the caller does not give one. FLEET_RANGE_HOURS,
+# when set, also caps the estimated drive time (see drive_hours)
+RANGE_MILES = float(os.getenv("FLEET_RANGE_MILES", "250"))
+RANGE_HOURS = float(os.environ["FLEET_RANGE_HOURS"]) if os.getenv("FLEET_RANGE_HOURS") else None
+
+# (latitude, longitude) in degrees
+LatLon = Tuple[float, float]
+
+GEOCODE_CACHE_SIZE = 65536  # Distinct input strings remembered before the cache starts over
+
+_ZIP = re.compile(r'\b(\d{5})(?:-\d{4})?\b')
+_CITY_WORDS = {'SAINT': 'ST', 'FORT': 'FT', 'MOUNT': 'MT'}
+
+
+def _city_key(city: str) -> str:
+    words = re.sub(r'[^A-Z0-9 ]', ' ', city.upper().replace('.', '')).split()
+    return ' '.join(_CITY_WORDS.get(word, word) for word in words)
+
+
+def parse_place(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Split a free-form US place into (city key, state, zip).
+
+    Handles "Dallas, TX", "DALLAS TX 75201", the "CALERA,AL/" style of the
+    order exports and bare ZIP codes; parts that are not present come back
+    as None.
+
+    Args:
+        text (str): Place as written
+
+    Returns:
+        tuple: Normalized city, two-letter state and five-digit ZIP
+    """
+    text = (text or "").strip().upper()
+    zip_match = _ZIP.search(text)
+    zip_code = zip_match.group(1) if zip_match else None
+    if zip_match:
+        text = text[:zip_match.start()] + text[zip_match.end():]
+    text = text.strip(" /,")
+    if ',' in text:
+        city, _, state = text.rpartition(',')
+    else:
+        city, _, state = text.rpartition(' ')
+    state = re.sub(r'[^A-Z]', '', state)
+    if len(state) != 2:
+        city, state = text, ''
+    city = _city_key(city)
+    return city or None, state or None, zip_code
+
+
+class Gazetteer:
+    """
+    Offline lookup from US place names and ZIP codes to coordinates.
+
+    Places are matched by normalized city and state ("St. Louis, MO" and
+    "SAINT LOUIS,MO/" are the same place), or by ZIP code: exact ZIPs first,
+    then the first place sharing the ZIP's three-digit prefix (its sectional
+    center). Lookups are cached per input string, so repeat geocodes of the
+    same location are a single dict hit.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, str]]):
+        self._by_city: Dict[Tuple[str, str], LatLon] = {}
+        self._by_zip: Dict[str, LatLon] = {}
+        self._by_prefix: Dict[str, LatLon] = {}
+        for row in rows:
+            point = (float(row['lat']), float(row['lon']))
+            self._by_city.setdefault((_city_key(row['city']), row['state'].strip().upper()), point)
+            zip_code = (row.get('zip') or '').strip().zfill(5)
+            if zip_code.strip('0'):
+                self._by_zip.setdefault(zip_code, point)
+                self._by_prefix.setdefault(zip_code[:3], point)
+        self._cache: Dict[str, Optional[LatLon]] = {}
+
+    @classmethod
+    def load(cls, path: str = GAZETTEER_PATH) -> "Gazetteer":
+        """
+        Load a gazetteer CSV with city, state, zip, lat and lon columns.
+
+        Args:
+            path (str): CSV file
+
+        Returns:
+            Gazetteer: The loaded gazetteer
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            return cls(csv.DictReader(f))
+
+    def geocode(self, place: Optional[str]) -> Optional[LatLon]:
+        """
+        Get the coordinates of a place.
+
+        Args:
+            place (str): City and state, ZIP code, or both
+
+        Returns:
+            tuple: (lat, lon) in degrees, or None if the place is not in the gazetteer
+        """
+        if not place:
+            return None
+        try:
+            return self._cache[place]
+        except KeyError:
+            pass
+        city, state, zip_code = parse_place(place)
+        point = None
+        if city and state:
+            point = self._by_city.get((city, state))
+        if point is None and zip_code:
+            point = self._by_zip.get(zip_code) or self._by_prefix.get(zip_code[:3])
+        if len(self._cache) >= GEOCODE_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[place] = point
+        return point
+
+    def __len__(self) -> int:
+        return len(self._by_city)
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Get the process-wide gazetteer, loading GAZETTEER_PATH on first use."""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = Gazetteer.load()
+    return _gazetteer
+
+
+def geocode(place: Optional[str]) -> Optional[LatLon]:
+    """Geocode a place with the process-wide gazetteer (see Gazetteer.geocode)."""
+    return get_gazetteer().geocode(place)
+
+
+def haversine_miles(origin: LatLon, destination: LatLon) -> float:
+    """
+    Great-circle distance between two points.
+
+    Args:
+        origin (tuple): (lat, lon) in degrees
+        destination (tuple): (lat, lon) in degrees
+
+    Returns:
+        float: Distance in miles
+    """
+    lat1, lon1 = math.radians(origin[0]), math.radians(origin[1])
+    lat2, lon2 = math.radians(destination[0]), math.radians(destination[1])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def haversine_miles_many(origin: LatLon, lats: "np.ndarray", lons: "np.ndarray") -> "np.ndarray":
+    """
+    Great-circle distances from one point to many, vectorized.
+
+    origin may also be a pair of arrays, giving element-wise distances
+    between matching points.
+
+    Args:
+        origin (tuple): (lat, lon) in degrees
+        lats (np.ndarray): Latitudes in degrees (NaN for unknown points)
+        lons (np.ndarray): Longitudes in degrees
+
+    Returns:
+        np.ndarray: Distances in miles, NaN where a point is unknown
+    """
+    import numpy as np  # Deferred: entity modules import this one and NumPy is only needed here
+    lat1, lon1 = np.radians(origin[0]), np.radians(origin[1])
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+
+def drive_hours(miles: Any) -> Any:
+    """
+    Estimate drive time from a great-circle distance.
+
+    Args:
+        miles: Distance in miles (float or NumPy array)
+
+    Returns:
+        Hours to cover ROAD_CIRCUITY times the distance at AVERAGE_SPEED_MPH
+    """
+    return miles * ROAD_CIRCUITY / AVERAGE_SPEED_MPH
+
+
+def within_range(miles: Any, max_miles: Optional[float] = None, max_hours: Optional[float] = None) -> Any:
+    """
+    Check distances against a radius and/or a drive time.
+
+    With neither limit given, RANGE_MILES (and RANGE_HOURS, if set) apply;
+    otherwise only the limits given do.
+
+    Args:
+        miles: Distance in miles (float or NumPy array; None and NaN are never in range)
+        max_miles (float): Greatest distance in range
+        max_hours (float): Greatest estimated drive time in range
+
+    Returns:
+        bool, or a boolean array matching miles
+    """
+    if miles is None:
+        return False
+    if max_miles is None and max_hours is None:
+        max_miles, max_hours = RANGE_MILES, RANGE_HOURS
+    result = miles == miles  # False for NaN
+    if max_miles is not None:
+        result = result & (miles <= max_miles)
+    if max_hours is not None:
+        result = result & (drive_hours(miles) <= max_hours)
+    return result
+
+
+def distance_miles(origin: Optional[str], destination: Optional[str]) -> Optional[float]:
+    """
+    Great-circle distance between two places.
+
+    Args:
+        origin (str): Starting place
+        destination (str): Ending place
+
+    Returns:
+        float: Distance in miles, or None if either place cannot be geocoded
+    """
+    gazetteer = get_gazetteer()
+    start, end = gazetteer.geocode(origin), gazetteer.geocode(destination)
+    if start is None or end is None:
+        return None
+    return haversine_miles(start, end)
+
+
+def coordinates(places: Sequence[Optional[str]]) -> "np.ndarray":
+    """
+    Geocode many places into an (n, 2) array of lat/lon, NaN for unknown places.
+
+    Args:
+        places (list): Places to geocode
+
+    Returns:
+        np.ndarray: One (lat, lon) row per place
+    """
+    import numpy as np
+    gazetteer = get_gazetteer()
+    points: List[LatLon] = [gazetteer.geocode(place) or (math.nan, math.nan) for place in places]
+    return np.array(points, dtype=np.float64).reshape(len(points), 2)
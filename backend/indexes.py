@@ -0,0 +1,210 @@
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def normalize_location(location: Optional[str]) -> str:
+    """
+    Normalize a location string into the key used by the location indexes.
+
+    Args:
+        location (str): Raw location string (may be None or empty)
+
+    Returns:
+        str: Case-insensitive lookup key
+    """
+    return (location or "").lower()
+
+
+class LocationIndex:
+    """
+    Secondary index from a normalized location to the entities currently there.
+
+    Entities are stored by id so that moving one between locations only touches
+    the two buckets involved, and a lookup costs O(matches) instead of O(fleet).
+    """
+
+    def __init__(self):
+        self._by_location: Dict[str, Dict[str, Any]] = {}
+        self._location_of: Dict[str, str] = {}
+
+    def add(self, entity_id: str, entity: Any, location: Optional[str]) -> None:
+        """
+        Add (or re-add) an entity under the given location.
+
+        Args:
+            entity_id (str): Unique identifier of the entity
+            entity: The entity object to index
+            location (str): Current location of the entity
+        """
+        self.remove(entity_id)
+        key = normalize_location(location)
+        self._by_location.setdefault(key, {})[entity_id] = entity
+        self._location_of[entity_id] = key
+
+    def move(self, entity_id: str, entity: Any, new_location: Optional[str]) -> None:
+        """
+        Move an already indexed entity to a new location.
+
+        Args:
+            entity_id (str): Unique identifier of the entity
+            entity: The entity object to index
+            new_location (str): New location of the entity
+        """
+        if self._location_of.get(entity_id) == normalize_location(new_location):
+            return
+        self.add(entity_id, entity, new_location)
+
+    def remove(self, entity_id: str) -> None:
+        """
+        Remove an entity from the index if present.
+
+        Args:
+            entity_id (str): Unique identifier of the entity
+        """
+        key = self._location_of.pop(entity_id, None)
+        if key is None:
+            return
+        bucket = self._by_location[key]
+        bucket.pop(entity_id, None)
+        if not bucket:
+            del self._by_location[key]
+
+    def get(self, location: Optional[str]) -> List[Any]:
+        """
+        Get all entities currently at a location.
+
+        Args:
+            location (str): Location to look up (case-insensitive)
+
+        Returns:
+            list: Entities at that location
+        """
+        bucket = self._by_location.get(normalize_location(location))
+        return list(bucket.values()) if bucket else []
+
+    def clear(self) -> None:
+        """Drop every entry from the index."""
+        self._by_location.clear()
+        self._location_of.clear()
+
+    def __len__(self) -> int:
+        return len(self._location_of)
+
+
+class EntityTable(dict):
+    """
+    In-memory table of entities keyed by id, with a location index.
+
+    This is the default storage backend. The SQLite backend exposes the same
+    interface (dict access plus save, by_location and where), so storage
+    functions do not need to know which one they are talking to.
+
+    Observers are objects with upsert(entity), remove(entity_id) and clear()
+    methods; they are told about every insert, save, delete and clear.
+
+    Pages are served in id order from a sorted copy of the keys that is only
+    rebuilt after ids are added or removed, not on every save.
+    """
+
+    def __init__(self, id_attr: str, location_attr: str):
+        super().__init__()
+        self.id_attr = id_attr
+        self.location_attr = location_attr
+        self.locations = LocationIndex()
+        self.observers: List[Any] = []
+        self._sorted_ids: Optional[List[str]] = None
+
+    def __setitem__(self, entity_id: str, entity: Any) -> None:
+        if entity_id not in self:
+            self._sorted_ids = None
+        super().__setitem__(entity_id, entity)
+        self.locations.add(entity_id, entity, getattr(entity, self.location_attr))
+        for observer in self.observers:
+            observer.upsert(entity)
+
+    def __delitem__(self, entity_id: str) -> None:
+        super().__delitem__(entity_id)
+        self._sorted_ids = None
+        self.locations.remove(entity_id)
+        for observer in self.observers:
+            observer.remove(entity_id)
+
+    def save(self, entity: Any) -> None:
+        """
+        Refresh the secondary indexes after a stored entity has changed.
+
+        Entities that are not the stored object for their id are ignored.
+
+        Args:
+            entity: The changed entity
+        """
+        entity_id = getattr(entity, self.id_attr)
+        if self.get(entity_id) is entity:
+            self.locations.move(entity_id, entity, getattr(entity, self.location_attr))
+            for observer in self.observers:
+                observer.upsert(entity)
+
+    def save_many(self, entities: List[Any]) -> None:
+        """
+        Store a batch of entities under their ids, replacing existing ones.
+
+        Args:
+            entities (list): Entities to store
+        """
+        for entity in entities:
+            self[getattr(entity, self.id_attr)] = entity
+
+    def by_location(self, location: Optional[str]) -> List[Any]:
+        """
+        Get all entities at a location (case-insensitive).
+
+        Args:
+            location (str): Location to look up
+
+        Returns:
+            list: Entities at that location
+        """
+        return self.locations.get(location)
+
+    def where(self, **criteria: Any) -> List[Any]:
+        """
+        Get all entities whose attributes equal the given values.
+
+        Args:
+            **criteria: Attribute name to expected value
+
+        Returns:
+            list: Matching entities
+        """
+        return [entity for entity in self.values()
+                if all(getattr(entity, attr) == value for attr, value in criteria.items())]
+
+    def page(self, after: Optional[str], limit: int) -> List[Tuple[str, Any]]:
+        """
+        Get up to limit entities in id order, starting after a given id.
+
+        Args:
+            after (str): Id of the last entity on the previous page, or None for the first page
+            limit (int): Maximum number of entities to return
+
+        Returns:
+            list: (id, entity) pairs
+        """
+        if self._sorted_ids is None:
+            self._sorted_ids = sorted(self.keys())
+        start = bisect_right(self._sorted_ids, after) if after is not None else 0
+        return [(entity_id, self[entity_id]) for entity_id in self._sorted_ids[start:start + limit]]
+
+    def index_sizes(self) -> Dict[str, int]:
+        """Get the number of entries in each secondary index."""
+        return {'location': len(self.locations)}
+
+    def flush(self) -> None:
+        """Nothing is buffered in memory; present for interface parity."""
+
+    def clear(self) -> None:
+        super().clear()
+        self._sorted_ids = None
+        self.locations.clear()
+        for observer in self.observers:
+            observer.clear()
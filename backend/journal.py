@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlite_backend import dumps, loads
+
+# Get logger
+logger = logging.getLogger('dispatch_logger')
+
+DEFAULT_SYNC_EVERY = 64          # fsync after this many unsynced entries...
+DEFAULT_SYNC_INTERVAL = 0.05     # ...or once the oldest unsynced entry is this old (seconds)
+
+
+def read_journal(path: str, offset: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Read journal entries from a file, starting at an offset.
+
+    A torn final line (the process died mid-append) marks the end of the
+    journal and is skipped.
+
+    Args:
+        path (str): Journal file
+        offset (int): First entry sequence number to return
+
+    Returns:
+        Iterator of entry dicts with 'seq', 'ts', 'op' and 'args'
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            entry = loads(line)
+            if entry['seq'] >= offset:
+                yield entry
+
+
+class Journal:
+    """
+    Append-only, line-delimited JSON log of storage mutations.
+
+    Each entry gets the next sequence number, which doubles as its offset.
+    Entries are written to the file buffer and flushed and fsynced in groups:
+    as soon as sync_every entries are waiting, and otherwise by a background
+    thread within about sync_interval seconds of the oldest one. A crash
+    therefore loses at most the entries appended in the last sync_interval
+    seconds (fewer than sync_every of them). Subscribers are called after
+    each append, or by publish() when the caller defers them; readers can
+    also tail the file from any offset.
+    """
+
+    def __init__(self, path: str, sync_every: int = DEFAULT_SYNC_EVERY,
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._positions: List[int] = []  # Byte offset of each entry, indexed by seq
+        self._unsynced = 0
+        self._oldest_unsynced: Optional[float] = None
+        self._recover()
+        self._file = open(path, 'ab')
+        self._closed = threading.Event()
+        self._syncer = threading.Thread(target=self._sync_periodically, name=f"journal-sync-{path}", daemon=True)
+        self._syncer.start()
+
+    def _recover(self) -> None:
+        """Index existing entries and cut off a torn final line."""
+        if not os.path.exists(self.path):
+            return
+        position = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._positions.append(position)
+                position += len(line)
+        if position != os.path.getsize(self.path):
+            logger.warning(f"Truncating torn entry at end of journal {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(position)
+
+    @property
+    def next_offset(self) -> int:
+        """Sequence number the next appended entry will get."""
+        return len(self._positions)
+
+    def append(self, op: str, args: List[Any], notify: bool = True) -> Dict[str, Any]:
+        """
+        Append one mutation to the journal.
+
+        Args:
+            op (str): Operation name, e.g. 'update_truck_location'
+            args (list): Operation arguments
+            notify (bool): Call subscribers now; pass False to call publish()
+                once the mutation has been applied
+
+        Returns:
+            dict: The written entry
+        """
+        with self._lock:
+            entry = {'seq': len(self._positions), 'ts': datetime.now().isoformat(), 'op': op, 'args': args}
+            line = (dumps(entry) + "\n").encode()
+            self._positions.append(self._file.tell())
+            self._file.write(line)
+            self._unsynced += 1
+            if self._oldest_unsynced is None:
+                self._oldest_unsynced = time.monotonic()
+            if (self._unsynced >= self.sync_every
+                    or time.monotonic() - self._oldest_unsynced >= self.sync_interval):
+                self._sync()
+        if notify:
+            self.publish(entry)
+        return entry
+
+    def publish(self, entry: Dict[str, Any]) -> None:
+        """
+        Call every subscriber with an appended entry.
+
+        Args:
+            entry (dict): Entry returned by append
+        """
+        for subscriber in self.subscribers:
+            try:
+                subscriber(entry)
+            except Exception as e:
+                logger.error(f"Journal subscriber failed on entry {entry['seq']}: {e}")
+
+    def _sync_periodically(self) -> None:
+        while not self._closed.wait(self.sync_interval):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f"Error syncing journal {self.path}: {e}")
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._oldest_unsynced = None
+
+    def sync(self) -> None:
+        """Force every appended entry to disk."""
+        with self._lock:
+            if self._unsynced and not self._file.closed:
+                self._sync()
+
+    def read(self, offset: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Get up to limit entries starting at an offset, without scanning earlier ones.
+
+        Args:
+            offset (int): First sequence number to return
+            limit (int): Maximum number of entries
+
+        Returns:
+            list: Entries in sequence order; pass the last seq + 1 as the next offset
+        """
+        with self._lock:
+            if offset >= len(self._positions):
+                return []
+            self._file.flush()
+            start = self._positions[max(offset, 0)]
+            count = min(limit, len(self._positions) - max(offset, 0))
+        entries = []
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            for _ in range(count):
+                entries.append(loads(f.readline()))
+        return entries
+
+    def close(self) -> None:
+        """Stop the sync thread, then sync and close the journal file."""
+        self._closed.set()
+        if self._syncer is not threading.current_thread():
+            self._syncer.join()
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._unsynced:
+                self._sync()
+            self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._positions)
@@ -1,19 +1,81 @@
+import atexit
+import copy
 import logging
 import os
-from datetime import datetime
+import queue
+import threading
+from datetime import date, datetime
 from functools import wraps
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
-# Create logs directory if it doesn't exist
-if not os.path.exists('logs'):
-    os.makedirs('logs')
+# Handlers are attached by setup_logger(), not at import time
+logger = logging.getLogger('dispatch_logger')
+_setup_lock = threading.Lock()
+_configured = False
+
+# File and console output run on a background QueueListener thread; callers
+# only enqueue records, so they never wait on disk or terminal writes
+_listener: Optional[QueueListener] = None
+
+# Argument types that cannot change after the call, so rendering them can wait for the listener thread
+_IMMUTABLE_ARGS = (str, bytes, int, float, bool, type(None), date, datetime)
+
+
+def _immutable(value) -> bool:
+    if type(value) is tuple:
+        return all(_immutable(item) for item in value)
+    return type(value) in _IMMUTABLE_ARGS
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves the message unrendered when it is safe to.
+
+    The stock prepare() formats every record on the calling thread. Records
+    whose arguments are all immutable (strings, numbers, dates) are queued
+    as template plus arguments and rendered by the listener thread instead.
+    Anything else, such as a dict the caller may change after this call, or
+    an exception with its traceback, is still rendered here, so the log
+    shows the value it had when it was logged.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info or record.stack_info or not _immutable(record.args or ()):
+            return super().prepare(record)
+        return copy.copy(record)
+
+LOG_DIR = os.getenv("FLEET_LOG_DIR", "logs")
+LOG_LEVEL = os.getenv("FLEET_LOG_LEVEL", "DEBUG").upper()  # Level of the file log (and the logger itself)
+LOG_MAX_BYTES = int(os.getenv("FLEET_LOG_MAX_BYTES", str(10 * 1024 * 1024)))  # Rotate the session file at this size
+LOG_BACKUP_COUNT = int(os.getenv("FLEET_LOG_BACKUP_COUNT", "5"))  # Rotated files kept per session
 
 # Configure logging
 def setup_logger():
-    """Set up logging configuration with both file and console output."""
+    """
+    Set up logging configuration with both file and console output.
+    
+    Creates the logs/ directory and a per-session, size-rotated log file on
+    the first call, written by a background listener thread; later calls
+    return the already configured logger.
+    """
+    global _configured
+    with _setup_lock:
+        if _configured:
+            return logger
+        _configure_handlers()
+        _configured = True
+    return logger
+
+def _configure_handlers():
+    global _listener
+    # Create logs directory if it doesn't exist
+    if not os.path.exists(LOG_DIR):
+        os.makedirs(LOG_DIR)
     
     # Create a unique log file name with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"logs/dispatch_session_{timestamp}.log"
+    log_filename = os.path.join(LOG_DIR, f"dispatch_session_{timestamp}.log")
     
     # Create formatter
     formatter = logging.Formatter(
@@ -21,9 +83,11 @@ def setup_logger():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    # Create file handler
-    file_handler = logging.FileHandler(log_filename, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
+    # Create file handler, rolled over to .1, .2, ... once it reaches LOG_MAX_BYTES
+    file_handler = RotatingFileHandler(log_filename, maxBytes=LOG_MAX_BYTES,
+                                       backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    file_level = getattr(logging, LOG_LEVEL, logging.DEBUG)
+    file_handler.setLevel(file_level)
     file_handler.setFormatter(formatter)
     
     # Create console handler (optional - shows logs in console too)
@@ -31,55 +95,78 @@ def setup_logger():
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
     
-    # Get logger
-    logger = logging.getLogger('dispatch_logger')
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(min(file_level, logging.INFO))  # DEBUG records are never built unless the file wants them
     
     # Clear any existing handlers
     logger.handlers.clear()
     
-    # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # The logger only gets a queue; the listener feeds the real handlers
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
     
-    logger.info(f"Logging session started - Log file: {log_filename}")
-    return logger
+    logger.info("Logging session started - Log file: %s", log_filename)
+
+def shutdown_logger():
+    """Write out every queued record and stop the listener thread. Safe to call more than once."""
+    global _listener, _configured
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        logger.handlers.clear()
+        _configured = False
 
-# Initialize logger
-logger = setup_logger()
+# Registered once here rather than per setup_logger(), which can run again after a shutdown
+atexit.register(shutdown_logger)
 
+# Messages are passed as %-style templates so arguments (which can be large
+# results) are not rendered at all for disabled levels. Enabled records are
+# rendered by the listener thread when their arguments are immutable, and
+# at the call otherwise (see _DeferredQueueHandler)
 def log_user_input(user_input: str):
     """Log user input."""
-    logger.info(f"USER INPUT: {user_input}")
+    logger.info("USER INPUT: %s", user_input)
 
 def log_agent_response(response: str):
     """Log agent response."""
-    logger.info(f"AGENT RESPONSE: {response}")
+    logger.info("AGENT RESPONSE: %s", response)
 
 def log_tool_call(tool_name: str, args: dict = None):
     """Log tool calls."""
-    args_str = f" with args: {args}" if args else ""
-    logger.info(f"TOOL CALL: {tool_name}{args_str}")
+    if args:
+        logger.info("TOOL CALL: %s with args: %s", tool_name, args)
+    else:
+        logger.info("TOOL CALL: %s", tool_name)
 
 def log_tool_result(tool_name: str, result: any):
     """Log tool results."""
-    logger.info(f"TOOL RESULT [{tool_name}]: {result}")
+    logger.info("TOOL RESULT [%s]: %s", tool_name, result)
 
 def log_error(error: Exception, context: str = ""):
     """Log errors with context."""
-    context_str = f" [{context}]" if context else ""
-    logger.error(f"ERROR{context_str}: {str(error)}", exc_info=True)
+    if context:
+        logger.error("ERROR [%s]: %s", context, error, exc_info=True)
+    else:
+        logger.error("ERROR: %s", error, exc_info=True)
 
 def log_function_call(func):
     """Decorator to log function calls."""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        logger.debug(f"FUNCTION CALL: {func.__name__} with args: {args}, kwargs: {kwargs}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("FUNCTION CALL: %s with args: %s, kwargs: %s", func.__name__, args, kwargs)
         try:
             result = func(*args, **kwargs)
-            logger.debug(f"FUNCTION RESULT [{func.__name__}]: {result}")
+            if debug:
+                logger.debug("FUNCTION RESULT [%s]: %s", func.__name__, result)
             return result
         except Exception as e:
-            logger.error(f"FUNCTION ERROR [{func.__name__}]: {str(e)}", exc_info=True)
+            logger.error("FUNCTION ERROR [%s]: %s", func.__name__, e, exc_info=True)
             raise
     return wrapper 
\ No newline at end of file
@@ -2,8 +2,9 @@ import asyncio
 import json
 from my_agents import summary_agent, Runner
 from dotenv import load_dotenv
+from geo import distance_miles, within_range
 from logger import (
-    log_user_input, log_agent_response
+    setup_logger, log_user_input, log_agent_response
 )
 
 load_dotenv()
@@ -14,6 +15,16 @@ def load_test_data():
         data = json.load(f)
     return data
 
+def mark_in_range(test_data, destination: str):
+    """
+    Replace each driver's in_range flag with one computed against the destination (see geo.within_range).
+
+    Drivers whose location cannot be measured are not in range.
+    """
+    for record in test_data.get('drivers', []):
+        record['in_range'] = bool(within_range(distance_miles(record.get('current_location'), destination)))
+    return test_data
+
 async def analyze_drivers_for_destination(destination: str):
     """Analyze drivers and recommend the best 5 for a specific destination."""
     
@@ -22,6 +33,7 @@ async def analyze_drivers_for_destination(destination: str):
     if not test_data:
         print(" Failed to load test data")
         return None
+    mark_in_range(test_data, destination)
     
     # Create the request for the agent - be explicit about using context data
     user_request = f"Using the driver data provided in the context, analyze and recommend the top 5 best drivers for a pickup/delivery to {destination}. The driver data is already available to you - do not ask for it. Consider location efficiency, availability, certifications, and DOT compliance."
@@ -40,6 +52,7 @@ async def analyze_drivers_for_destination(destination: str):
 
 async def main():
     """Main application entry point."""
+    setup_logger()
     
     # Example destination - 
     destination = "Dallas, TX"
@@ -0,0 +1,150 @@
+import sys
+from collections import deque
+from functools import wraps
+from itertools import islice
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, List
+
+DEFAULT_WINDOW = 2048     # Latency samples kept per operation
+DEFAULT_MEMORY_SAMPLE = 256  # Entities measured when estimating a table's footprint
+
+
+class _OpStats:
+    __slots__ = ('calls', 'samples')
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.samples: deque = deque(maxlen=window)
+
+
+def _percentile(ordered: List[int], fraction: float) -> int:
+    # Nearest-rank percentile of an already sorted list
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LatencyRecorder:
+    """
+    Per-operation latency counters.
+
+    Each wrapped call costs two perf_counter_ns() reads and a deque append;
+    percentiles are only computed when stats are requested, over the last
+    window calls of each operation. Call counts are plain integer increments,
+    so they may undercount slightly under heavy thread contention.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._ops: Dict[str, _OpStats] = {}
+
+    def timed(self, func: Callable) -> Callable:
+        """
+        Decorator recording the latency of every call under the function's name.
+
+        Args:
+            func: Function to measure
+
+        Returns:
+            The wrapped function
+        """
+        stats = self._ops.setdefault(func.__name__, _OpStats(self.window))
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.samples.append(perf_counter_ns() - start)
+                stats.calls += 1
+        return wrapper
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latency percentiles for every operation that has been called.
+
+        Returns:
+            dict: Operation name to calls, p50_us, p99_us and max_us
+        """
+        result = {}
+        for name, stats in list(self._ops.items()):
+            ordered = sorted(list(stats.samples))
+            if not ordered:
+                continue
+            result[name] = {
+                'calls': stats.calls,
+                'p50_us': round(_percentile(ordered, 0.50) / 1000, 1),
+                'p99_us': round(_percentile(ordered, 0.99) / 1000, 1),
+                'max_us': round(ordered[-1] / 1000, 1)
+            }
+        return result
+
+    def reset(self) -> None:
+        """Drop every sample and call count."""
+        for stats in self._ops.values():
+            stats.samples.clear()
+            stats.calls = 0
+
+
+def _attribute_values(entity: Any) -> Iterable[Any]:
+    """Values of an object's attributes, whether kept in __slots__ or a __dict__."""
+    if isinstance(entity, dict):
+        return entity.values()
+    values = []
+    for cls in type(entity).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if hasattr(entity, name):
+                values.append(getattr(entity, name))
+    values.extend(getattr(entity, '__dict__', {}).values())
+    return values
+
+
+def _is_entity(value: Any) -> bool:
+    return not isinstance(value, type) and (hasattr(type(value), '__slots__') or hasattr(value, '__dict__'))
+
+
+def approximate_size(entity: Any) -> int:
+    """
+    Approximate the memory held by one entity (or order dict): the object,
+    its attribute dict if it has one and the attribute values, plus the
+    items of list attributes.
+
+    Links to other entities are not followed, so shared objects are not
+    counted twice.
+
+    Args:
+        entity: Entity to measure
+
+    Returns:
+        int: Size in bytes
+    """
+    size = sys.getsizeof(entity)
+    if hasattr(entity, '__dict__') and not isinstance(entity, dict):
+        size += sys.getsizeof(entity.__dict__)
+    for value in _attribute_values(entity):
+        if _is_entity(value):
+            continue  # Linked entity, counted in its own table
+        size += sys.getsizeof(value)
+        if isinstance(value, (list, tuple, set)):
+            size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+def estimate_memory(entities: Iterable[Any], count: int, sample: int = DEFAULT_MEMORY_SAMPLE) -> Dict[str, int]:
+    """
+    Estimate the memory footprint of a table from a sample of its entities.
+
+    Args:
+        entities: The table's entities (only the first sample are read)
+        count (int): Number of entities in the table
+        sample (int): Number of entities to measure
+
+    Returns:
+        dict: count, bytes_per_entity and approx_bytes
+    """
+    sizes = [approximate_size(entity) for entity in islice(entities, sample)]
+    per_entity = sum(sizes) // len(sizes) if sizes else 0
+    return {
+        'count': count,
+        'bytes_per_entity': per_entity,
+        'approx_bytes': per_entity * count
+    }
@@ -54,7 +54,7 @@ summary_agent = Agent(
         
         "Available tools:\n"
         "- hrs_min_sec: Convert decimal hours to HH:MM:SS format\n"
-        "- trip_schedule: Calculate DOT-compliant trip schedules with required breaks\n\n"      
+        "- trip_schedule: Calculate DOT-compliant trip schedules with required breaks; pass origin and destination to use road graph drive times where the graph covers them\n\n"      
         
         "## Trip Scheduling Guidelines:\n"
         "- Use trip_schedule tool to calculate DOT-compliant schedules\n"
@@ -0,0 +1,198 @@
+import argparse
+import csv
+import logging
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import storage
+
+# Get logger
+logger = logging.getLogger('dispatch_logger')
+
+# Timestamp layout used by the TMS export (e.g. 5/26/2025 11:01)
+TMS_TIMESTAMP_FORMAT = "%m/%d/%Y %H:%M"
+TIMESTAMP_COLUMNS = ('Start Dt/Tm', 'End Dt/Tm')
+CITY_COLUMNS = ('Shipper City', 'Consignee City')
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a TMS timestamp such as '5/26/2025 11:01'.
+
+    Args:
+        value (str): Raw timestamp string
+
+    Returns:
+        datetime: Parsed timestamp, or None if the cell is blank
+
+    Raises:
+        ValueError: If the value is not blank and does not match the TMS format
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    return datetime.strptime(value, TMS_TIMESTAMP_FORMAT)
+
+
+def normalize_order_number(value: Optional[str]) -> Tuple[str, bool]:
+    """
+    Strip the TMS marker from an order number such as '12574454*'.
+
+    Args:
+        value (str): Raw order number
+
+    Returns:
+        tuple: (order number without marker, True if the marker was present)
+    """
+    value = (value or "").strip()
+    if value.endswith('*'):
+        return value.rstrip('*').strip(), True
+    return value, False
+
+
+def normalize_city(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a TMS city cell such as 'CALERA,AL/' into 'CALERA, AL'.
+
+    Args:
+        value (str): Raw city cell
+
+    Returns:
+        str: Normalized 'City, ST' string, or None if the cell is blank
+    """
+    value = (value or "").strip().rstrip('/').strip()
+    if not value:
+        return None
+    parts = [part.strip() for part in value.split(',') if part.strip()]
+    return ", ".join(parts)
+
+
+def normalize_order_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert one raw CSV row into the order dict format used by storage.
+
+    Column names are kept as-is so storage lookups on 'Order #', 'Status'
+    and 'Driver1 ID' keep working.
+
+    Args:
+        row (dict): Raw row from csv.DictReader
+
+    Returns:
+        dict: Normalized order
+
+    Raises:
+        ValueError: If the row has no order number or a malformed timestamp
+    """
+    order: Dict[str, Any] = {}
+    for column, value in row.items():
+        if column is None:
+            continue  # Extra cells without a header
+        value = value.strip() if isinstance(value, str) else value
+        order[column.strip()] = value if value != "" else None
+
+    order_id, marked = normalize_order_number(order.get('Order #'))
+    if not order_id:
+        raise ValueError("missing Order #")
+    order['Order #'] = order_id
+    order['Order # Marked'] = marked
+
+    for column in TIMESTAMP_COLUMNS:
+        if column in order:
+            order[column] = parse_timestamp(order[column])
+    for column in CITY_COLUMNS:
+        if column in order:
+            order[column] = normalize_city(order[column])
+    return order
+
+
+def iter_order_batches(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       rejected: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream normalized orders from a TMS CSV export in fixed-size batches.
+
+    Only one batch is held in memory at a time. Rows that fail to normalize are
+    skipped. If a rejected dict is given, its 'count' is incremented for each
+    skipped row and the first MAX_REPORTED_ERRORS are appended to its 'errors'.
+
+    Args:
+        path (str): Path to the CSV export
+        chunk_size (int): Number of rows per batch
+        rejected (dict): Optional {'count': int, 'errors': list} collector
+
+    Yields:
+        list: A batch of normalized order dicts
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        while True:
+            raw_rows = list(islice(reader, chunk_size))
+            if not raw_rows:
+                return
+            batch = []
+            for row in raw_rows:
+                if not any((value or "").strip() for value in row.values() if isinstance(value, str)):
+                    continue  # Exports end with padding rows of bare commas
+                try:
+                    batch.append(normalize_order_row(row))
+                except ValueError as e:
+                    if rejected is None:
+                        continue
+                    rejected['count'] += 1
+                    if len(rejected['errors']) < MAX_REPORTED_ERRORS:
+                        rejected['errors'].append({'order': row.get('Order #'), 'error': str(e)})
+            if batch:
+                yield batch
+
+
+def load_orders_csv(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Bulk load a TMS CSV export into order storage.
+
+    Args:
+        path (str): Path to the CSV export
+        chunk_size (int): Number of rows parsed and inserted per batch
+
+    Returns:
+        dict: Load report with row counts, elapsed time and rows per second
+    """
+    rejected: Dict[str, Any] = {'count': 0, 'errors': []}
+    rows_loaded = 0
+    batches = 0
+    started = time.perf_counter()
+
+    for batch in iter_order_batches(path, chunk_size, rejected):
+        rows_loaded += storage.create_orders(batch)
+        batches += 1
+
+    elapsed = time.perf_counter() - started
+    rows_per_second = rows_loaded / elapsed if elapsed > 0 else float(rows_loaded)
+    logger.info(f"Loaded {rows_loaded} orders from {path} in {elapsed:.2f}s ({rows_per_second:,.0f} rows/s), "
+                f"{rejected['count']} rejected")
+    return {
+        'path': path,
+        'rows_loaded': rows_loaded,
+        'rows_rejected': rejected['count'],
+        'batches': batches,
+        'elapsed_seconds': elapsed,
+        'rows_per_second': rows_per_second,
+        'errors': rejected['errors']
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk load a TMS orders CSV export into storage")
+    parser.add_argument("path", help="Path to the CSV export (orders.csv layout)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per batch")
+    args = parser.parse_args()
+
+    report = load_orders_csv(args.path, args.chunk_size)
+    print(f"Loaded {report['rows_loaded']} rows ({report['rows_rejected']} rejected) "
+          f"in {report['elapsed_seconds']:.2f}s: {report['rows_per_second']:,.0f} rows/s")
@@ -0,0 +1,204 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def normalize_status(status: Optional[str]) -> str:
+    """
+    Normalize an order status into the key used by the status index.
+
+    Args:
+        status (str): Raw status string (may be None or empty)
+
+    Returns:
+        str: Case-insensitive lookup key
+    """
+    return (status or "").lower()
+
+
+class OrderStore:
+    """
+    Insertion-ordered store of order dicts with hash indexes on 'Order #',
+    'Driver1 ID' and normalized 'Status'.
+
+    Every order gets a sequence number when it is added. Index buckets are keyed
+    on that number, so query results come back in the same order a scan of the
+    underlying list would produce. Writes take a lock, so concurrent batches
+    cannot interleave their sequence numbers.
+
+    Unlike entity reads in storage, index reads take the same lock: update()
+    moves an order between status and driver buckets in two steps, and a
+    reader in between could see it in both buckets or in neither. Readers
+    hold the lock only while copying one bucket or slice of the list.
+    """
+
+    def __init__(self):
+        self._orders: List[Dict[str, Any]] = []
+        self._by_id: Dict[Any, int] = {}
+        self._by_driver: Dict[Any, Dict[int, Dict[str, Any]]] = {}
+        self._by_status: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+
+    def add(self, order: Dict[str, Any]) -> None:
+        """
+        Append an order and index it.
+
+        Args:
+            order (dict): Order data
+        """
+        with self._lock:
+            seq = len(self._orders)
+            self._orders.append(order)
+            # First order with a given number wins, like a front-to-back scan
+            self._by_id.setdefault(order.get('Order #'), seq)
+            self._by_driver.setdefault(order.get('Driver1 ID'), {})[seq] = order
+            self._by_status.setdefault(normalize_status(order.get('Status')), {})[seq] = order
+
+    def extend(self, orders: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append and index a batch of orders.
+
+        Args:
+            orders: Iterable of order dicts
+
+        Returns:
+            int: Number of orders added
+        """
+        count = 0
+        with self._lock:
+            for order in orders:
+                self.add(order)
+                count += 1
+        return count
+
+    def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an order by its 'Order #'.
+
+        Args:
+            order_id (str): Order number
+
+        Returns:
+            dict: The order, or None if not found
+        """
+        with self._lock:
+            seq = self._by_id.get(order_id)
+            return self._orders[seq] if seq is not None else None
+
+    def by_status(self, status: str) -> List[Dict[str, Any]]:
+        """
+        Get all orders with a status (case-insensitive), in insertion order.
+
+        Args:
+            status (str): Status to match
+
+        Returns:
+            list: Matching orders
+        """
+        with self._lock:
+            return self._ordered(self._by_status.get(normalize_status(status)))
+
+    def by_driver(self, driver_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all orders assigned to a driver, in insertion order.
+
+        Args:
+            driver_id (str): Driver ID stored in 'Driver1 ID'
+
+        Returns:
+            list: Matching orders
+        """
+        with self._lock:
+            return self._ordered(self._by_driver.get(driver_id))
+
+    def update(self, order_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Apply field changes to an order and move it between index buckets.
+
+        Args:
+            order_id (str): Order number
+            changes (dict): Fields to set, e.g. {'Status': 'Delivered'}
+
+        Returns:
+            dict: The updated order, or None if not found
+
+        Raises:
+            ValueError: If the changes try to renumber the order
+        """
+        if 'Order #' in changes:
+            raise ValueError("'Order #' cannot be changed")
+        with self._lock:
+            seq = self._by_id.get(order_id)
+            if seq is None:
+                return None
+            order = self._orders[seq]
+            if 'Status' in changes:
+                self._move(self._by_status, normalize_status(order.get('Status')),
+                           normalize_status(changes['Status']), seq, order)
+            if 'Driver1 ID' in changes:
+                self._move(self._by_driver, order.get('Driver1 ID'), changes['Driver1 ID'], seq, order)
+            order.update(changes)
+            return order
+
+    def all(self) -> List[Dict[str, Any]]:
+        """
+        Get a shallow copy of every stored order.
+
+        Returns:
+            list: All orders in insertion order
+        """
+        with self._lock:
+            return self._orders.copy()
+
+    def page(self, after: Optional[int], limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Get up to limit orders in insertion order, starting after a sequence number.
+
+        Args:
+            after (int): Sequence number of the last order on the previous page, or None for the first page
+            limit (int): Maximum number of orders to return
+
+        Returns:
+            list: (sequence number, order) pairs
+        """
+        start = 0 if after is None else after + 1
+        with self._lock:
+            return list(enumerate(self._orders[start:start + limit], start))
+
+    def index_sizes(self) -> Dict[str, int]:
+        """Get the number of keys in each index."""
+        return {'order_id': len(self._by_id), 'driver': len(self._by_driver), 'status': len(self._by_status)}
+
+    def flush(self) -> None:
+        """Nothing is buffered in memory; present for interface parity."""
+
+    def clear(self) -> None:
+        """Drop every order and index entry."""
+        with self._lock:
+            self._orders.clear()
+            self._by_id.clear()
+            self._by_driver.clear()
+            self._by_status.clear()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self):
+        return iter(self.all())
+
+    @staticmethod
+    def _move(index: Dict[Any, Dict[int, Dict[str, Any]]], old_key: Any, new_key: Any,
+              seq: int, order: Dict[str, Any]) -> None:
+        if old_key == new_key:
+            return
+        bucket = index.get(old_key)
+        if bucket is not None:
+            bucket.pop(seq, None)
+            if not bucket:
+                del index[old_key]
+        index.setdefault(new_key, {})[seq] = order
+
+    @staticmethod
+    def _ordered(bucket: Optional[Dict[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        if not bucket:
+            return []
+        return [bucket[seq] for seq in sorted(bucket)]
@@ -0,0 +1,66 @@
+import base64
+import binascii
+import json
+from typing import Any, Optional
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(key: Any) -> str:
+    """
+    Encode the sort key of the last item on a page into an opaque cursor.
+
+    Args:
+        key: JSON-serializable sort key (entity id or order sequence number)
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], key_type: Optional[type] = None) -> Any:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor string, or None/empty for the first page
+        key_type (type): Type the sort key must have (str for entity ids, int
+            for order sequence numbers); None accepts any key
+
+    Returns:
+        The sort key to continue after, or None for the first page
+
+    Raises:
+        ValueError: If the cursor is malformed or its key has the wrong type
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    # bool is an int subclass, but never a valid sort key
+    if key_type is not None and (not isinstance(key, key_type) or isinstance(key, bool)):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return key
+
+
+def check_page_size(limit: int) -> int:
+    """
+    Validate a requested page size.
+
+    Args:
+        limit (int): Requested number of items
+
+    Returns:
+        int: The same limit
+
+    Raises:
+        ValueError: If the limit is outside 1..MAX_PAGE_SIZE
+    """
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
@@ -0,0 +1,265 @@
+import csv
+import heapq
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from geo import ROAD_CIRCUITY, LatLon, drive_hours, geocode, haversine_miles, haversine_miles_many
+
+# Local road graph: a directory holding nodes.csv (id, lat, lon) and
+# edges.csv (from, to, miles, minutes, oneway), e.g. converted from an OSM
+# extract at build time. minutes may be blank (miles at DEFAULT_ROAD_SPEED_MPH);
+# edges are two-way unless oneway is 1/true/yes. Without a graph, routes
+# are estimated from great-circle distance (see geo.drive_hours)
+ROAD_GRAPH_PATH = os.getenv("FLEET_ROAD_GRAPH_PATH")
+
+DEFAULT_ROAD_SPEED_MPH = 45.0
+SNAP_MAX_MILES = 25.0        # Stops farther than this from every graph node are not routed
+ROUTE_CACHE_SIZE = 1 << 16   # Origin-destination node pairs kept in the LRU
+
+_ONEWAY = {'1', 'true', 'yes'}
+
+
+class Route(NamedTuple):
+    miles: float
+    hours: float
+    routed: bool  # False when estimated from great-circle distance
+
+
+class RoadGraph:
+    """
+    Directed road graph with A* drive-time search.
+
+    Edges are weighted by minutes. The A* heuristic is the straight-line
+    distance to the target times the fewest minutes any edge in the graph
+    spends per straight-line mile, so it never overestimates and the first
+    route settled is the fastest one.
+    """
+
+    def __init__(self, nodes: Iterable[Dict[str, str]], edges: Iterable[Dict[str, str]]):
+        self.node_ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        lats, lons = [], []
+        for row in nodes:
+            self._index[row['id']] = len(self.node_ids)
+            self.node_ids.append(row['id'])
+            lats.append(float(row['lat']))
+            lons.append(float(row['lon']))
+        self.lats = np.array(lats)
+        self.lons = np.array(lons)
+        self._points: List[LatLon] = list(zip(lats, lons))
+        # adjacency[node] -> [(neighbour, minutes, miles)]
+        self.adjacency: List[List[Tuple[int, float, float]]] = [[] for _ in self.node_ids]
+        self.edge_count = 0
+        pace = math.inf  # Fewest minutes per straight-line mile over all edges
+        for row in edges:
+            start, end = self._index[row['from']], self._index[row['to']]
+            miles = float(row['miles'])
+            minutes = float(row['minutes']) if row.get('minutes') else miles / DEFAULT_ROAD_SPEED_MPH * 60
+            self.adjacency[start].append((end, minutes, miles))
+            self.edge_count += 1
+            if (row.get('oneway') or '').strip().lower() not in _ONEWAY:
+                self.adjacency[end].append((start, minutes, miles))
+                self.edge_count += 1
+            straight = haversine_miles(self._points[start], self._points[end])
+            if straight > 0:
+                pace = min(pace, minutes / straight)
+        self.pace = 0.0 if pace == math.inf else pace
+
+    @classmethod
+    def load(cls, path: str) -> "RoadGraph":
+        """
+        Load a graph directory with nodes.csv and edges.csv.
+
+        Args:
+            path (str): Directory holding the two files
+
+        Returns:
+            RoadGraph: The loaded graph
+        """
+        with open(os.path.join(path, 'nodes.csv'), newline='', encoding='utf-8') as nodes, \
+                open(os.path.join(path, 'edges.csv'), newline='', encoding='utf-8') as edges:
+            return cls(csv.DictReader(nodes), csv.DictReader(edges))
+
+    def nearest_node(self, point: LatLon) -> Tuple[int, float]:
+        """
+        Snap a point to the graph.
+
+        Args:
+            point (tuple): (lat, lon) in degrees
+
+        Returns:
+            tuple: Closest node and its great-circle distance in miles
+        """
+        distances = haversine_miles_many(point, self.lats, self.lons)
+        node = int(np.argmin(distances))
+        return node, float(distances[node])
+
+    def shortest(self, source: int, target: int) -> Optional[Tuple[float, float]]:
+        """
+        Find the fastest route between two nodes.
+
+        Args:
+            source (int): Start node
+            target (int): End node
+
+        Returns:
+            tuple: (minutes, miles) of the fastest route, or None if target is unreachable
+        """
+        goal = self._points[target]
+        points, adjacency, pace = self._points, self.adjacency, self.pace
+        best = {source: 0.0}
+        miles = {source: 0.0}
+        frontier = [(pace * haversine_miles(points[source], goal), 0.0, source)]
+        settled = set()
+        while frontier:
+            _, minutes, node = heapq.heappop(frontier)
+            if node == target:
+                return minutes, miles[node]
+            if node in settled:
+                continue
+            settled.add(node)
+            for neighbour, edge_minutes, edge_miles in adjacency[node]:
+                arrival = minutes + edge_minutes
+                if arrival < best.get(neighbour, math.inf):
+                    best[neighbour] = arrival
+                    miles[neighbour] = miles[node] + edge_miles
+                    heapq.heappush(frontier, (arrival + pace * haversine_miles(points[neighbour], goal), arrival, neighbour))
+        return None
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+
+class Router:
+    """
+    Drive time and distance between stops, over a road graph when one is loaded.
+
+    Stops are geocoded and snapped to their nearest graph node once per
+    spelling; routes are cached per (origin node, destination node) pair in
+    an LRU, so repeat queries between hot stops are a dict hit. The legs
+    from each stop to its node are added as great-circle estimates. Stops
+    with no node within SNAP_MAX_MILES, unreachable pairs and routers with
+    no graph fall back to the great-circle estimate.
+    """
+
+    def __init__(self, graph: Optional[RoadGraph] = None, cache_size: int = ROUTE_CACHE_SIZE):
+        self.graph = graph
+        self.cache_size = cache_size
+        self._snaps: Dict[str, Optional[Tuple[int, float]]] = {}
+        self._routes: "OrderedDict[Tuple[int, int], Optional[Tuple[float, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _snap(self, place: str, point: LatLon) -> Optional[Tuple[int, float]]:
+        snap = self._snaps.get(place)
+        if snap is None and place not in self._snaps:
+            snap = self.graph.nearest_node(point)
+            if snap[1] > SNAP_MAX_MILES:
+                snap = None
+            self._snaps[place] = snap
+        return snap
+
+    def _between(self, source: int, target: int) -> Optional[Tuple[float, float]]:
+        key = (source, target)
+        with self._lock:
+            if key in self._routes:
+                self._routes.move_to_end(key)
+                self.hits += 1
+                return self._routes[key]
+            self.misses += 1
+        found = self.graph.shortest(source, target)
+        with self._lock:
+            self._routes[key] = found
+            while len(self._routes) > self.cache_size:
+                self._routes.popitem(last=False)
+        return found
+
+    def route(self, origin: Optional[str], destination: Optional[str]) -> Optional[Route]:
+        """
+        Get the drive distance and time between two places.
+
+        Args:
+            origin (str): Starting place (city and state, or ZIP)
+            destination (str): Ending place
+
+        Returns:
+            Route: miles, hours and whether they came from the road graph, or
+            None if either place cannot be geocoded
+        """
+        start, end = geocode(origin), geocode(destination)
+        if start is None or end is None:
+            return None
+        if self.graph is not None and len(self.graph):
+            first, last = self._snap(origin, start), self._snap(destination, end)
+            if first is not None and last is not None:
+                found = self._between(first[0], last[0])
+                if found is not None:
+                    access = first[1] + last[1]
+                    minutes, miles = found
+                    return Route(miles + access * ROAD_CIRCUITY, minutes / 60 + drive_hours(access), True)
+        straight = haversine_miles(start, end)
+        return Route(straight * ROAD_CIRCUITY, drive_hours(straight), False)
+
+    def trip_length(self, distance: float, ave_speed: float, origin: Optional[str] = None,
+                    destination: Optional[str] = None) -> Tuple[float, float, Optional[Route]]:
+        """
+        Get the distance and drive hours to schedule a trip with.
+
+        The caller's distance and speed stand unless both stops are given and
+        the road graph routes between them; a great-circle estimate never
+        replaces figures the caller supplied.
+
+        Args:
+            distance (float): Caller's trip distance in miles
+            ave_speed (float): Caller's average speed in mph
+            origin (str): Starting place
+            destination (str): Ending place
+
+        Returns:
+            tuple: (miles, hours, route), route being the graph Route used or None
+        """
+        trip = self.route(origin, destination) if origin and destination else None
+        if trip is not None and trip.routed:
+            return round(trip.miles, 1), trip.hours, trip
+        return distance, distance / ave_speed, None
+
+    def stats(self) -> Dict[str, int]:
+        """Get the graph size and route cache counters."""
+        return {
+            'nodes': len(self.graph) if self.graph is not None else 0,
+            'edges': self.graph.edge_count if self.graph is not None else 0,
+            'cached_routes': len(self._routes),
+            'route_hits': self.hits,
+            'route_misses': self.misses
+        }
+
+
+_router: Optional[Router] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> Router:
+    """Get the process-wide router, loading ROAD_GRAPH_PATH (if set) on first use."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = Router(RoadGraph.load(ROAD_GRAPH_PATH) if ROAD_GRAPH_PATH else None)
+    return _router
+
+
+def route(origin: Optional[str], destination: Optional[str]) -> Optional[Route]:
+    """Route between two places with the process-wide router (see Router.route)."""
+    return get_router().route(origin, destination)
+
+
+def trip_length(distance: float, ave_speed: float, origin: Optional[str] = None,
+                destination: Optional[str] = None) -> Tuple[float, float, Optional[Route]]:
+    """Trip distance and hours with the process-wide router (see Router.trip_length)."""
+    return get_router().trip_length(distance, ave_speed, origin, destination)
@@ -0,0 +1,84 @@
+from datetime import date, datetime
+from typing import List, Optional, Union
+
+from pydantic import BaseModel, ConfigDict
+
+# Expiry and inspection dates are stored as given (date, datetime or a
+# YYYY-MM-DD / MM/DD/YYYY string), so the schemas accept any of them
+DateLike = Optional[Union[datetime, date, str]]
+
+
+class DriverSchema(BaseModel):
+    """API representation of a Driver record (see Driver.RECORD_FIELDS)."""
+    model_config = ConfigDict(from_attributes=True)
+
+    driver_id: str
+    first_name: str
+    last_name: str
+    license_number: str
+    license_expiry: DateLike = None
+    email: str = ""
+    current_location: str = ""
+    is_available: bool = True
+    driver_reports_ready: bool = False
+    assigned_truck_id: str = ""
+    has_personal_needs: bool = False
+    assigned_truck_id_string: str = ""
+    phone_number: str = ""
+    emergency_contact: str = ""
+    hire_date: DateLike = None
+    background_check_valid: bool = False
+    hours_worked_today: float = 0.0
+    certifications: List[str] = []
+    last_rest_period: DateLike = None
+    certifications_list_strings: List[str] = []
+    drug_test_current: bool = False
+    medical_cert_current: bool = False
+    assigned_fleet: Optional[str] = None
+    medical_cert_expiry: DateLike = None
+
+
+class TruckSchema(BaseModel):
+    """API representation of a Truck record (see Truck.RECORD_FIELDS)."""
+    model_config = ConfigDict(from_attributes=True)
+
+    truck_id: str
+    is_drivable: bool = True
+    has_registration: bool = False
+    location: str = ""
+    mileage: int = 0
+    has_container: bool = False
+    make: str
+    model: str
+    year: int
+    license_plate: str = ""
+    registration_expiry: DateLike = None
+    driver_id: str = ""
+    max_capacity: float = 0.0
+    attached_trailer_id: str = ""
+    assigned_fleet: Optional[str] = None
+
+
+class TrailerSchema(BaseModel):
+    """API representation of a Trailer record (see Trailer.RECORD_FIELDS)."""
+    model_config = ConfigDict(from_attributes=True)
+
+    trailer_id: str
+    attached_truck_id: str = ""
+    location: str = ""
+    is_working_condition: bool = True
+    has_registration: bool = False
+    bureaucratically_sound: bool = True
+    is_currently_working: bool = False
+    in_range_first_step: bool = False
+    make: str
+    model: str
+    max_cargo_capacity: float = 0.0
+    current_cargo_weight: float = 0.0
+    year: int
+    registration_expiry: DateLike = None
+    last_inspection: DateLike = None
+    next_inspection_due: DateLike = None
+    insurance_carrier: str = ""
+    insurance_valid: bool = False
+    assigned_fleet: Optional[str] = None
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, HTTPException, status, Query, BackgroundTasks, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Any, Optional
 import httpx 
@@ -8,18 +8,23 @@ import hashlib
 import json
 from pydantic import BaseModel
 import logging
-from datetime import datetime
+from datetime import date, datetime
 import os
 import driver
 import truck
 import trailer
 import load
+import routing
 
 # Import storage functions
 import storage
 import uvicorn
 import asyncio
 from main import analyze_drivers_for_destination
+from logger import setup_logger, shutdown_logger
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from schemas import DriverSchema, TruckSchema, TrailerSchema
+from events import set_event_sink, log_only_sink
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -39,6 +44,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Storage and logging are set up here rather than at import time, so importing
+# this module (tests, workers, tooling) does no file or data I/O
+@app.on_event("startup")
+async def startup():
+    setup_logger()
+    # Request handlers log entity events but never echo them to stdout (override with FLEET_EVENTS)
+    if "FLEET_EVENTS" not in os.environ:
+        set_event_sink(log_only_sink)
+    await storage.initialize_storage_async()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await asyncio.to_thread(storage.shutdown_storage)
+    shutdown_logger()
+
 # Webhook endpoint # This does not have the signature verification yet and I dont know if it will be needed
 # This grabs the destination from the webhook payload and then calls the agent to analyze the drivers for that destination
 # The agent will return a list of the top 5 drivers for the destination
@@ -92,6 +112,201 @@ async def health_check():
         "storage": storage_health
     }
 
+@app.get("/health/storage", tags=["Health"])
+def storage_stats():
+    """Storage memory footprint, index sizes and per-operation latency"""
+    return storage.get_storage_stats()
+
+# Fleet listing endpoints for the dashboard
+# Each returns one page ordered by a stable key; pass next_cursor back as cursor
+# to get the next page. The /stream variants send every row as NDJSON.
+def _list_page(get_page, cursor: Optional[str], limit: int) -> Dict[str, Any]:
+    try:
+        return get_page(cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _ndjson(rows) -> StreamingResponse:
+    lines = (json.dumps(row, default=str) + "\n" for row in rows)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+@app.get("/api/drivers", tags=["Fleet"])
+def list_drivers(cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """List drivers ordered by driver_id, one page at a time"""
+    return _list_page(storage.get_drivers_page, cursor, limit)
+
+@app.get("/api/drivers/stream", tags=["Fleet"])
+def stream_drivers():
+    """Stream every driver as newline-delimited JSON"""
+    return _ndjson(storage.iter_all_drivers())
+
+@app.get("/api/drivers/eligibility", tags=["Fleet"])
+def driver_eligibility(all_reasons: bool = False):
+    """Check driving eligibility for every driver, with reason codes for those who fail"""
+    return storage.get_driver_eligibility(all_reasons)
+
+@app.get("/api/drivers/distances", tags=["Fleet"])
+def driver_distances(destination: str, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """List drivers nearest first by great-circle distance to a place (city and state, or ZIP)"""
+    distances = storage.get_driver_distances(destination, limit)
+    if distances is None:
+        raise HTTPException(status_code=404, detail=f"Location {destination} not found in gazetteer")
+    return distances
+
+@app.get("/api/route", tags=["Fleet"])
+def drive_route(origin: str, destination: str):
+    """Drive distance and time between two stops, over the road graph when one is loaded"""
+    found = routing.route(origin, destination)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Location {origin} or {destination} not found in gazetteer")
+    return {'miles': round(found.miles, 1), 'hours': round(found.hours, 2), 'road_graph': found.routed,
+            'cache': routing.get_router().stats()}
+
+@app.get("/api/in-range", tags=["Fleet"])
+def in_range(destination: str, max_miles: Optional[float] = Query(None, gt=0),
+             max_hours: Optional[float] = Query(None, gt=0)):
+    """Flag every driver and trailer in range of a destination, by radius and/or drive time"""
+    flags = storage.get_in_range(destination, max_miles, max_hours)
+    if flags is None:
+        raise HTTPException(status_code=404, detail=f"Location {destination} not found in gazetteer")
+    return flags
+
+@app.get("/api/nearest/{kind}", tags=["Fleet"])
+def nearest_assets(kind: str, location: str, k: int = Query(5, ge=1, le=MAX_PAGE_SIZE),
+                   radius: Optional[float] = Query(None, gt=0), available_only: bool = True):
+    """Find the drivers, trucks or trailers closest to a place: the k nearest, or all within radius miles"""
+    if kind not in ("driver", "truck", "trailer"):
+        raise HTTPException(status_code=404, detail=f"Unknown asset kind {kind}")
+    if radius is None:
+        found = storage.get_nearest_assets(kind, location, k, available_only)
+    else:
+        found = storage.get_assets_within(kind, location, radius, available_only)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Location {location} not found in gazetteer")
+    return found
+
+@app.get("/api/trucks", tags=["Fleet"])
+def list_trucks(cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """List trucks ordered by truck_id, one page at a time"""
+    return _list_page(storage.get_trucks_page, cursor, limit)
+
+@app.get("/api/trucks/stream", tags=["Fleet"])
+def stream_trucks():
+    """Stream every truck as newline-delimited JSON"""
+    return _ndjson(storage.iter_all_trucks())
+
+@app.get("/api/trailers", tags=["Fleet"])
+def list_trailers(cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """List trailers ordered by trailer_id, one page at a time"""
+    return _list_page(storage.get_trailers_page, cursor, limit)
+
+@app.get("/api/trailers/stream", tags=["Fleet"])
+def stream_trailers():
+    """Stream every trailer as newline-delimited JSON"""
+    return _ndjson(storage.iter_all_trailers())
+
+# Single-entity records. Core models are plain slotted classes; the pydantic
+# schemas validate and serialize them only here, at the API boundary
+def _record_or_404(record: Optional[Dict[str, Any]], kind: str, entity_id: str) -> Dict[str, Any]:
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"{kind} {entity_id} not found")
+    return record
+
+@app.get("/api/drivers/{driver_id}", tags=["Fleet"], response_model=DriverSchema)
+def get_driver(driver_id: str):
+    """Get one driver's record"""
+    return _record_or_404(storage.get_driver_record(driver_id), "Driver", driver_id)
+
+@app.get("/api/trucks/{truck_id}", tags=["Fleet"], response_model=TruckSchema)
+def get_truck(truck_id: str):
+    """Get one truck's record"""
+    return _record_or_404(storage.get_truck_record(truck_id), "Truck", truck_id)
+
+@app.get("/api/trailers/{trailer_id}", tags=["Fleet"], response_model=TrailerSchema)
+def get_trailer(trailer_id: str):
+    """Get one trailer's record"""
+    return _record_or_404(storage.get_trailer_record(trailer_id), "Trailer", trailer_id)
+
+@app.get("/api/orders", tags=["Fleet"])
+def list_orders(cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """List orders in the order they were received, one page at a time"""
+    return _list_page(storage.get_orders_page, cursor, limit)
+
+@app.get("/api/orders/stream", tags=["Fleet"])
+def stream_orders():
+    """Stream every order as newline-delimited JSON"""
+    return _ndjson(storage.iter_all_orders())
+
+@app.get("/api/orders/distance-matrix", tags=["Fleet"])
+def load_distance_matrix(status: str = "Available"):
+    """Distance and drive time from every driver and truck to the origin of every load in a status"""
+    return storage.get_load_distance_matrix(status)
+
+@app.get("/api/orders/candidates", tags=["Fleet"])
+def load_candidates(limit: int = Query(5, ge=1, le=100), status: str = "Available"):
+    """The drivers closest to the origin of each load in a status"""
+    return storage.get_load_candidates(limit, status)
+
+@app.get("/api/journal", tags=["Fleet"])
+def read_journal(offset: int = Query(0, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """Tail the storage mutation journal from an offset"""
+    journal = storage.get_journal()
+    if journal is None:
+        raise HTTPException(status_code=404, detail="Mutation journal is not enabled")
+    entries = journal.read(offset, limit)
+    return {
+        "entries": entries,
+        "next_offset": entries[-1]["seq"] + 1 if entries else offset
+    }
+
+@app.get("/api/expiries", tags=["Fleet"])
+def list_upcoming_expiries(days: int = Query(14, ge=0, le=3650), include_expired: bool = False):
+    """List licenses, medical certificates and registrations expiring in the next days"""
+    return storage.get_upcoming_expiries(days, include_expired=include_expired)
+
+@app.get("/api/registrations", tags=["Fleet"])
+def registration_sweep(as_of: Optional[date] = None):
+    """Check every truck and trailer registration as of a day (default today)"""
+    return storage.get_registration_sweep(as_of)
+
+# Bulk import endpoints
+# A batch is applied all or nothing; if any row is invalid nothing is written
+# and the report's per-row errors come back with a 400.
+def _bulk_response(report: Dict[str, Any]) -> Any:
+    if report['errors']:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=report)
+    return report
+
+@app.post("/api/drivers/bulk", tags=["Fleet"])
+def bulk_create_drivers(rows: List[Dict[str, Any]]):
+    """Create a batch of drivers"""
+    return _bulk_response(storage.create_drivers(rows))
+
+@app.patch("/api/drivers/bulk", tags=["Fleet"])
+def bulk_update_drivers(rows: List[Dict[str, Any]]):
+    """Update fields on a batch of drivers"""
+    return _bulk_response(storage.update_drivers(rows))
+
+@app.post("/api/trucks/bulk", tags=["Fleet"])
+def bulk_create_trucks(rows: List[Dict[str, Any]]):
+    """Create a batch of trucks"""
+    return _bulk_response(storage.create_trucks(rows))
+
+@app.patch("/api/trucks/bulk", tags=["Fleet"])
+def bulk_update_trucks(rows: List[Dict[str, Any]]):
+    """Update fields on a batch of trucks"""
+    return _bulk_response(storage.update_trucks(rows))
+
+@app.post("/api/trailers/bulk", tags=["Fleet"])
+def bulk_create_trailers(rows: List[Dict[str, Any]]):
+    """Create a batch of trailers"""
+    return _bulk_response(storage.create_trailers(rows))
+
+@app.patch("/api/trailers/bulk", tags=["Fleet"])
+def bulk_update_trailers(rows: List[Dict[str, Any]]):
+    """Update fields on a batch of trailers"""
+    return _bulk_response(storage.update_trailers(rows))
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
@@ -0,0 +1,224 @@
+import heapq
+import threading
+from collections.abc import MutableMapping
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from indexes import EntityTable
+
+
+def normalize_fleet(fleet: Optional[str]) -> str:
+    """
+    Normalize an assigned_fleet value into a shard key.
+
+    Args:
+        fleet (str): Fleet name (None or empty when unassigned)
+
+    Returns:
+        str: Shard key; "" is the shard for entities without a fleet
+    """
+    return fleet or ""
+
+
+
+class ShardedTable(MutableMapping):
+    """
+    Entity table partitioned by fleet.
+
+    Each fleet gets its own EntityTable (with its own location index) and its
+    own write lock, so inserts and moves in one fleet never wait on another,
+    and fleet-scoped queries only touch that fleet's shard. A directory maps
+    every id to its shard for O(1) lookups. Reads take no locks.
+
+    Exposes the same interface as EntityTable (dict access, save, by_location,
+    where, page, observers), so storage functions work unchanged. Queries over
+    every fleet run shard by shard on the calling thread: the filters are pure
+    Python and hold the GIL, so shards could not overlap on a thread pool.
+    """
+
+    def __init__(self, id_attr: str, location_attr: str, fleet_attr: str = 'assigned_fleet'):
+        self.id_attr = id_attr
+        self.location_attr = location_attr
+        self.fleet_attr = fleet_attr
+        self.observers: List[Any] = []
+        self._shards: Dict[str, EntityTable] = {}
+        self._shard_locks: Dict[str, threading.Lock] = {}
+        self._fleet_of: Dict[str, str] = {}
+        self._registry_lock = threading.Lock()
+
+    def _shard(self, key: str) -> Tuple[EntityTable, threading.Lock]:
+        shard = self._shards.get(key)
+        if shard is None:
+            with self._registry_lock:
+                if key not in self._shards:
+                    self._shard_locks[key] = threading.Lock()
+                    self._shards[key] = EntityTable(self.id_attr, self.location_attr)
+                shard = self._shards[key]
+        return shard, self._shard_locks[key]
+
+    def _move(self, entity_id: str, entity: Any, old_key: Optional[str], new_key: str) -> None:
+        # Insert before removing so lock-free readers always find the entity in one shard or the other
+        shard, lock = self._shard(new_key)
+        with lock:
+            shard[entity_id] = entity
+            self._fleet_of[entity_id] = new_key
+        if old_key is not None and old_key != new_key:
+            old_shard, old_lock = self._shard(old_key)
+            with old_lock:
+                if entity_id in old_shard:
+                    del old_shard[entity_id]  # Not pop(): dict.pop would skip the location index
+
+    # Mapping interface
+    def __getitem__(self, entity_id: str) -> Any:
+        key = self._fleet_of.get(entity_id)
+        if key is None:
+            raise KeyError(entity_id)
+        return self._shards[key][entity_id]
+
+    def __setitem__(self, entity_id: str, entity: Any) -> None:
+        self._move(entity_id, entity, self._fleet_of.get(entity_id),
+                   normalize_fleet(getattr(entity, self.fleet_attr, None)))
+        for observer in self.observers:
+            observer.upsert(entity)
+
+    def __delitem__(self, entity_id: str) -> None:
+        key = self._fleet_of.get(entity_id)
+        if key is None:
+            raise KeyError(entity_id)
+        shard, lock = self._shard(key)
+        with lock:
+            del shard[entity_id]
+            del self._fleet_of[entity_id]
+        for observer in self.observers:
+            observer.remove(entity_id)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._fleet_of
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._fleet_of))
+
+    def __len__(self) -> int:
+        return len(self._fleet_of)
+
+    def values(self) -> Iterator[Any]:
+        """Iterate every entity, shard by shard."""
+        for shard in list(self._shards.values()):
+            yield from list(shard.values())
+
+    # Storage interface shared with indexes.EntityTable
+    def save(self, entity: Any) -> None:
+        """
+        Refresh indexes after a stored entity changed, moving it to another
+        shard if its fleet changed. Entities that are not the stored object for
+        their id are ignored.
+
+        Args:
+            entity: The changed entity
+        """
+        entity_id = getattr(entity, self.id_attr)
+        old_key = self._fleet_of.get(entity_id)
+        if old_key is None or self._shards[old_key].get(entity_id) is not entity:
+            return
+        new_key = normalize_fleet(getattr(entity, self.fleet_attr, None))
+        if new_key != old_key:
+            self._move(entity_id, entity, old_key, new_key)
+        else:
+            shard, lock = self._shard(old_key)
+            with lock:
+                shard.save(entity)
+        for observer in self.observers:
+            observer.upsert(entity)
+
+    def save_many(self, entities: List[Any]) -> None:
+        """
+        Store a batch of entities under their ids, each in its fleet's shard.
+
+        Args:
+            entities (list): Entities to store
+        """
+        for entity in entities:
+            self[getattr(entity, self.id_attr)] = entity
+
+    def in_fleet(self, fleet: Optional[str]) -> EntityTable:
+        """
+        Get the table for one fleet. Treat it as read-only.
+
+        Args:
+            fleet (str): Fleet name; None or "" for entities without a fleet
+
+        Returns:
+            EntityTable: The fleet's shard (empty if the fleet has no entities)
+        """
+        shard = self._shards.get(normalize_fleet(fleet))
+        return shard if shard is not None else EntityTable(self.id_attr, self.location_attr)
+
+    def fleets(self) -> Dict[str, int]:
+        """
+        Get the number of entities in each shard.
+
+        Returns:
+            dict: Shard key to entity count
+        """
+        return {key: len(shard) for key, shard in list(self._shards.items())}
+
+    def _fan_out(self, query: Callable[[EntityTable], List[Any]]) -> List[Any]:
+        return [entity for shard in list(self._shards.values()) for entity in query(shard)]
+
+    def by_location(self, location: Optional[str]) -> List[Any]:
+        """
+        Get all entities at a location (case-insensitive), across every fleet.
+
+        Args:
+            location (str): Location to look up
+
+        Returns:
+            list: Entities at that location
+        """
+        return self._fan_out(lambda shard: shard.by_location(location))
+
+    def where(self, **criteria: Any) -> List[Any]:
+        """
+        Get all entities whose attributes equal the given values, across every fleet.
+
+        Args:
+            **criteria: Attribute name to expected value
+
+        Returns:
+            list: Matching entities
+        """
+        return self._fan_out(lambda shard: shard.where(**criteria))
+
+    def page(self, after: Optional[str], limit: int) -> List[Tuple[str, Any]]:
+        """
+        Get up to limit entities in id order across every fleet, starting after a given id.
+
+        Args:
+            after (str): Id of the last entity on the previous page, or None for the first page
+            limit (int): Maximum number of entities to return
+
+        Returns:
+            list: (id, entity) pairs
+        """
+        pages = [shard.page(after, limit) for shard in list(self._shards.values())]
+        return list(islice(heapq.merge(*pages, key=lambda row: row[0]), limit))
+
+    def index_sizes(self) -> Dict[str, int]:
+        """Get the number of entries in each secondary index, summed over shards."""
+        shards = list(self._shards.values())
+        return {
+            'location': sum(len(shard.locations) for shard in shards),
+            'fleet_directory': len(self._fleet_of),
+            'shards': len(shards)
+        }
+
+    def flush(self) -> None:
+        """Nothing is buffered in memory; present for interface parity."""
+
+    def clear(self) -> None:
+        with self._registry_lock:
+            self._shards.clear()
+            self._shard_locks.clear()
+            self._fleet_of.clear()
+        for observer in self.observers:
+            observer.clear()
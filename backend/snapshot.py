@@ -0,0 +1,149 @@
+import gc
+import os
+import pickle
+import struct
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from driver import Driver
+from truck import Truck
+from trailer import Trailer
+
+# File layout: MAGIC | header (format version, payload crc32, payload length) | payload
+# The payload is a pickle of plain tuples, so only load snapshots this service wrote.
+MAGIC = b"FLEETSNP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<HIQ")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is missing its header, corrupt, or from an unknown format version."""
+
+
+def _pack(entity_cls: Any, entities: Iterable[Any]) -> Dict[str, Any]:
+    fields = entity_cls.RECORD_FIELDS
+    rows = []
+    for entity in entities:
+        record = entity.to_record()
+        rows.append(tuple(record[field] for field in fields))
+    return {'fields': fields, 'rows': rows}
+
+
+def _unpack(entity_cls: Any, section: Dict[str, Any]) -> List[Any]:
+    fields = section['fields']
+    return [entity_cls.from_record(dict(zip(fields, row))) for row in section['rows']]
+
+
+def capture_snapshot(drivers: Iterable[Driver], trucks: Iterable[Truck], trailers: Iterable[Trailer],
+                     orders: Iterable[Dict[str, Any]], journal_offset: int = 0) -> Dict[str, Any]:
+    """
+    Copy the fleet into the plain structure a snapshot stores.
+
+    The result shares nothing with the live entities or order dicts, so the
+    caller can hold its locks for the copy only and write the file later.
+
+    Args:
+        drivers, trucks, trailers: Entities to store
+        orders: Order dicts to store
+        journal_offset (int): First journal entry not reflected in this snapshot
+
+    Returns:
+        dict: Content for write_snapshot_content
+    """
+    return {
+        'created_at': datetime.now().isoformat(),
+        'journal_offset': journal_offset,
+        'drivers': _pack(Driver, drivers),
+        'trucks': _pack(Truck, trucks),
+        'trailers': _pack(Trailer, trailers),
+        'orders': [dict(order) for order in orders]
+    }
+
+
+def write_snapshot_content(path: str, content: Dict[str, Any]) -> int:
+    """
+    Write content from capture_snapshot as a binary snapshot.
+
+    The file is written next to the target and renamed into place, so a crash
+    mid-write never leaves a truncated snapshot behind.
+
+    Args:
+        path (str): Destination file
+        content (dict): Result of capture_snapshot
+
+    Returns:
+        int: Size of the snapshot in bytes
+    """
+    payload = pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(FORMAT_VERSION, zlib.crc32(payload), len(payload)))
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(MAGIC) + _HEADER.size + len(payload)
+
+
+def write_snapshot(path: str, drivers: Iterable[Driver], trucks: Iterable[Truck],
+                   trailers: Iterable[Trailer], orders: Iterable[Dict[str, Any]], journal_offset: int = 0) -> int:
+    """
+    Write a binary snapshot of the fleet.
+
+    Args:
+        path (str): Destination file
+        drivers, trucks, trailers: Entities to store
+        orders: Order dicts to store
+        journal_offset (int): First journal entry not reflected in this snapshot
+
+    Returns:
+        int: Size of the snapshot in bytes
+    """
+    return write_snapshot_content(path, capture_snapshot(drivers, trucks, trailers, orders, journal_offset))
+
+
+def read_snapshot(path: str) -> Dict[str, Any]:
+    """
+    Read a binary snapshot written by write_snapshot.
+
+    Args:
+        path (str): Snapshot file
+
+    Returns:
+        dict: 'created_at', 'journal_offset', 'drivers', 'trucks', 'trailers' (entity lists) and 'orders'.
+        Trucks come back without their assigned_driver/attached_trailer links.
+
+    Raises:
+        SnapshotError: If the file is not a snapshot, is corrupt, or has an unsupported version
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if data[:len(MAGIC)] != MAGIC:
+        raise SnapshotError(f"{path} is not a fleet snapshot")
+    version, crc, length = _HEADER.unpack_from(data, len(MAGIC))
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format version {version} (expected {FORMAT_VERSION})")
+    payload = memoryview(data)[len(MAGIC) + _HEADER.size:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise SnapshotError(f"{path} is truncated or corrupt")
+
+    # Building many small objects back to back triggers repeated, useless GC passes
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        content = pickle.loads(payload)
+        return {
+            'created_at': content['created_at'],
+            'journal_offset': content.get('journal_offset', 0),  # Absent in snapshots written before journaling
+            'drivers': _unpack(Driver, content['drivers']),
+            'trucks': _unpack(Truck, content['trucks']),
+            'trailers': _unpack(Trailer, content['trailers']),
+            'orders': content['orders']
+        }
+    finally:
+        if gc_was_enabled:
+            gc.enable()
@@ -0,0 +1,207 @@
+import heapq
+import math
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from geo import LatLon, geocode, haversine_miles, haversine_miles_many
+
+CELL_DEGREES = 1.0  # Grid cell size in degrees of latitude and longitude
+
+# Cell key: (latitude band, longitude band)
+CellKey = Tuple[int, int]
+
+
+def _cell_of(point: LatLon) -> CellKey:
+    return (math.floor(point[0] / CELL_DEGREES), math.floor(point[1] / CELL_DEGREES))
+
+
+def _cell_bounds(cell: CellKey) -> Tuple[LatLon, float]:
+    # Center of the cell and the distance from it to its farthest corner, with a little slack
+    south, west = cell[0] * CELL_DEGREES, cell[1] * CELL_DEGREES
+    center = (south + CELL_DEGREES / 2, west + CELL_DEGREES / 2)
+    corners = [(south, west), (south, west + CELL_DEGREES),
+               (south + CELL_DEGREES, west), (south + CELL_DEGREES, west + CELL_DEGREES)]
+    return center, max(haversine_miles(center, corner) for corner in corners) * 1.01
+
+
+class SpatialIndex:
+    """
+    Grid index of entity positions for nearest-neighbour and radius queries.
+
+    Entities are placed at the gazetteer coordinates of their location and
+    bucketed into CELL_DEGREES lat/lon cells; entities at the same place
+    share one point entry. A query measures the distance to every non-empty
+    cell's center at once, then visits cells in order of the closest any of
+    their points could be, stopping as soon as no unvisited cell can beat
+    the results so far. Entities whose location is not in the gazetteer
+    are not indexed.
+
+    Implements the table observer interface (upsert, remove, clear); a
+    save that leaves the location unchanged costs one string compare.
+    """
+
+    def __init__(self, id_attr: str, location_attr: str):
+        self.id_attr = id_attr
+        self.location_attr = location_attr
+        self._cells: Dict[CellKey, Dict[LatLon, Set[str]]] = {}
+        self._placed: Dict[str, Tuple[Optional[str], Optional[LatLon]]] = {}
+        self._grid: Optional[Tuple[List[CellKey], np.ndarray, np.ndarray, np.ndarray]] = None
+        self._lock = threading.Lock()
+
+    # Table observer interface
+    def upsert(self, entity: Any) -> None:
+        entity_id = getattr(entity, self.id_attr)
+        place = getattr(entity, self.location_attr, None)
+        placed = self._placed.get(entity_id)
+        if placed is not None and placed[0] == place:
+            return
+        point = geocode(place)
+        with self._lock:
+            self._unplace(entity_id)
+            self._placed[entity_id] = (place, point)
+            if point is None:
+                return
+            cell = _cell_of(point)
+            points = self._cells.get(cell)
+            if points is None:
+                points = self._cells[cell] = {}
+                self._grid = None
+            points.setdefault(point, set()).add(entity_id)
+
+    def remove(self, entity_id: str) -> None:
+        with self._lock:
+            self._unplace(entity_id)
+            self._placed.pop(entity_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cells.clear()
+            self._placed.clear()
+            self._grid = None
+
+    def rebuild(self, entities: Any) -> None:
+        """Index every entity from scratch."""
+        self.clear()
+        for entity in entities:
+            self.upsert(entity)
+
+    def _unplace(self, entity_id: str) -> None:
+        placed = self._placed.get(entity_id)
+        if placed is None or placed[1] is None:
+            return
+        cell = _cell_of(placed[1])
+        points = self._cells[cell]
+        ids = points[placed[1]]
+        ids.discard(entity_id)
+        if not ids:
+            del points[placed[1]]
+            if not points:
+                del self._cells[cell]
+                self._grid = None
+
+    def _cell_order(self, origin: LatLon) -> Tuple[List[CellKey], np.ndarray]:
+        # Non-empty cells sorted by the least distance any point in them can have from origin
+        if self._grid is None:
+            keys = list(self._cells)
+            bounds = [_cell_bounds(cell) for cell in keys]
+            lats = np.array([center[0] for center, _ in bounds])
+            lons = np.array([center[1] for center, _ in bounds])
+            radii = np.array([radius for _, radius in bounds])
+            self._grid = (keys, lats, lons, radii)
+        keys, lats, lons, radii = self._grid
+        lower = np.maximum(haversine_miles_many(origin, lats, lons) - radii, 0.0)
+        order = np.argsort(lower)
+        return [keys[i] for i in order.tolist()], lower[order]
+
+    # Queries
+    def nearest(self, origin: LatLon, k: int, where: Optional[Callable[[str], bool]] = None,
+                max_miles: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        Get the k closest entities to a point.
+
+        Args:
+            origin (tuple): (lat, lon) in degrees
+            k (int): Number of entities to return
+            where: Optional filter on entity id (e.g. availability)
+            max_miles (float): Ignore entities farther than this
+
+        Returns:
+            list: (entity id, miles) pairs, nearest first; ties are broken by id;
+            empty when k is not positive
+        """
+        if k <= 0:
+            return []
+        limit = math.inf if max_miles is None else max_miles
+        best: List[Tuple[float, "_Descending"]] = []  # Heap of the k best; best[0] is the worst of them
+        with self._lock:
+            cells, lower = self._cell_order(origin)
+            for cell, bound in zip(cells, lower.tolist()):
+                kth = -best[0][0] if len(best) == k else limit
+                if bound > kth:
+                    break
+                for point, ids in self._cells[cell].items():
+                    miles = haversine_miles(origin, point)
+                    if miles > (-best[0][0] if len(best) == k else limit):
+                        continue
+                    for entity_id in sorted(ids):
+                        if where is not None and not where(entity_id):
+                            continue
+                        entry = (-miles, _Descending(entity_id))
+                        if len(best) < k:
+                            heapq.heappush(best, entry)
+                        elif entry > best[0]:
+                            heapq.heapreplace(best, entry)
+                        else:
+                            break  # The rest of this point's ids sort after this one
+        return [(entry[1].value, -entry[0]) for entry in sorted(best, reverse=True)]
+
+    def within(self, origin: LatLon, miles: float,
+               where: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, float]]:
+        """
+        Get every entity within a distance of a point.
+
+        Args:
+            origin (tuple): (lat, lon) in degrees
+            miles (float): Search radius
+            where: Optional filter on entity id (e.g. availability)
+
+        Returns:
+            list: (entity id, miles) pairs, nearest first, ties broken by id
+        """
+        found = []
+        with self._lock:
+            cells, lower = self._cell_order(origin)
+            for cell, bound in zip(cells, lower.tolist()):
+                if bound > miles:
+                    break
+                for point, ids in self._cells[cell].items():
+                    distance = haversine_miles(origin, point)
+                    if distance <= miles:
+                        found.extend((entity_id, distance) for entity_id in ids
+                                     if where is None or where(entity_id))
+        found.sort(key=lambda item: (item[1], item[0]))
+        return found
+
+    def position_of(self, entity_id: str) -> Optional[LatLon]:
+        """Get the indexed coordinates of an entity, or None."""
+        placed = self._placed.get(entity_id)
+        return placed[1] if placed else None
+
+    def __len__(self) -> int:
+        return sum(1 for _, point in self._placed.values() if point is not None)
+
+
+class _Descending:
+    # Reverses id order inside the max-heap so that, at equal distance, the smaller id wins
+    __slots__ = ('value',)
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return self.value > other.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
@@ -0,0 +1,588 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from datetime import datetime, date
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from driver import Driver
+from truck import Truck
+from trailer import Trailer
+from indexes import normalize_location
+from shards import normalize_fleet
+from order_store import normalize_status
+
+# Get logger
+logger = logging.getLogger('dispatch_logger')
+
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+FETCH_SIZE = 1000
+
+
+def _encode(value: Any) -> Any:
+    """JSON fallback encoder that tags dates so they round-trip as dates."""
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    """JSON object hook that restores values tagged by _encode."""
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    if '__date__' in obj:
+        return date.fromisoformat(obj['__date__'])
+    return obj
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    """
+    Run a block of statements as one transaction.
+
+    The connection is in autocommit mode (isolation_level=None), where
+    `with conn:` does not open a transaction, so every statement of an
+    executemany would commit on its own. This issues BEGIN and COMMIT
+    explicitly and rolls the whole block back if it raises.
+    """
+    conn.execute("BEGIN")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, default=_encode, separators=(',', ':'))
+
+
+def loads(data: str) -> Any:
+    return json.loads(data, object_hook=_decode)
+
+
+class SQLiteEntityTable(MutableMapping):
+    """
+    Dict-like table of entities stored in SQLite.
+
+    Rows hold the entity's to_record() as JSON plus a few indexed columns used
+    for lookups. Hydrated entities are kept in a bounded LRU cache so repeated
+    access returns the same object, and writes are buffered and flushed in
+    batches with executemany. Any read that goes to SQL flushes first.
+
+    Observers work as in indexes.EntityTable.
+    """
+
+    def __init__(self, backend: "SQLiteBackend", table: str, entity_cls: Any, id_attr: str,
+                 location_attr: str, columns: Dict[str, str],
+                 on_load: Optional[Callable[[Any], None]] = None):
+        self._backend = backend
+        self._conn = backend.conn
+        self._lock = backend.lock
+        self.table = table
+        self.entity_cls = entity_cls
+        self.id_attr = id_attr
+        self.location_attr = location_attr
+        self.columns = columns
+        self.on_load = on_load
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._pending: Dict[str, Any] = {}
+        self._oldest_pending: Optional[float] = None
+        self.observers: List[Any] = []
+
+        column_defs = "".join(f", {name} {sql_type}" for name, sql_type in columns.items())
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, location_key TEXT, "
+            f"fleet_key TEXT NOT NULL DEFAULT ''{column_defs}, data TEXT NOT NULL)"
+        )
+        # Files written before fleet sharding lack fleet_key; every existing row is unassigned
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        if 'fleet_key' not in existing:
+            self._conn.execute(f"ALTER TABLE {table} ADD COLUMN fleet_key TEXT NOT NULL DEFAULT ''")
+        for name in ('location_key', 'fleet_key', *columns):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{name} ON {table} ({name})")
+
+        # Statement text is fixed per table so sqlite3's statement cache reuses the prepared form
+        names = ['id', 'location_key', 'fleet_key', *columns, 'data']
+        self._upsert_sql = (
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)}) "
+            f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{n} = excluded.{n}' for n in names[1:])}"
+        )
+        self._get_sql = f"SELECT data FROM {table} WHERE id = ?"
+        self._exists_sql = f"SELECT 1 FROM {table} WHERE id = ?"
+        self._delete_sql = f"DELETE FROM {table} WHERE id = ?"
+        self._ids_sql = f"SELECT id FROM {table} ORDER BY rowid"
+        self._count_sql = f"SELECT COUNT(*) FROM {table}"
+        self._all_sql = f"SELECT id, data FROM {table} ORDER BY rowid"
+        self._location_sql = f"SELECT id, data FROM {table} WHERE location_key = ? ORDER BY rowid"
+        self._page_sql = f"SELECT id, data FROM {table} WHERE id > ? ORDER BY id LIMIT ?"
+
+    # Row conversion
+    def _row(self, entity: Any) -> tuple:
+        values = [getattr(entity, self.id_attr), normalize_location(getattr(entity, self.location_attr)),
+                  normalize_fleet(getattr(entity, 'assigned_fleet', None))]
+        for name in self.columns:
+            value = getattr(entity, name)
+            values.append(int(value) if isinstance(value, bool) else value)
+        values.append(dumps(entity.to_record()))
+        return tuple(values)
+
+    def _hydrate(self, entity_id: str, data: str) -> Any:
+        entity = self._cache.get(entity_id)
+        if entity is not None:
+            self._cache.move_to_end(entity_id)
+            return entity
+        entity = self.entity_cls.from_record(loads(data))
+        self._remember(entity_id, entity)
+        if self.on_load:
+            self.on_load(entity)
+        return entity
+
+    def _remember(self, entity_id: str, entity: Any) -> None:
+        self._cache[entity_id] = entity
+        self._cache.move_to_end(entity_id)
+        # Pending entities stay reachable through _pending, so eviction is safe
+        while len(self._cache) > self._backend.cache_size:
+            self._cache.popitem(last=False)
+
+    def cached(self, entity_id: str) -> Optional[Any]:
+        """Get an entity only if it is already in memory, without going to SQL."""
+        entity = self._pending.get(entity_id)
+        return entity if entity is not None else self._cache.get(entity_id)
+
+    def _rows(self, sql: str, params: tuple = ()) -> Iterator[Any]:
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        for entity_id, data in rows:
+            yield self._hydrate(entity_id, data)
+
+    # Mapping interface
+    def __getitem__(self, entity_id: str) -> Any:
+        entity = self._pending.get(entity_id)
+        if entity is None:
+            entity = self._cache.get(entity_id)
+        if entity is not None:
+            self._cache[entity_id] = entity
+            self._cache.move_to_end(entity_id)
+            return entity
+        with self._lock:
+            row = self._conn.execute(self._get_sql, (entity_id,)).fetchone()
+        if row is None:
+            raise KeyError(entity_id)
+        return self._hydrate(entity_id, row[0])
+
+    def __setitem__(self, entity_id: str, entity: Any) -> None:
+        with self._lock:
+            self._remember(entity_id, entity)
+            self._pending[entity_id] = entity
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+            due = (len(self._pending) >= self._backend.batch_size
+                   or time.monotonic() - self._oldest_pending >= self._backend.flush_interval)
+        for observer in self.observers:
+            observer.upsert(entity)
+        if due:
+            self.flush()
+
+    def __delitem__(self, entity_id: str) -> None:
+        self.flush()
+        with self._lock:
+            cursor = self._conn.execute(self._delete_sql, (entity_id,))
+        self._cache.pop(entity_id, None)
+        if cursor.rowcount == 0:
+            raise KeyError(entity_id)
+        for observer in self.observers:
+            observer.remove(entity_id)
+
+    def __contains__(self, entity_id: object) -> bool:
+        if entity_id in self._pending or entity_id in self._cache:
+            return True
+        with self._lock:
+            return self._conn.execute(self._exists_sql, (entity_id,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        self.flush()
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(self._ids_sql)]
+        return iter(ids)
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._lock:
+            return self._conn.execute(self._count_sql).fetchone()[0]
+
+    def values(self) -> Iterator[Any]:
+        """Stream every entity in insertion order, a fetch block at a time."""
+        self.flush()
+        with self._lock:
+            cursor = self._conn.execute(self._all_sql)
+        while True:
+            # Take the lock per block, never across a yield
+            with self._lock:
+                rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            for entity_id, data in rows:
+                yield self._hydrate(entity_id, data)
+
+    # Storage interface shared with indexes.EntityTable
+    def save(self, entity: Any) -> None:
+        """
+        Queue a changed entity for writing.
+
+        Entities that are not stored (or are a different object than the cached
+        one for their id) are ignored.
+
+        Args:
+            entity: The changed entity
+        """
+        entity_id = getattr(entity, self.id_attr)
+        cached = self._pending.get(entity_id) or self._cache.get(entity_id)
+        if cached is entity or (cached is None and entity_id in self):
+            self[entity_id] = entity
+
+    def save_many(self, entities: List[Any]) -> None:
+        """
+        Write a batch of entities in a single transaction, bypassing the write buffer.
+
+        Args:
+            entities (list): Entities to store
+        """
+        self.flush()
+        with self._lock:
+            rows = [self._row(entity) for entity in entities]
+            with transaction(self._conn):
+                self._conn.executemany(self._upsert_sql, rows)
+            for entity in entities:
+                self._remember(getattr(entity, self.id_attr), entity)
+        for entity in entities:
+            for observer in self.observers:
+                observer.upsert(entity)
+
+    def by_location(self, location: Optional[str]) -> List[Any]:
+        """
+        Get all entities at a location (case-insensitive) via the location_key index.
+
+        Args:
+            location (str): Location to look up
+
+        Returns:
+            list: Entities at that location
+        """
+        return list(self._rows(self._location_sql, (normalize_location(location),)))
+
+    def where(self, **criteria: Any) -> List[Any]:
+        """
+        Get all entities whose indexed columns equal the given values.
+
+        Args:
+            **criteria: Column name to expected value (must be an indexed column)
+
+        Returns:
+            list: Matching entities
+        """
+        unknown = set(criteria) - set(self.columns)
+        if unknown:
+            raise ValueError(f"Cannot filter {self.table} on unindexed columns: {sorted(unknown)}")
+        clause = " AND ".join(f"{name} = ?" for name in criteria)
+        params = tuple(int(v) if isinstance(v, bool) else v for v in criteria.values())
+        return list(self._rows(f"SELECT id, data FROM {self.table} WHERE {clause} ORDER BY rowid", params))
+
+    def in_fleet(self, fleet: Optional[str]) -> "SQLiteFleetView":
+        """
+        Get a read-only view of one fleet's entities, queried through the fleet_key index.
+
+        Args:
+            fleet (str): Fleet name; None or "" for entities without a fleet
+
+        Returns:
+            SQLiteFleetView: The fleet's entities
+        """
+        return SQLiteFleetView(self, normalize_fleet(fleet))
+
+    def page(self, after: Optional[str], limit: int) -> List[Tuple[str, Any]]:
+        """
+        Get up to limit entities in id order, starting after a given id (keyset pagination on the primary key).
+
+        Args:
+            after (str): Id of the last entity on the previous page, or None for the first page
+            limit (int): Maximum number of entities to return
+
+        Returns:
+            list: (id, entity) pairs
+        """
+        entities = self._rows(self._page_sql, ("" if after is None else after, limit))
+        return [(getattr(entity, self.id_attr), entity) for entity in entities]
+
+    def index_sizes(self) -> Dict[str, int]:
+        """Get the size of the in-memory structures; the SQL indexes live on disk."""
+        return {'cache': len(self._cache), 'pending': len(self._pending)}
+
+    def flush(self) -> None:
+        """Write all buffered entities in a single transaction."""
+        if not self._pending:
+            return
+        # Held across the snapshot and the write so concurrent saves are never dropped
+        with self._lock:
+            rows = [self._row(entity) for entity in self._pending.values()]
+            with transaction(self._conn):
+                self._conn.executemany(self._upsert_sql, rows)
+            self._pending.clear()
+            self._oldest_pending = None
+
+    def clear(self) -> None:
+        with self._lock:
+            with transaction(self._conn):
+                self._conn.execute(f"DELETE FROM {self.table}")
+        self._pending.clear()
+        self._cache.clear()
+        self._oldest_pending = None
+        for observer in self.observers:
+            observer.clear()
+
+
+class SQLiteFleetView:
+    """One fleet's slice of a SQLiteEntityTable, with the read side of its interface."""
+
+    def __init__(self, table: SQLiteEntityTable, fleet_key: str):
+        self._table = table
+        self.fleet_key = fleet_key
+
+    def _select(self, clause: str = "", params: tuple = ()) -> List[Any]:
+        sql = f"SELECT id, data FROM {self._table.table} WHERE fleet_key = ?{clause} ORDER BY rowid"
+        return list(self._table._rows(sql, (self.fleet_key, *params)))
+
+    def values(self) -> List[Any]:
+        return self._select()
+
+    def by_location(self, location: Optional[str]) -> List[Any]:
+        return self._select(" AND location_key = ?", (normalize_location(location),))
+
+    def where(self, **criteria: Any) -> List[Any]:
+        unknown = set(criteria) - set(self._table.columns)
+        if unknown:
+            raise ValueError(f"Cannot filter {self._table.table} on unindexed columns: {sorted(unknown)}")
+        clause = "".join(f" AND {name} = ?" for name in criteria)
+        return self._select(clause, tuple(int(v) if isinstance(v, bool) else v for v in criteria.values()))
+
+    def __len__(self) -> int:
+        self._table.flush()
+        with self._table._lock:
+            sql = f"SELECT COUNT(*) FROM {self._table.table} WHERE fleet_key = ?"
+            return self._table._conn.execute(sql, (self.fleet_key,)).fetchone()[0]
+
+
+class SQLiteOrderStore:
+    """
+    SQLite-backed order store with the same interface as order_store.OrderStore.
+
+    Orders are stored as JSON with indexed order_id, driver_id and status_key
+    columns. Dicts returned from queries are copies; use update() to change an
+    order.
+    """
+
+    def __init__(self, backend: "SQLiteBackend"):
+        self._conn = backend.conn
+        self._lock = backend.lock
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS orders (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "order_id TEXT, driver_id TEXT, status_key TEXT, data TEXT NOT NULL)"
+        )
+        for name in ('order_id', 'driver_id', 'status_key'):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_orders_{name} ON orders ({name})")
+
+    @staticmethod
+    def _row(order: Dict[str, Any]) -> tuple:
+        return (order.get('Order #'), order.get('Driver1 ID'), normalize_status(order.get('Status')), dumps(order))
+
+    def _select(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [loads(row[0]) for row in rows]
+
+    def add(self, order: Dict[str, Any]) -> None:
+        self.extend([order])
+
+    def extend(self, orders: List[Dict[str, Any]]) -> int:
+        rows = [self._row(order) for order in orders]
+        with self._lock:
+            with transaction(self._conn):
+                self._conn.executemany(
+                    "INSERT INTO orders (order_id, driver_id, status_key, data) VALUES (?, ?, ?, ?)", rows
+                )
+        return len(rows)
+
+    def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        orders = self._select("SELECT data FROM orders WHERE order_id = ? ORDER BY seq LIMIT 1", (order_id,))
+        return orders[0] if orders else None
+
+    def by_status(self, status: str) -> List[Dict[str, Any]]:
+        return self._select("SELECT data FROM orders WHERE status_key = ? ORDER BY seq", (normalize_status(status),))
+
+    def by_driver(self, driver_id: str) -> List[Dict[str, Any]]:
+        if driver_id is None:
+            return self._select("SELECT data FROM orders WHERE driver_id IS NULL ORDER BY seq")
+        return self._select("SELECT data FROM orders WHERE driver_id = ? ORDER BY seq", (driver_id,))
+
+    def update(self, order_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if 'Order #' in changes:
+            raise ValueError("'Order #' cannot be changed")
+        with self._lock:
+            with transaction(self._conn):
+                row = self._conn.execute(
+                    "SELECT seq, data FROM orders WHERE order_id = ? ORDER BY seq LIMIT 1", (order_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                order = loads(row[1])
+                order.update(changes)
+                self._conn.execute(
+                    "UPDATE orders SET driver_id = ?, status_key = ?, data = ? WHERE seq = ?",
+                    (*self._row(order)[1:], row[0])
+                )
+        return order
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self._select("SELECT data FROM orders ORDER BY seq")
+
+    def page(self, after: Optional[int], limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, data FROM orders WHERE seq > ? ORDER BY seq LIMIT ?",
+                (-1 if after is None else after, limit)
+            ).fetchall()
+        return [(seq, loads(data)) for seq, data in rows]
+
+    def index_sizes(self) -> Dict[str, int]:
+        """Orders are indexed in SQLite only; nothing is held in memory."""
+        return {}
+
+    def flush(self) -> None:
+        """Order writes are committed immediately; present for interface parity."""
+
+    def clear(self) -> None:
+        with self._lock:
+            with transaction(self._conn):
+                self._conn.execute("DELETE FROM orders")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def __iter__(self):
+        return iter(self.all())
+
+
+class SQLiteBackend:
+    """
+    Persistent storage engine on a local SQLite file in WAL mode.
+
+    Holds one connection shared by the driver, truck, trailer and order
+    tables. Trucks are relinked to their driver and trailer objects when they
+    are loaded, and a driver or trailer loaded again after cache eviction is
+    relinked into its truck if that truck is still in memory. A background
+    thread flushes buffered writes every flush_interval seconds, so they do
+    not wait for the next write to go out.
+
+    When applied_offset is set, each flush also stores the journal offset it
+    returns in a meta table, so a restart only replays the journal entries the
+    file does not already hold.
+    """
+
+    def __init__(self, path: str, cache_size: int = DEFAULT_CACHE_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.path = path
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+
+        self.drivers = SQLiteEntityTable(self, 'drivers', Driver, 'driver_id', 'current_location',
+                                         {'is_available': 'INTEGER', 'assigned_truck_id': 'TEXT'},
+                                         on_load=self._link_driver)
+        self.trailers = SQLiteEntityTable(self, 'trailers', Trailer, 'trailer_id', 'location',
+                                          {'is_working_condition': 'INTEGER', 'attached_truck_id': 'TEXT'},
+                                          on_load=self._link_trailer)
+        self.trucks = SQLiteEntityTable(self, 'trucks', Truck, 'truck_id', 'location',
+                                        {'is_drivable': 'INTEGER', 'driver_id': 'TEXT', 'attached_trailer_id': 'TEXT'},
+                                        on_load=self._link_truck)
+        self.orders = SQLiteOrderStore(self)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        # Returns the offset below which every journaled mutation has reached the tables
+        self.applied_offset: Optional[Callable[[], Optional[int]]] = None
+        self._stored_offset: Optional[int] = None
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name=f"sqlite-flush-{path}", daemon=True)
+        self._flusher.start()
+        logger.info(f"SQLite storage opened at {path}")
+
+    def _link_truck(self, truck: Truck) -> None:
+        """Restore a loaded truck's object links from its stored ids."""
+        if truck.driver_id:
+            truck.assigned_driver = self.drivers.get(truck.driver_id)
+        if truck.attached_trailer_id:
+            truck.attached_trailer = self.trailers.get(truck.attached_trailer_id)
+
+    def _link_driver(self, driver: Driver) -> None:
+        """Point the in-memory truck of a reloaded driver at the new driver object."""
+        truck = self.trucks.cached(driver.assigned_truck_id) if driver.assigned_truck_id else None
+        if truck is not None and truck.driver_id == driver.driver_id:
+            truck.assigned_driver = driver
+
+    def _link_trailer(self, trailer: Trailer) -> None:
+        """Point the in-memory truck of a reloaded trailer at the new trailer object."""
+        truck = self.trucks.cached(trailer.attached_truck_id) if trailer.attached_truck_id else None
+        if truck is not None and truck.attached_trailer_id == trailer.trailer_id:
+            truck.attached_trailer = trailer
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing SQLite storage at {self.path}: {e}")
+
+    def journal_offset(self) -> int:
+        """Journal offset stored by the last flush, or 0 if none was."""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'journal_offset'").fetchone()
+        return int(row[0]) if row else 0
+
+    def flush(self) -> None:
+        """Write every buffered entity, then record the journal offset they cover."""
+        # Read the offset first: everything applied by now is buffered and written below
+        offset = self.applied_offset() if self.applied_offset else None
+        self.drivers.flush()
+        self.trucks.flush()
+        self.trailers.flush()
+        if offset is not None and offset != self._stored_offset:
+            with self.lock:
+                with transaction(self.conn):
+                    self.conn.execute(
+                        "INSERT INTO meta (key, value) VALUES ('journal_offset', ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (str(offset),)
+                    )
+                self._stored_offset = offset
+
+    def close(self) -> None:
+        """Stop the flush thread, flush buffered writes and close the connection."""
+        self._closed.set()
+        self._flusher.join()
+        self.flush()
+        with self.lock:
+            self.conn.close()
+        logger.info(f"SQLite storage closed at {self.path}")
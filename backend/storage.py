@@ -1,30 +1,391 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Iterator, TYPE_CHECKING
+from contextlib import contextmanager
 import csv
 import json
 import logging
-from datetime import datetime, date
+import os
+import threading
+import time
+from datetime import datetime, date, timedelta
 from driver import Driver
 from truck import Truck
 from trailer import Trailer
+from shards import ShardedTable
+from order_store import OrderStore
+from locks import EntityLocks
+from expiries import ExpiryIndex, EXPIRY_FIELDS
+from eligibility import REASON_CODES
+from geo import drive_hours, geocode
+from metrics import LatencyRecorder, estimate_memory
+from events import silenced
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor, check_page_size
+
+# The SQLite engine and snapshot codec are imported on first use to keep
+# importing this module cheap
+if TYPE_CHECKING:
+    from sqlite_backend import SQLiteBackend
+    from fleet_columns import FleetColumns
+    from distance_matrix import DistanceMatrix
+    from spatial import SpatialIndex
+    from journal import Journal
 
 # Get logger
 logger = logging.getLogger('dispatch_logger')
 
-# In-memory storage Some Stubs for now
-_drivers: Dict[str, Driver] = {}
-_trucks: Dict[str, Truck] = {}
-_trailers: Dict[str, Trailer] = {}
-_orders: List[Dict[str, Any]] = []
+# Backend selection, overridable with configure_storage()
+STORAGE_BACKEND = os.getenv("FLEET_STORAGE_BACKEND", "memory")
+SQLITE_PATH = os.getenv("FLEET_SQLITE_PATH", "fleet.db")
+SNAPSHOT_PATH = os.getenv("FLEET_SNAPSHOT_PATH")  # Restored at startup when set and present
+JOURNAL_PATH = os.getenv("FLEET_JOURNAL_PATH")  # Mutation journal, replayed at startup when set
 
-# Load initial data (stub implementation)
-# TODO: Replace with actual database in the future 
-def initialize_storage():
-    """Initialize storage with sample data"""
+# Entity tables. In memory (sharded by assigned_fleet) by default;
+# configure_storage("sqlite") swaps in SQLite-backed tables with the same
+# interface (dict access, save, by_location, where, in_fleet)
+_drivers = ShardedTable('driver_id', 'current_location')
+_trucks = ShardedTable('truck_id', 'location')
+_trailers = ShardedTable('trailer_id', 'location')
+_orders = OrderStore()  # Indexed on 'Order #', 'Driver1 ID' and normalized 'Status'
+_backend: Optional["SQLiteBackend"] = None
+
+# Columnar NumPy copy of the fleet, built on first use by _fleet_columns()
+_columns: Optional["FleetColumns"] = None
+
+# Drivers and trucks by open load origins distance matrix, built on first use by _distance_matrix()
+_distances: Optional["DistanceMatrix"] = None
+
+# Nearest-asset grid indexes per entity kind, built on first use by _spatial_indexes()
+_spatial: Optional[Dict[str, "SpatialIndex"]] = None
+
+# Time-ordered expiry indexes per entity kind, built on first use by _expiry_indexes()
+_expiries: Optional[Dict[str, ExpiryIndex]] = None
+
+# Latency of each public storage operation, reported by get_storage_stats()
+_latency = LatencyRecorder()
+
+# Per-entity write locks. Only mutations take them, and snapshots exclusively; reads stay lock-free
+_locks = EntityLocks()
+
+# Append-only journal of successful mutations, opened by open_journal()
+_journal: Optional["Journal"] = None
+_replay_state = threading.local()  # Mutations applied by replay_journal are not re-journaled
+_in_flight: set = set()  # Sequence numbers journaled but not yet applied to the tables
+_in_flight_lock = threading.Lock()
+
+# Set once initialize_storage() has run; importing this module does no I/O
+_initialized = False
+_init_lock = threading.Lock()
+
+# Keep table indexes (and the SQLite copy) in sync when a stored entity moves
+def _on_driver_location_change(driver: Driver, old_location: str, new_location: str) -> None:
+    _drivers.save(driver)
+
+def _on_truck_location_change(truck: Truck, old_location: str, new_location: str) -> None:
+    _trucks.save(truck)
+
+def _on_trailer_location_change(trailer: Trailer, old_location: str, new_location: str) -> None:
+    _trailers.save(trailer)
+
+Driver.location_listeners.append(_on_driver_location_change)
+Truck.location_listeners.append(_on_truck_location_change)
+Trailer.location_listeners.append(_on_trailer_location_change)
+
+# Renewals re-save the entity so the expiry indexes (and the SQLite copy) follow
+Driver.expiry_listeners.append(lambda driver, field: _drivers.save(driver))
+Truck.expiry_listeners.append(lambda truck, field: _trucks.save(truck))
+Trailer.expiry_listeners.append(lambda trailer, field: _trailers.save(trailer))
+
+def configure_storage(backend: str = "memory", path: Optional[str] = None, **options) -> None:
+    """
+    Select the storage backend. Existing tables are flushed and replaced.
+
+    "memory" keeps everything in process dicts, one shard per fleet. "sqlite" opens (or creates) a
+    WAL-mode SQLite file at path; options are passed to SQLiteBackend
+    (cache_size, batch_size, flush_interval).
+    """
+    global _drivers, _trucks, _trailers, _orders, _backend, _columns, _expiries, _distances, _spatial
+    close_storage()
+    _columns = None
+    _expiries = None
+    _distances = None
+    _spatial = None
+    if backend == "memory":
+        _drivers = ShardedTable('driver_id', 'current_location')
+        _trucks = ShardedTable('truck_id', 'location')
+        _trailers = ShardedTable('trailer_id', 'location')
+        _orders = OrderStore()
+    elif backend == "sqlite":
+        from sqlite_backend import SQLiteBackend
+        _backend = SQLiteBackend(path or SQLITE_PATH, **options)
+        _backend.applied_offset = _applied_journal_offset
+        _drivers = _backend.drivers
+        _trucks = _backend.trucks
+        _trailers = _backend.trailers
+        _orders = _backend.orders
+    else:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    logger.info(f"Storage backend set to {backend}")
+
+def flush_storage() -> None:
+    """Write any buffered changes to the backend."""
+    if _backend:
+        _backend.flush()
+
+def close_storage() -> None:
+    """Flush and release the current backend (no-op for in-memory storage)."""
+    global _backend
+    if _backend:
+        _backend.close()
+        _backend = None
+
+def save_snapshot(path: str) -> int:
+    """Write a binary snapshot of the whole fleet. Returns the file size in bytes."""
+    import snapshot
+    # Writers are held off while the offset is read and the tables are copied, so the two agree
+    with _locks.exclusive():
+        journal_offset = _journal.next_offset if _journal else 0
+        content = snapshot.capture_snapshot(_drivers.values(), _trucks.values(), _trailers.values(),
+                                            _orders.all(), journal_offset=journal_offset)
+    size = snapshot.write_snapshot_content(path, content)
+    logger.info(f"Saved fleet snapshot to {path} ({size} bytes)")
+    return size
+
+def load_snapshot(path: str) -> bool:
+    """Replace the current fleet with the contents of a snapshot file."""
+    return _restore_snapshot(path) is not None
+
+def _restore_snapshot(path: str) -> Optional[int]:
+    """Load a snapshot; returns the journal offset to replay from, or None if it could not be read."""
+    import snapshot
     try:
-        create_sample_data()
-        logger.info("Storage initialized successfully")
-    except Exception as e:
-        logger.error(f"Error initializing storage: {e}")
+        content = snapshot.read_snapshot(path)
+    except (OSError, snapshot.SnapshotError) as e:
+        logger.error(f"Error loading snapshot {path}: {e}")
+        return None
+
+    for table in (_drivers, _trucks, _trailers, _orders):
+        table.clear()
+    for driver in content['drivers']:
+        _drivers[driver.driver_id] = driver
+    for trailer in content['trailers']:
+        _trailers[trailer.trailer_id] = trailer
+    for truck in content['trucks']:
+        # Restore object links dropped by the snapshot
+        if truck.driver_id:
+            truck.assigned_driver = _drivers.get(truck.driver_id)
+        if truck.attached_trailer_id:
+            truck.attached_trailer = _trailers.get(truck.attached_trailer_id)
+        _trucks[truck.truck_id] = truck
+    _orders.extend(content['orders'])
+    flush_storage()
+    logger.info(f"Loaded fleet snapshot {path} taken at {content['created_at']}")
+    return content['journal_offset']
+
+def open_journal(path: Optional[str] = None, **options) -> "Journal":
+    """
+    Start journaling successful mutations to an append-only file.
+
+    options are passed to Journal (sync_every, sync_interval).
+    """
+    global _journal
+    from journal import Journal
+    close_journal()
+    _journal = Journal(path or JOURNAL_PATH, **options)
+    logger.info(f"Journaling storage mutations to {_journal.path} from offset {_journal.next_offset}")
+    return _journal
+
+def close_journal() -> None:
+    """Sync and close the mutation journal, if one is open."""
+    global _journal
+    if _journal:
+        _journal.close()
+        _journal = None
+
+def get_journal() -> Optional["Journal"]:
+    return _journal
+
+def _record(op: str, *args: Any, notify: bool = True) -> Optional[Dict[str, Any]]:
+    """Journal a mutation unless replay is applying it. Returns the journal entry, if one was written."""
+    if _journal is not None and not getattr(_replay_state, 'active', False):
+        return _journal.append(op, list(args), notify=notify)
+    return None
+
+@contextmanager
+def _journaled(op: str, *args: Any) -> Iterator[None]:
+    """
+    Journal a mutation, then apply it in the with block.
+
+    The entry is written before the block stores anything, so observers
+    (columns, indexes) only hear about changes that are already journaled;
+    one that fails cannot leave a stored but unjournaled write behind. Until
+    the block ends the entry counts as in flight for _applied_journal_offset.
+    Journal subscribers hear about the entry only once the block completes,
+    so they read the new state; not at all if the block raises.
+    """
+    journal = _journal
+    with _in_flight_lock:
+        entry = _record(op, *args, notify=False)
+        if entry is not None:
+            _in_flight.add(entry['seq'])
+    try:
+        yield
+    finally:
+        if entry is not None:
+            with _in_flight_lock:
+                _in_flight.discard(entry['seq'])
+    if entry is not None:
+        journal.publish(entry)
+
+def _applied_journal_offset() -> Optional[int]:
+    """Offset below which every journaled mutation has been applied, or None when no journal is open."""
+    with _in_flight_lock:
+        if _journal is None:
+            return None
+        return min(_in_flight) if _in_flight else _journal.next_offset
+
+def replay_journal(path: str, offset: int = 0) -> int:
+    """
+    Re-apply journaled mutations from an offset, e.g. on top of the snapshot they follow.
+
+    Returns the number of entries applied.
+    """
+    from journal import read_journal
+    applied = 0
+    _replay_state.active = True
+    try:
+        # Entity events were already reported when the mutations first ran
+        with silenced():
+            for entry in read_journal(path, offset):
+                handler = _REPLAY_HANDLERS.get(entry['op'])
+                if handler is None:
+                    logger.warning(f"Skipping unknown journal op {entry['op']} at offset {entry['seq']}")
+                    continue
+                handler(*entry['args'])
+                applied += 1
+    finally:
+        _replay_state.active = False
+    flush_storage()
+    logger.info(f"Replayed {applied} journal entries from {path} starting at offset {offset}")
+    return applied
+
+def _fleet_columns() -> "FleetColumns":
+    """Get the columnar view, building it from the tables and subscribing it on first use."""
+    global _columns
+    if _columns is None:
+        from fleet_columns import FleetColumns  # Deferred: NumPy is only needed for vectorized queries
+        columns = FleetColumns()
+        for table, column_table in ((_drivers, columns.drivers), (_trucks, columns.trucks), (_trailers, columns.trailers)):
+            column_table.rebuild(table.values())
+            table.observers.append(column_table)
+        _columns = columns
+    return _columns
+
+def refresh_fleet_columns() -> None:
+    """Rebuild the columnar view, e.g. after entities were changed directly instead of through storage."""
+    columns = _fleet_columns()
+    columns.drivers.rebuild(_drivers.values())
+    columns.trucks.rebuild(_trucks.values())
+    columns.trailers.rebuild(_trailers.values())
+
+def _expiry_indexes() -> Dict[str, ExpiryIndex]:
+    """Get the expiry indexes, building them from the tables and subscribing them on first use."""
+    global _expiries
+    if _expiries is None:
+        indexes = {}
+        for kind, table in (('driver', _drivers), ('truck', _trucks), ('trailer', _trailers)):
+            index = ExpiryIndex(table.id_attr, EXPIRY_FIELDS[kind])
+            index.rebuild(table.values())
+            table.observers.append(index)
+            indexes[kind] = index
+        _expiries = indexes
+    return _expiries
+
+def _distance_matrix() -> "DistanceMatrix":
+    """Get the distance matrix, loading driver and truck rows and subscribing it on first use."""
+    global _distances
+    if _distances is None:
+        from distance_matrix import DistanceMatrix  # Deferred: NumPy is only needed for vectorized queries
+        matrix = DistanceMatrix()
+        for kind, table in (('driver', _drivers), ('truck', _trucks)):
+            rows = matrix.observer(kind, table.id_attr, table.location_attr)
+            for entity in table.values():
+                rows.upsert(entity)
+            table.observers.append(rows)
+        _distances = matrix
+    return _distances
+
+def _spatial_indexes() -> Dict[str, "SpatialIndex"]:
+    """Get the spatial indexes, placing every asset and subscribing them on first use."""
+    global _spatial
+    if _spatial is None:
+        from spatial import SpatialIndex  # Deferred: NumPy is only needed for vectorized queries
+        indexes = {}
+        for kind, table in (('driver', _drivers), ('truck', _trucks), ('trailer', _trailers)):
+            index = SpatialIndex(table.id_attr, table.location_attr)
+            index.rebuild(table.values())
+            table.observers.append(index)
+            indexes[kind] = index
+        _spatial = indexes
+    return _spatial
+
+# Load initial data (stub implementation)
+def initialize_storage(force: bool = False) -> bool:
+    """
+    Initialize storage: open the configured backend, restore the startup
+    snapshot if there is one, and seed sample data into an empty store.
+
+    Safe to call more than once; later calls are no-ops unless force is set.
+    Returns True if this call did the initialization.
+    """
+    global _initialized
+    with _init_lock:
+        if _initialized and not force:
+            return False
+        try:
+            if STORAGE_BACKEND != "memory" and _backend is None:
+                configure_storage(STORAGE_BACKEND, SQLITE_PATH)
+            journal_offset = 0
+            if SNAPSHOT_PATH and os.path.exists(SNAPSHOT_PATH):
+                journal_offset = _restore_snapshot(SNAPSHOT_PATH) or 0
+            if _backend is not None:
+                # The SQLite file already holds every mutation below the offset its last flush stored
+                journal_offset = max(journal_offset, _backend.journal_offset())
+            # A persistent backend may already hold the fleet from a previous run
+            if len(_drivers) == 0 and len(_trucks) == 0 and len(_trailers) == 0:
+                create_sample_data()
+            if JOURNAL_PATH:
+                replay_journal(JOURNAL_PATH, journal_offset)
+                open_journal(JOURNAL_PATH)
+                flush_storage()  # Store the replayed offset before anything new is journaled
+            _initialized = True
+            logger.info("Storage initialized successfully")
+            return True
+        except Exception as e:
+            logger.error(f"Error initializing storage: {e}")
+            return False
+
+async def initialize_storage_async(force: bool = False) -> bool:
+    """Run initialize_storage in a worker thread so the event loop stays free."""
+    import asyncio  # Deferred: asyncio is the costliest import here and only async callers need it
+    return await asyncio.to_thread(initialize_storage, force)
+
+def is_storage_initialized() -> bool:
+    return _initialized
+
+def shutdown_storage() -> None:
+    """Save the startup snapshot (when FLEET_SNAPSHOT_PATH is set) and close the journal and backend."""
+    global _initialized
+    with _init_lock:
+        if not _initialized:
+            return
+        try:
+            if SNAPSHOT_PATH:
+                save_snapshot(SNAPSHOT_PATH)
+        except Exception as e:
+            logger.error(f"Error saving snapshot on shutdown: {e}")
+        flush_storage()  # While the journal is open, so the backend stores its final offset
+        close_journal()
+        close_storage()
+        _initialized = False
 
 # Sample Data for now
 def create_sample_data():
@@ -73,233 +434,1001 @@ def create_sample_data():
         trailer.location = "Depot"
         _trailers[trailer_id] = trailer
 
+# Restrict a table to one fleet; fleet=None means every fleet. Entities
+# without a fleet are selected with fleet=""
+def _scope(table: Any, fleet: Optional[str]) -> Any:
+    return table if fleet is None else table.in_fleet(fleet)
+
+# Cursor pagination. Entities are ordered by id and orders by insertion
+# sequence, so a cursor stays valid while other rows are added or removed.
+def _page(table: Any, cursor: Optional[str], limit: int, render: Callable[[Any], Dict[str, Any]],
+          key_type: type = str) -> Dict[str, Any]:
+    check_page_size(limit)
+    rows = table.page(decode_cursor(cursor, key_type), limit)
+    return {
+        'items': [render(item) for _, item in rows],
+        'next_cursor': encode_cursor(rows[-1][0]) if len(rows) == limit else None
+    }
+
+def _iter_pages(table: Any, batch_size: int, render: Callable[[Any], Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    check_page_size(batch_size)
+    after = None
+    while True:
+        rows = table.page(after, batch_size)
+        for _, item in rows:
+            yield render(item)
+        if len(rows) < batch_size:
+            return
+        after = rows[-1][0]
+
 # Driver operations
+@_latency.timed
 def get_all_drivers() -> List[Dict[str, Any]]:
     return [driver.get_driver_status() for driver in _drivers.values()]
 
+@_latency.timed
+def get_drivers_page(cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Get one page of driver statuses ordered by driver_id.
+
+    Args:
+        cursor (str): next_cursor from the previous page, or None for the first page
+        limit (int): Page size, 1 to MAX_PAGE_SIZE
+
+    Returns:
+        dict: 'items' and 'next_cursor' (None on the last page)
+    """
+    return _page(_drivers, cursor, limit, lambda driver: driver.get_driver_status())
+
+def iter_all_drivers(batch_size: int = MAX_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield every driver status in driver_id order, fetching batch_size at a time."""
+    return _iter_pages(_drivers, batch_size, lambda driver: driver.get_driver_status())
+
+@_latency.timed
 def get_driver_by_id(driver_id: str) -> Optional[Dict[str, Any]]:
     driver = _drivers.get(driver_id)
     return driver.get_driver_status() if driver else None
 
-def get_available_drivers() -> List[Dict[str, Any]]:
-    return [driver.get_driver_status() for driver in _drivers.values() if driver.is_available]
+@_latency.timed
+def get_driver_record(driver_id: str) -> Optional[Dict[str, Any]]:
+    """The driver's persisted fields (see Driver.RECORD_FIELDS), or None if not found."""
+    driver = _drivers.get(driver_id)
+    return driver.to_record() if driver else None
+
+@_latency.timed
+def get_available_drivers(fleet: Optional[str] = None) -> List[Dict[str, Any]]:
+    return [driver.get_driver_status() for driver in _scope(_drivers, fleet).where(is_available=True)
+            if driver.is_available]
+
+@_latency.timed
+def get_available_driver_ids() -> List[str]:
+    columns = _fleet_columns()
+    return columns.drivers.ids(columns.available_drivers_mask())
+
+@_latency.timed
+def get_eligible_driver_ids() -> List[str]:
+    columns = _fleet_columns()
+    return columns.drivers.ids(columns.eligible_drivers_mask())
+
+@_latency.timed
+def get_driver_eligibility(all_reasons: bool = False) -> Dict[str, Any]:
+    """
+    Evaluate driving eligibility for the whole roster in one batch pass.
+
+    Uses the same rules as Driver.check_driving_eligibility
+    (eligibility.DRIVER_RULES) over the columnar copy of the fleet; results
+    are cached until a driver changes.
+
+    Args:
+        all_reasons (bool): Report every failed rule instead of only the first
+
+    Returns:
+        dict: eligible (driver ids), ineligible (driver id to reason codes)
+        and reason_counts (reason code to number of drivers failing it)
+    """
+    columns = _fleet_columns()
+    failures = columns.driver_eligibility(all_reasons)
+    return {
+        'eligible': columns.drivers.ids(columns.eligible_drivers_mask()),
+        'ineligible': columns.ineligible_drivers(all_reasons),
+        'reason_counts': dict(zip(REASON_CODES, failures.sum(axis=0).tolist()))
+    }
+
+@_latency.timed
+def get_driver_distances(destination: str, limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get every located driver's great-circle distance to a place, nearest first.
+
+    Args:
+        destination (str): Place to measure to, e.g. "Dallas, TX" or "CALERA,AL/"
+        limit (int): Return at most this many drivers
+
+    Returns:
+        list: driver_id, current_location and distance_miles per driver whose
+        location is in the gazetteer, or None if the destination is not
+    """
+    point = geocode(destination)
+    if point is None:
+        return None
+    columns = _fleet_columns()
+    return [{
+        'driver_id': driver_id,
+        'current_location': _drivers[driver_id].current_location,
+        'distance_miles': round(miles, 1)
+    } for driver_id, miles in columns.by_distance(columns.drivers, point, limit)]
+
+@_latency.timed
+def get_in_range(destination: str, max_miles: Optional[float] = None,
+                 max_hours: Optional[float] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Compute the in-range flag of every driver and trailer for a destination in one pass.
+
+    Agrees with Driver.check_in_range_to and
+    Trailer.check_in_range_to_first_step without calling either per object:
+    an asset whose place is blank or not in the gazetteer is never in range.
 
-def get_drivers_by_location(location: str) -> List[Dict[str, Any]]:
-    return [driver.get_driver_status() for driver in _drivers.values() 
-            if driver.current_location.lower() == location.lower()]
+    Args:
+        destination (str): Place to reach, e.g. "Dallas, TX" or a ZIP
+        max_miles (float): Greatest distance in range (default geo.RANGE_MILES)
+        max_hours (float): Greatest estimated drive time in range
 
+    Returns:
+        dict: drivers and trailers, each a list of id, distance_miles (None
+        where the asset's place is unknown) and in_range, or None if the
+        destination is not in the gazetteer
+    """
+    point = geocode(destination)
+    if point is None:
+        return None
+    columns = _fleet_columns()
+    result = {}
+    for name, table in (('drivers', columns.drivers), ('trailers', columns.trailers)):
+        miles, in_range = columns.in_range(table, point, max_miles, max_hours)
+        result[name] = [{
+            table.id_attr: entity_id,
+            'distance_miles': None if distance != distance else round(distance, 1),
+            'in_range': flag
+        } for entity_id, distance, flag in zip(table.ids(), miles.tolist(), in_range.tolist())]
+    return result
+
+@_latency.timed
+def get_drivers_by_location(location: str, fleet: Optional[str] = None) -> List[Dict[str, Any]]:
+    return [driver.get_driver_status() for driver in _scope(_drivers, fleet).by_location(location)]
+
+@_latency.timed
 def create_driver(driver_data: Dict[str, Any]) -> bool:
     try:
         driver_id = driver_data['driver_id']
-        if driver_id in _drivers:
-            return False
+        with _locks.hold(('driver', driver_id)):
+            if driver_id in _drivers:
+                return False
         
-        driver = Driver(
-            driver_id,
-            driver_data['first_name'],
-            driver_data['last_name'],
-            driver_data['license_number']
-        )
+            driver = Driver(
+                driver_id,
+                driver_data['first_name'],
+                driver_data['last_name'],
+                driver_data['license_number']
+            )
         
-        # Set optional fields, or maybe this should be done in the driver class? 
-        if 'email' in driver_data:
-            driver.email = driver_data['email']
-        if 'phone_number' in driver_data:
-            driver.phone_number = driver_data['phone_number']
-        if 'current_location' in driver_data:
-            driver.current_location = driver_data['current_location']
+            # Set optional fields, or maybe this should be done in the driver class? 
+            if 'email' in driver_data:
+                driver.email = driver_data['email']
+            if 'phone_number' in driver_data:
+                driver.phone_number = driver_data['phone_number']
+            if 'current_location' in driver_data:
+                driver.current_location = driver_data['current_location']
+            if 'assigned_fleet' in driver_data:
+                driver.assigned_fleet = driver_data['assigned_fleet']
         
-        _drivers[driver_id] = driver
+            with _journaled('create_driver', driver_data):
+                _drivers[driver_id] = driver
         logger.info(f"Created driver {driver_id}")
         return True
     except Exception as e:
         logger.error(f"Error creating driver: {e}")
         return False
 
+@_latency.timed
 def update_driver_availability(driver_id: str, available: bool) -> bool:
-    driver = _drivers.get(driver_id)
-    if driver:
-        driver.set_availability(available)
-        return True
-    return False
+    with _locks.hold(('driver', driver_id)):
+        driver = _drivers.get(driver_id)
+        if driver:
+            driver.set_availability(available)
+            with _journaled('update_driver_availability', driver_id, available):
+                _drivers.save(driver)
+            return True
+        return False
 
+@_latency.timed
 def assign_driver_to_truck(driver_id: str, truck_id: str) -> bool:
-    driver = _drivers.get(driver_id)
-    truck = _trucks.get(truck_id)
-    if driver and truck:
-        return truck.assign_driver(driver)
-    return False
+    with _locks.hold(('driver', driver_id), ('truck', truck_id)):
+        driver = _drivers.get(driver_id)
+        truck = _trucks.get(truck_id)
+        if driver and truck:
+            success = truck.assign_driver(driver)
+            if success:
+                with _journaled('assign_driver_to_truck', driver_id, truck_id):
+                    _drivers.save(driver)
+                    _trucks.save(truck)
+            return success
+        return False
+
+@_latency.timed
+def update_driver_fleet(driver_id: str, fleet: Optional[str]) -> bool:
+    return _update_fleet('driver', _drivers, driver_id, fleet)
 
 # Truck Operations
+@_latency.timed
 def get_all_trucks() -> List[Dict[str, Any]]:
     return [truck.get_truck_info() for truck in _trucks.values()]
 
+@_latency.timed
+def get_trucks_page(cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Get one page of truck info ordered by truck_id.
+
+    Args:
+        cursor (str): next_cursor from the previous page, or None for the first page
+        limit (int): Page size, 1 to MAX_PAGE_SIZE
+
+    Returns:
+        dict: 'items' and 'next_cursor' (None on the last page)
+    """
+    return _page(_trucks, cursor, limit, lambda truck: truck.get_truck_info())
+
+def iter_all_trucks(batch_size: int = MAX_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield every truck's info in truck_id order, fetching batch_size at a time."""
+    return _iter_pages(_trucks, batch_size, lambda truck: truck.get_truck_info())
+
+@_latency.timed
 def get_truck_by_id(truck_id: str) -> Optional[Dict[str, Any]]:
     truck = _trucks.get(truck_id)
     return truck.get_truck_info() if truck else None
 
-def get_available_trucks() -> List[Dict[str, Any]]:
-    return [truck.get_truck_info() for truck in _trucks.values() 
+@_latency.timed
+def get_truck_record(truck_id: str) -> Optional[Dict[str, Any]]:
+    """The truck's persisted fields (see Truck.RECORD_FIELDS), or None if not found."""
+    truck = _trucks.get(truck_id)
+    return truck.to_record() if truck else None
+
+@_latency.timed
+def get_available_trucks(fleet: Optional[str] = None) -> List[Dict[str, Any]]:
+    return [truck.get_truck_info() for truck in _scope(_trucks, fleet).where(is_drivable=True) 
             if truck.is_roadworthy() and not truck.driver_id]
 
-def get_trucks_by_location(location: str) -> List[Dict[str, Any]]:
-    return [truck.get_truck_info() for truck in _trucks.values() 
-            if truck.location.lower() == location.lower()]
+@_latency.timed
+def get_available_truck_ids(as_of: Optional[date] = None) -> List[str]:
+    columns = _fleet_columns()
+    return columns.trucks.ids(columns.available_trucks_mask(as_of))
+
+@_latency.timed
+def get_roadworthy_truck_ids(as_of: Optional[date] = None) -> List[str]:
+    columns = _fleet_columns()
+    return columns.trucks.ids(columns.roadworthy_trucks_mask(as_of))
 
+@_latency.timed
+def get_trucks_by_location(location: str, fleet: Optional[str] = None) -> List[Dict[str, Any]]:
+    return [truck.get_truck_info() for truck in _scope(_trucks, fleet).by_location(location)]
+
+@_latency.timed
 def create_truck(truck_data: Dict[str, Any]) -> bool:
     try:
         truck_id = truck_data['truck_id']
-        if truck_id in _trucks:
-            return False
+        with _locks.hold(('truck', truck_id)):
+            if truck_id in _trucks:
+                return False
         
-        truck = Truck(
-            truck_id,
-            truck_data['make'],
-            truck_data['model'],
-            truck_data['year']
-        )
+            truck = Truck(
+                truck_id,
+                truck_data['make'],
+                truck_data['model'],
+                truck_data['year']
+            )
         
-        # I dont know if this is the best way to do this, but it works for now
-        if 'license_plate' in truck_data:
-            truck.license_plate = truck_data['license_plate']
-        if 'max_capacity' in truck_data:
-            truck.max_capacity = truck_data['max_capacity']
-        if 'location' in truck_data:
-            truck.location = truck_data['location']
+            # I dont know if this is the best way to do this, but it works for now
+            if 'license_plate' in truck_data:
+                truck.license_plate = truck_data['license_plate']
+            if 'max_capacity' in truck_data:
+                truck.max_capacity = truck_data['max_capacity']
+            if 'location' in truck_data:
+                truck.location = truck_data['location']
+            if 'assigned_fleet' in truck_data:
+                truck.assigned_fleet = truck_data['assigned_fleet']
         
-        _trucks[truck_id] = truck
+            with _journaled('create_truck', truck_data):
+                _trucks[truck_id] = truck
         logger.info(f"Created truck {truck_id}")
         return True
     except Exception as e:
         logger.error(f"Error creating truck: {e}")
         return False
 
+@_latency.timed
 def update_truck_location(truck_id: str, location: str) -> bool:
-    truck = _trucks.get(truck_id)
-    if truck:
-        truck.update_location(location)
-        return True
-    return False
+    with _locks.hold(('truck', truck_id)):
+        truck = _trucks.get(truck_id)
+        if truck:
+            with _journaled('update_truck_location', truck_id, location):
+                truck.update_location(location)
+            return True
+        return False
 
+@_latency.timed
 def update_truck_drivable_status(truck_id: str, drivable: bool) -> bool:
-    truck = _trucks.get(truck_id)
-    if truck:
-        truck.set_drivable_status(drivable)
-        return True
-    return False
+    with _locks.hold(('truck', truck_id)):
+        truck = _trucks.get(truck_id)
+        if truck:
+            truck.set_drivable_status(drivable)
+            with _journaled('update_truck_drivable_status', truck_id, drivable):
+                _trucks.save(truck)
+            return True
+        return False
+
+@_latency.timed
+def update_truck_fleet(truck_id: str, fleet: Optional[str]) -> bool:
+    return _update_fleet('truck', _trucks, truck_id, fleet)
 
 # Trailer operations
+@_latency.timed
 def get_all_trailers() -> List[Dict[str, Any]]:
     return [trailer.get_trailer_status() for trailer in _trailers.values()]
 
+@_latency.timed
+def get_trailers_page(cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Get one page of trailer statuses ordered by trailer_id.
+
+    Args:
+        cursor (str): next_cursor from the previous page, or None for the first page
+        limit (int): Page size, 1 to MAX_PAGE_SIZE
+
+    Returns:
+        dict: 'items' and 'next_cursor' (None on the last page)
+    """
+    return _page(_trailers, cursor, limit, lambda trailer: trailer.get_trailer_status())
+
+def iter_all_trailers(batch_size: int = MAX_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield every trailer status in trailer_id order, fetching batch_size at a time."""
+    return _iter_pages(_trailers, batch_size, lambda trailer: trailer.get_trailer_status())
+
+@_latency.timed
 def get_trailer_by_id(trailer_id: str) -> Optional[Dict[str, Any]]:
     trailer = _trailers.get(trailer_id)
     return trailer.get_trailer_status() if trailer else None
 
-def get_available_trailers() -> List[Dict[str, Any]]:
-    return [trailer.get_trailer_status() for trailer in _trailers.values() 
+@_latency.timed
+def get_trailer_record(trailer_id: str) -> Optional[Dict[str, Any]]:
+    """The trailer's persisted fields (see Trailer.RECORD_FIELDS), or None if not found."""
+    trailer = _trailers.get(trailer_id)
+    return trailer.to_record() if trailer else None
+
+@_latency.timed
+def get_available_trailers(fleet: Optional[str] = None) -> List[Dict[str, Any]]:
+    return [trailer.get_trailer_status() for trailer in _scope(_trailers, fleet).where(is_working_condition=True) 
             if trailer.is_working_condition and not trailer.attached_truck_id]
 
-def get_trailers_by_location(location: str) -> List[Dict[str, Any]]:
-    return [trailer.get_trailer_status() for trailer in _trailers.values() 
-            if trailer.location.lower() == location.lower()]
+@_latency.timed
+def get_available_trailer_ids(min_free_capacity: float = 0.0) -> List[str]:
+    columns = _fleet_columns()
+    return columns.trailers.ids(columns.available_trailers_mask(min_free_capacity))
+
+@_latency.timed
+def get_trailers_by_location(location: str, fleet: Optional[str] = None) -> List[Dict[str, Any]]:
+    return [trailer.get_trailer_status() for trailer in _scope(_trailers, fleet).by_location(location)]
 
+@_latency.timed
 def create_trailer(trailer_data: Dict[str, Any]) -> bool:
     try:
         trailer_id = trailer_data['trailer_id']
-        if trailer_id in _trailers:
-            return False
+        with _locks.hold(('trailer', trailer_id)):
+            if trailer_id in _trailers:
+                return False
         
-        trailer = Trailer(
-            trailer_id,
-            trailer_data['make'],
-            trailer_data['model'],
-            trailer_data['year']
-        )
+            trailer = Trailer(
+                trailer_id,
+                trailer_data['make'],
+                trailer_data['model'],
+                trailer_data['year']
+            )
         
-        # I dont know if this is the best way to do this, but it works for now
-        if 'max_cargo_capacity' in trailer_data:
-            trailer.max_cargo_capacity = trailer_data['max_cargo_capacity']
-        if 'location' in trailer_data:
-            trailer.location = trailer_data['location']
+            # I dont know if this is the best way to do this, but it works for now
+            if 'max_cargo_capacity' in trailer_data:
+                trailer.max_cargo_capacity = trailer_data['max_cargo_capacity']
+            if 'location' in trailer_data:
+                trailer.location = trailer_data['location']
+            if 'assigned_fleet' in trailer_data:
+                trailer.assigned_fleet = trailer_data['assigned_fleet']
         
-        _trailers[trailer_id] = trailer
+            with _journaled('create_trailer', trailer_data):
+                _trailers[trailer_id] = trailer
         logger.info(f"Created trailer {trailer_id}")
         return True
     except Exception as e:
         logger.error(f"Error creating trailer: {e}")
         return False
 
+@_latency.timed
 def attach_trailer_to_truck(trailer_id: str, truck_id: str) -> bool:
-    trailer = _trailers.get(trailer_id)
-    truck = _trucks.get(truck_id)
-    if trailer and truck:
-        return truck.attach_trailer(trailer)
-    return False
+    with _locks.hold(('trailer', trailer_id), ('truck', truck_id)):
+        trailer = _trailers.get(trailer_id)
+        truck = _trucks.get(truck_id)
+        if trailer and truck:
+            success = truck.attach_trailer(trailer)
+            if success:
+                with _journaled('attach_trailer_to_truck', trailer_id, truck_id):
+                    _trailers.save(trailer)
+                    _trucks.save(truck)
+            return success
+        return False
 
+@_latency.timed
 def update_trailer_location(trailer_id: str, location: str) -> bool:
-    trailer = _trailers.get(trailer_id)
-    if trailer:
-        trailer.update_location(location)
+    with _locks.hold(('trailer', trailer_id)):
+        trailer = _trailers.get(trailer_id)
+        if trailer:
+            with _journaled('update_trailer_location', trailer_id, location):
+                trailer.update_location(location)
+            return True
+        return False
+
+@_latency.timed
+def update_trailer_fleet(trailer_id: str, fleet: Optional[str]) -> bool:
+    return _update_fleet('trailer', _trailers, trailer_id, fleet)
+
+def _update_fleet(kind: str, table: Any, entity_id: str, fleet: Optional[str]) -> bool:
+    """Move an entity to another fleet (and shard). fleet=None removes it from its fleet."""
+    with _locks.hold((kind, entity_id)):
+        entity = table.get(entity_id)
+        if entity is None:
+            return False
+        entity.assigned_fleet = fleet
+        with _journaled(f'update_{kind}_fleet', entity_id, fleet):
+            table.save(entity)
+        logger.info(f"Moved {kind} {entity_id} to fleet {fleet}")
+        return True
+
+def get_fleets() -> Dict[str, Dict[str, int]]:
+    """Entity counts per fleet shard (in-memory backend only; empty for SQLite)."""
+    if _backend:
+        return {}
+    return {'drivers': _drivers.fleets(), 'trucks': _trucks.fleets(), 'trailers': _trailers.fleets()}
+
+# Expiry tracking
+@_latency.timed
+def get_upcoming_expiries(days: int = 14, as_of: Optional[date] = None,
+                          include_expired: bool = False) -> List[Dict[str, Any]]:
+    """
+    Get licenses, medical certificates and registrations expiring within a number of days.
+
+    Args:
+        days (int): Size of the window, counted from as_of (inclusive)
+        as_of (date): First day of the window; defaults to today
+        include_expired (bool): Also return expiries before as_of
+
+    Returns:
+        list: One dict per expiry (kind, id, field, expires_on, days_left), soonest first
+    """
+    as_of = as_of or date.today()
+    end = as_of + timedelta(days=days)
+    upcoming = []
+    for kind, index in _expiry_indexes().items():
+        for day, entity_id, field in index.between(None if include_expired else as_of, end):
+            upcoming.append({
+                'kind': kind,
+                'id': entity_id,
+                'field': field,
+                'expires_on': day.isoformat(),
+                'days_left': (day - as_of).days
+            })
+    upcoming.sort(key=lambda row: (row['expires_on'], row['kind'], row['id']))
+    return upcoming
+
+@_latency.timed
+def get_registration_sweep(as_of: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Check every truck and trailer registration as of a day, in bulk.
+
+    Runs on the columnar copy of the fleet, whose expiry days were parsed
+    once when each expiry was assigned, so no date strings are re-parsed.
+
+    Args:
+        as_of (date): Day to check against; defaults to today
+
+    Returns:
+        dict: as_of (ISO date), plus for trucks and trailers the ids whose
+        registration is valid, expired, unreadable or missing (unregistered)
+    """
+    as_of = as_of or date.today()
+    columns = _fleet_columns()
+    sweep: Dict[str, Any] = {'as_of': as_of.isoformat()}
+    for kind, table in (('trucks', columns.trucks), ('trailers', columns.trailers)):
+        masks = columns.registration_status_masks(table, as_of)
+        sweep[kind] = {status: table.ids(mask) for status, mask in masks.items()}
+    return sweep
+
+@_latency.timed
+def renew_driver_license(driver_id: str, expiry_date: Any) -> bool:
+    return _renew('driver', _drivers, driver_id, 'renew_license', expiry_date)
+
+@_latency.timed
+def renew_driver_medical_certificate(driver_id: str, expiry_date: Any) -> bool:
+    return _renew('driver', _drivers, driver_id, 'renew_medical_certificate', expiry_date)
+
+@_latency.timed
+def renew_truck_registration(truck_id: str, expiry_date: Any) -> bool:
+    return _renew('truck', _trucks, truck_id, 'renew_registration', expiry_date)
+
+@_latency.timed
+def renew_trailer_registration(trailer_id: str, expiry_date: Any) -> bool:
+    return _renew('trailer', _trailers, trailer_id, 'renew_registration', expiry_date)
+
+def _renew(kind: str, table: Any, entity_id: str, method: str, expiry_date: Any) -> bool:
+    """Run an entity's renew_* method; its expiry listener re-saves the entity."""
+    with _locks.hold((kind, entity_id)):
+        entity = table.get(entity_id)
+        if entity is None:
+            return False
+        # e.g. renew_truck_registration
+        with _journaled(method.replace('renew_', f'renew_{kind}_', 1), entity_id, expiry_date):
+            getattr(entity, method)(expiry_date)
+        logger.info(f"Renewed {kind} {entity_id} ({method}) until {expiry_date}")
         return True
-    return False
+
+# Bulk operations
+# Each kind: (class, id field, required constructor fields, fields only changed through assignments)
+_BULK_KINDS: Dict[str, tuple] = {
+    'driver': (Driver, 'driver_id', ('first_name', 'last_name', 'license_number'),
+               ('assigned_truck_id', 'assigned_truck_id_string')),
+    'truck': (Truck, 'truck_id', ('make', 'model', 'year'), ('driver_id', 'attached_trailer_id')),
+    'trailer': (Trailer, 'trailer_id', ('make', 'model', 'year'), ('attached_truck_id',)),
+}
+# Fields a bulk update applies through the entity's setter, so its listeners and guards run
+_BULK_SETTERS: Dict[str, Dict[str, str]] = {
+    'driver': {'is_available': 'set_availability', 'current_location': 'update_location'},
+    'truck': {'is_drivable': 'set_drivable_status', 'location': 'update_location'},
+    'trailer': {'location': 'update_location'},
+}
+_blank_records: Dict[str, Dict[str, Any]] = {}
+
+def _bulk_table(kind: str) -> Any:
+    return {'driver': _drivers, 'truck': _trucks, 'trailer': _trailers}[kind]
+
+def _blank_record(kind: str) -> Dict[str, Any]:
+    """Defaults of a freshly constructed entity, built once so bulk rows skip the constructor."""
+    record = _blank_records.get(kind)
+    if record is None:
+        entity_cls = _BULK_KINDS[kind][0]
+        blank = entity_cls('', '', '', '') if entity_cls is Driver else entity_cls('', '', '', 0)
+        record = _blank_records[kind] = blank.to_record()
+    return record
+
+def _field_error(field: str, value: Any, default: Any) -> Optional[str]:
+    """Check a value against the type of the field's default; None-default fields take None, str or dates."""
+    if default is None:
+        ok = value is None or isinstance(value, (str, date))
+    elif isinstance(default, bool):
+        ok = isinstance(value, bool)
+    elif isinstance(default, (int, float)):
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+    elif isinstance(default, list):
+        ok = isinstance(value, list) and all(isinstance(item, str) for item in value)
+    else:
+        ok = isinstance(value, type(default))
+    return None if ok else f"{field} has invalid type {type(value).__name__}"
+
+def _validate_bulk_row(kind: str, row: Any, creating: bool) -> Optional[str]:
+    if not isinstance(row, dict):
+        return "row is not an object"
+    entity_cls, id_field, required, link_fields = _BULK_KINDS[kind]
+    if not isinstance(row.get(id_field), str) or not row[id_field]:
+        return f"{id_field} is required"
+    if creating:
+        missing = [field for field in required if row.get(field) in (None, "")]
+        if missing:
+            return f"missing required fields: {', '.join(missing)}"
+    defaults = _blank_record(kind)
+    for field, value in row.items():
+        if field == id_field:
+            continue
+        if field in link_fields:
+            return f"{field} can only be changed by assignment"
+        if field not in defaults:
+            return f"unknown field {field}"
+        error = _field_error(field, value, defaults[field])
+        if error:
+            return error
+    return None
+
+def _bulk_update_error(kind: str, entity: Any, row: Dict[str, Any]) -> Optional[str]:
+    """Check an update row against invariants that tie a field to the entity's assignment."""
+    if kind == 'driver' and row.get('is_available') is True and entity.assigned_truck_id:
+        return f"cannot be available while assigned to truck {entity.assigned_truck_id}"
+    if kind == 'trailer' and row.get('is_working_condition') is False and entity.attached_truck_id:
+        return f"cannot leave working condition while attached to truck {entity.attached_truck_id}"
+    return None
+
+def _bulk_write(kind: str, rows: List[Dict[str, Any]], creating: bool) -> Dict[str, Any]:
+    """
+    Validate a whole batch in one pass, then apply it all or not at all.
+
+    Returns a report with per-row errors; nothing is written if any row fails.
+    """
+    start = time.perf_counter()
+    entity_cls, id_field = _BULK_KINDS[kind][:2]
+    table = _bulk_table(kind)
+    errors: List[Dict[str, Any]] = []
+    seen = set()
+    with _locks.hold(*((kind, row[id_field]) for row in rows if isinstance(row, dict) and isinstance(row.get(id_field), str))):
+        for index, row in enumerate(rows):
+            error = _validate_bulk_row(kind, row, creating)
+            entity_id = row.get(id_field) if isinstance(row, dict) else None
+            if error is None and entity_id in seen:
+                error = f"duplicate {id_field} in batch"
+            elif error is None and creating and entity_id in table:
+                error = f"{kind} {entity_id} already exists"
+            elif error is None and not creating and entity_id not in table:
+                error = f"{kind} {entity_id} not found"
+            elif error is None and not creating:
+                error = _bulk_update_error(kind, table[entity_id], row)
+            if error:
+                errors.append({'row': index, id_field: entity_id, 'error': error})
+            seen.add(entity_id)
+
+        if not errors and rows:
+            with _journaled(f"{'create' if creating else 'update'}_{kind}s", rows):
+                if creating:
+                    blank = _blank_record(kind)
+                    entities = [entity_cls.from_record({**blank, **row}) for row in rows]
+                else:
+                    setters = _BULK_SETTERS[kind]
+                    entities = []
+                    for row in rows:
+                        entity = table[row[id_field]]
+                        for field, value in row.items():
+                            if field in setters:
+                                getattr(entity, setters[field])(value)
+                            elif field != id_field:
+                                setattr(entity, field, value)
+                        entities.append(entity)
+                table.save_many(entities)
+
+    elapsed = time.perf_counter() - start
+    written = 0 if errors else len(rows)
+    if errors:
+        logger.warning(f"Rejected bulk {'create' if creating else 'update'} of {len(rows)} {kind}s: {len(errors)} invalid rows")
+    else:
+        logger.info(f"Bulk {'created' if creating else 'updated'} {written} {kind}s in {elapsed:.3f}s")
+    return {
+        'requested': len(rows),
+        'created' if creating else 'updated': written,
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 6),
+        'rows_per_second': round(written / elapsed, 1) if written and elapsed > 0 else 0.0
+    }
+
+@_latency.timed
+def create_drivers(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Create a batch of drivers atomically. See _bulk_write for the report format."""
+    return _bulk_write('driver', rows, creating=True)
+
+@_latency.timed
+def update_drivers(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply field changes (keyed by driver_id) to a batch of drivers atomically."""
+    return _bulk_write('driver', rows, creating=False)
+
+@_latency.timed
+def create_trucks(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Create a batch of trucks atomically. See _bulk_write for the report format."""
+    return _bulk_write('truck', rows, creating=True)
+
+@_latency.timed
+def update_trucks(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply field changes (keyed by truck_id) to a batch of trucks atomically."""
+    return _bulk_write('truck', rows, creating=False)
+
+@_latency.timed
+def create_trailers(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Create a batch of trailers atomically. See _bulk_write for the report format."""
+    return _bulk_write('trailer', rows, creating=True)
+
+@_latency.timed
+def update_trailers(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply field changes (keyed by trailer_id) to a batch of trailers atomically."""
+    return _bulk_write('trailer', rows, creating=False)
+
+# Nearest-asset operations. An asset is available when it could take a load
+# right now, matching get_available_drivers/trucks/trailers
+_AVAILABLE: Dict[str, Callable[[Any], bool]] = {
+    'driver': lambda driver: driver.is_available,
+    'truck': lambda truck: not truck.driver_id and truck.is_roadworthy(),
+    'trailer': lambda trailer: trailer.is_working_condition and not trailer.attached_truck_id,
+}
+
+def _near(kind: str, available_only: bool) -> tuple:
+    # The kind's table, spatial index and id filter
+    if kind not in _AVAILABLE:
+        raise ValueError(f"Unknown asset kind: {kind}")
+    table = _bulk_table(kind)
+    where = None
+    if available_only:
+        available = _AVAILABLE[kind]
+        def where(entity_id: str) -> bool:
+            entity = table.get(entity_id)
+            return entity is not None and available(entity)
+    return table, _spatial_indexes()[kind], where
+
+def _near_results(table: Any, found: List[tuple]) -> List[Dict[str, Any]]:
+    return [{
+        table.id_attr: entity_id,
+        'location': getattr(table[entity_id], table.location_attr),
+        'distance_miles': round(miles, 1)
+    } for entity_id, miles in found]
+
+@_latency.timed
+def get_nearest_assets(kind: str, location: str, k: int = 5, available_only: bool = True,
+                       max_miles: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get the k drivers, trucks or trailers closest to a place.
+
+    Args:
+        kind (str): 'driver', 'truck' or 'trailer'
+        location (str): Place to search around, e.g. "Dallas, TX" or a ZIP
+        k (int): Number of assets to return
+        available_only (bool): Only return assets that are free to dispatch
+        max_miles (float): Ignore assets farther than this
+
+    Returns:
+        list: id, location and distance_miles per asset, nearest first, or
+        None if the place is not in the gazetteer
+    """
+    point = geocode(location)
+    if point is None:
+        return None
+    table, index, where = _near(kind, available_only)
+    return _near_results(table, index.nearest(point, k, where, max_miles))
+
+@_latency.timed
+def get_assets_within(kind: str, location: str, miles: float,
+                      available_only: bool = True) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get every driver, truck or trailer within a distance of a place.
+
+    Args:
+        kind (str): 'driver', 'truck' or 'trailer'
+        location (str): Place to search around, e.g. "Dallas, TX" or a ZIP
+        miles (float): Search radius in great-circle miles
+        available_only (bool): Only return assets that are free to dispatch
+
+    Returns:
+        list: id, location and distance_miles per asset, nearest first, or
+        None if the place is not in the gazetteer
+    """
+    point = geocode(location)
+    if point is None:
+        return None
+    table, index, where = _near(kind, available_only)
+    return _near_results(table, index.within(point, miles, where))
+
+# Load distance operations. Rows are drivers and trucks, columns are the
+# shipper cities of the orders in a status (open loads by default)
+def _load_matrix(status: str) -> "DistanceMatrix":
+    matrix = _distance_matrix()
+    matrix.set_columns([(str(order.get('Order #')), order.get('Shipper City')) for order in _orders.by_status(status)])
+    return matrix
+
+@_latency.timed
+def get_load_distance_matrix(status: str = "Available") -> Dict[str, Any]:
+    """
+    Get the distance and drive time from every driver and truck to the origin of every load.
+
+    Only the rows of assets that moved since the last call are recomputed.
+
+    Args:
+        status (str): Order status whose loads make up the columns
+
+    Returns:
+        dict: rows ([kind, id]), columns (order numbers), miles and
+        drive_hours (row by column, None where a place is not in the
+        gazetteer) and the matrix cache stats
+    """
+    matrix = _load_matrix(status)
+    rows, columns, miles = matrix.miles()
+    hours = drive_hours(miles)
+    return {
+        'rows': [list(key) for key in rows],
+        'columns': columns,
+        'miles': [[None if m != m else round(m, 1) for m in row] for row in miles.tolist()],
+        'drive_hours': [[None if h != h else round(h, 2) for h in row] for row in hours.tolist()],
+        'cache': matrix.stats()
+    }
+
+@_latency.timed
+def get_load_candidates(limit: int = 5, status: str = "Available") -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get the drivers closest to the origin of each load.
+
+    Args:
+        limit (int): Drivers per load
+        status (str): Order status of the loads to rank for
+
+    Returns:
+        dict: Order number to driver_id, distance_miles and drive_hours, nearest first
+
+    Raises:
+        ValueError: If the limit is negative
+    """
+    nearest = _load_matrix(status).nearest('driver', limit)
+    return {order_id: [{
+        'driver_id': driver_id,
+        'distance_miles': round(miles, 1),
+        'drive_hours': round(drive_hours(miles), 2)
+    } for driver_id, miles in drivers] for order_id, drivers in nearest.items()}
 
 # Order operations (This might change) This is also a stub
+@_latency.timed
 def get_all_orders() -> List[Dict[str, Any]]:
-    return _orders.copy()
+    return _orders.all()
+
+@_latency.timed
+def get_orders_page(cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Get one page of orders in insertion order.
+
+    Args:
+        cursor (str): next_cursor from the previous page, or None for the first page
+        limit (int): Page size, 1 to MAX_PAGE_SIZE
+
+    Returns:
+        dict: 'items' and 'next_cursor' (None on the last page)
+    """
+    return _page(_orders, cursor, limit, dict, key_type=int)
 
+def iter_all_orders(batch_size: int = MAX_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield a copy of every order in insertion order, fetching batch_size at a time."""
+    return _iter_pages(_orders, batch_size, dict)
+
+@_latency.timed
 def get_order_by_id(order_id: str) -> Optional[Dict[str, Any]]:
-    for order in _orders:
-        if order.get('Order #') == order_id:
-            return order
-    return None
+    return _orders.get(order_id)
 
+@_latency.timed
 def get_orders_by_status(status: str) -> List[Dict[str, Any]]:
-    return [order for order in _orders if order.get('Status', '').lower() == status.lower()]
+    return _orders.by_status(status)
 
+@_latency.timed
 def get_orders_by_driver(driver_id: str) -> List[Dict[str, Any]]:
-    return [order for order in _orders if order.get('Driver1 ID') == driver_id]
+    return _orders.by_driver(driver_id)
 
+@_latency.timed
 def create_order(order_data: Dict[str, Any]) -> bool:
     try:
         # Add timestamp
         order_data['created_at'] = datetime.now().isoformat()
-        _orders.append(order_data)
+        with _locks.hold(), _journaled('add_orders', [order_data]):
+            _orders.add(order_data)
         logger.info(f"Created order {order_data.get('Order #', 'Unknown')}")
         return True
     except Exception as e:
         logger.error(f"Error creating order: {e}")
         return False
 
+@_latency.timed
+def create_orders(orders: List[Dict[str, Any]]) -> int:
+    """Insert a batch of orders with a single timestamp and log line. Returns the number inserted."""
+    try:
+        created_at = datetime.now().isoformat()
+        for order_data in orders:
+            order_data['created_at'] = created_at
+        with _locks.hold(), _journaled('add_orders', orders):
+            count = _orders.extend(orders)
+        logger.info(f"Created {count} orders in batch")
+        return count
+    except Exception as e:
+        logger.error(f"Error creating orders in batch: {e}")
+        return 0
+
+@_latency.timed
 def update_order_status(order_id: str, status: str) -> bool:
-    for order in _orders:
-        if order.get('Order #') == order_id:
-            order['Status'] = status
-            order['updated_at'] = datetime.now().isoformat()
-            logger.info(f"Updated order {order_id} status to {status}")
-            return True
-    return False
+    changes = {'Status': status, 'updated_at': datetime.now().isoformat()}
+    with _locks.hold(('order', order_id)):
+        order = _orders.update(order_id, changes)
+        if order is None:
+            return False
+        _record('update_order', order_id, changes)
+    logger.info(f"Updated order {order_id} status to {status}")
+    return True
 
+@_latency.timed
 def assign_order_to_driver(order_id: str, driver_id: str) -> bool:
-    for order in _orders:
-        if order.get('Order #') == order_id:
-            order['Driver1 ID'] = driver_id
-            order['updated_at'] = datetime.now().isoformat()
-            logger.info(f"Assigned order {order_id} to driver {driver_id}")
-            return True
-    return False
+    changes = {'Driver1 ID': driver_id, 'updated_at': datetime.now().isoformat()}
+    with _locks.hold(('order', order_id)):
+        order = _orders.update(order_id, changes)
+        if order is None:
+            return False
+        _record('update_order', order_id, changes)
+    logger.info(f"Assigned order {order_id} to driver {driver_id}")
+    return True
 
 
 # Health check functions for debugging
 def check_storage_health() -> Dict[str, Any]:
     return {
         'status': 'healthy',
+        'backend': 'sqlite' if _backend else 'memory',
+        'initialized': _initialized,
         'drivers_loaded': len(_drivers),
         'trucks_loaded': len(_trucks),
         'trailers_loaded': len(_trailers),
         'orders_loaded': len(_orders),
+        'journal_offset': _journal.next_offset if _journal else None,
+        'timestamp': datetime.now().isoformat()
+    }
+
+def get_storage_stats(memory_sample: int = 256) -> Dict[str, Any]:
+    """
+    Detailed storage statistics for production monitoring.
+
+    Memory is estimated from a sample of each table rather than measured
+    exactly, so the call stays cheap on large fleets.
+
+    Args:
+        memory_sample (int): Entities measured per table
+
+    Returns:
+        dict: 'memory' per entity type, 'indexes' sizes and per-operation 'latency' (p50/p99 in microseconds)
+    """
+    tables = {'drivers': _drivers, 'trucks': _trucks, 'trailers': _trailers}
+    memory = {name: estimate_memory(table.values(), len(table), memory_sample) for name, table in tables.items()}
+    memory['orders'] = estimate_memory((order for _, order in _orders.page(None, memory_sample)), len(_orders), memory_sample)
+    indexes = {name: table.index_sizes() for name, table in tables.items()}
+    indexes['orders'] = _orders.index_sizes()
+    if _expiries is not None:
+        indexes['expiries'] = {kind: len(index) for kind, index in _expiries.items()}
+    if _distances is not None:
+        indexes['distance_matrix'] = _distances.stats()
+    if _spatial is not None:
+        indexes['spatial'] = {kind: len(index) for kind, index in _spatial.items()}
+    indexes['entity_locks'] = len(_locks)
+    return {
+        'backend': 'sqlite' if _backend else 'memory',
+        'memory': memory,
+        'indexes': indexes,
+        'latency': _latency.stats(),
         'timestamp': datetime.now().isoformat()
     }
+ 
+
+
+def _replay_add_orders(orders: List[Dict[str, Any]]) -> int:
+    """Re-add journaled orders, skipping any whose Order # is already stored."""
+    return _orders.extend([order for order in orders
+                           if order.get('Order #') is None or _orders.get(order['Order #']) is None])
 
-# Initialize storage when module is imported
-initialize_storage() 
\ No newline at end of file
+# Journal op -> function that re-applies it. Entity ops re-run the storage
+# function; order ops write the journaled data back as-is so timestamps survive
+_REPLAY_HANDLERS: Dict[str, Callable[..., Any]] = {
+    'create_driver': create_driver,
+    'update_driver_availability': update_driver_availability,
+    'assign_driver_to_truck': assign_driver_to_truck,
+    'create_truck': create_truck,
+    'update_truck_location': update_truck_location,
+    'update_truck_drivable_status': update_truck_drivable_status,
+    'create_trailer': create_trailer,
+    'attach_trailer_to_truck': attach_trailer_to_truck,
+    'update_trailer_location': update_trailer_location,
+    'update_driver_fleet': update_driver_fleet,
+    'update_truck_fleet': update_truck_fleet,
+    'update_trailer_fleet': update_trailer_fleet,
+    'renew_driver_license': renew_driver_license,
+    'renew_driver_medical_certificate': renew_driver_medical_certificate,
+    'renew_truck_registration': renew_truck_registration,
+    'renew_trailer_registration': renew_trailer_registration,
+    'create_drivers': create_drivers,
+    'update_drivers': update_drivers,
+    'create_trucks': create_trucks,
+    'update_trucks': update_trucks,
+    'create_trailers': create_trailers,
+    'update_trailers': update_trailers,
+    'add_orders': _replay_add_orders,
+    'update_order': lambda order_id, changes: _orders.update(order_id, changes),
+}
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+import numpy as np
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import geo
+from distance_matrix import DistanceMatrix
+
+
+def create_matrix(rows, columns, pair_cache_size=1024):
+    """Helper function to build a matrix from (kind, id, place) rows and (id, place) columns."""
+    matrix = DistanceMatrix(pair_cache_size)
+    for kind, asset_id, place in rows:
+        matrix.set_row((kind, asset_id), place)
+    matrix.set_columns(columns)
+    return matrix
+
+
+# ============================================================================
+# MATRIX TESTS
+# ============================================================================
+
+def test_matrix_matches_pairwise_distances():
+    """Test every cell is the great-circle distance between the row and column places."""
+    # Setup
+    rows = [('driver', 'D1', 'Dallas, TX'), ('truck', 'T1', 'Chicago, IL'), ('driver', 'D2', 'Home Base')]
+    columns = [('O1', 'CALERA,AL/'), ('O2', 'HOUSTON,TX/')]
+    matrix = create_matrix(rows, columns)
+
+    # Exercise
+    row_keys, column_ids, miles = matrix.miles()
+
+    # Verify
+    assert row_keys == [('driver', 'D1'), ('truck', 'T1'), ('driver', 'D2')]
+    assert column_ids == ['O1', 'O2']
+    assert np.allclose(miles[:2], [[geo.distance_miles(r[2], c[1]) for c in columns] for r in rows[:2]])
+    assert np.isnan(miles[2]).all()
+    assert matrix.location_id("DALLAS,TX/") == matrix.location_id("Dallas, TX")
+
+
+def test_only_moved_rows_are_recomputed():
+    """Test unchanged locations are skipped and a move recomputes just that row from the pair cache."""
+    # Setup
+    matrix = create_matrix([('driver', f'D{i}', 'Dallas, TX') for i in range(50)],
+                           [('O1', 'Houston, TX'), ('O2', 'Tulsa, OK')])
+    matrix.miles()
+    misses = matrix.stats()['pair_misses']
+
+    # Exercise
+    matrix.set_row(('driver', 'D3'), 'Dallas, TX')  # Same place, nothing to do
+    unchanged_dirty = len(matrix._dirty)
+    matrix.set_row(('driver', 'D7'), 'Tulsa, OK')
+    matrix.set_row(('driver', 'D8'), 'Dallas, TX')
+    _, _, miles = matrix.miles()
+
+    # Verify
+    assert unchanged_dirty == 0
+    assert matrix.stats()['pair_misses'] == misses + 2  # Only the new Tulsa pairs
+    assert miles[7, 1] == 0.0
+    assert miles[8, 0] == miles[0, 0]
+
+
+def test_pair_cache_evicts_least_recently_used_and_rows_can_be_removed():
+    """Test the LRU stays within its size and removing a row keeps the others' values."""
+    # Setup
+    matrix = create_matrix([('driver', 'D1', 'Dallas, TX'), ('driver', 'D2', 'Denver, CO'),
+                            ('driver', 'D3', 'Boise, ID')], [('O1', 'Houston, TX')], pair_cache_size=2)
+
+    # Exercise
+    _, _, before = matrix.miles()
+    matrix.remove_row(('driver', 'D1'))
+    row_keys, _, after = matrix.miles()
+    nearest = matrix.nearest('driver', 1)
+
+    # Verify
+    assert matrix.stats()['cached_pairs'] == 2
+    assert row_keys == [('driver', 'D3'), ('driver', 'D2')]
+    assert after[:, 0].tolist() == [before[2, 0], before[1, 0]]
+    assert nearest == {'O1': [('D2', before[1, 0])]}
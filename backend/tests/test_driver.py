@@ -822,8 +822,7 @@ def test_calculate_distance_to_with_location():
     distance = driver.calculate_distance_to(destination)
     
     # Verify
-    assert isinstance(distance, float)
-    assert distance == 50.0  # Placeholder implementation returns 50.0
+    assert distance is None  # Neither place is in the gazetteer
     
     # Teardown
     driver = None
@@ -857,8 +856,57 @@ def test_calculate_distance_to_empty_destination():
     distance = driver.calculate_distance_to(destination)
     
     # Verify
-    assert isinstance(distance, float)
-    assert distance == 50.0  # Placeholder implementation
+    assert distance is None
+    
+    # Teardown
+    driver = None
+
+
+def test_check_in_range_to_measured_destination():
+    """Test range check against a place in the gazetteer."""
+    # Setup
+    driver = Driver("D001", "John", "Doe", "DL123456789")
+    driver.current_location = "Dallas, TX"
+    
+    # Exercise
+    near = driver.check_in_range_to("Fort Worth, TX")
+    far = driver.check_in_range_to("Miami, FL")
+    
+    # Verify
+    assert near == True
+    assert far == False
+    
+    # Teardown
+    driver = None
+
+
+def test_check_in_range_to_unknown_place():
+    """Test a place that is not in the gazetteer is never in range."""
+    # Setup
+    driver = Driver("D001", "John", "Doe", "DL123456789")
+    driver.current_location = "Home Base"
+    
+    # Exercise
+    result = driver.check_in_range_to("Miami, FL")
+    
+    # Verify
+    assert result == False
+    
+    # Teardown
+    driver = None
+
+
+def test_check_in_range_to_no_location():
+    """Test a driver with no location is never in range."""
+    # Setup
+    driver = Driver("D001", "John", "Doe", "DL123456789")
+    driver.current_location = ""
+    
+    # Exercise
+    result = driver.check_in_range_to("Miami, FL")
+    
+    # Verify
+    assert result == False
     
     # Teardown
     driver = None
@@ -916,6 +964,28 @@ def test_get_driver_status_assigned():
     driver = None
 
 
+def test_get_driver_status_cached_until_changed():
+    """Test the status dict is reused between polls and rebuilt after a change."""
+    # Setup
+    driver = Driver("D001", "John", "Doe", "DL123456789")
+    first = driver.get_driver_status()
+    
+    # Exercise
+    with patch.object(Driver, 'check_driving_eligibility') as eligibility:
+        repeat = driver.get_driver_status()
+        eligibility.assert_not_called()
+    driver.update_location("Dallas, TX")
+    changed = driver.get_driver_status()
+    
+    # Verify
+    assert repeat == first
+    assert repeat is not first  # Callers get their own copy
+    assert changed['current_location'] == "Dallas, TX"
+    
+    # Teardown
+    driver = None
+
+
 # ============================================================================
 # DRIVER COMPLIANCE REPORT TESTS
 # ============================================================================
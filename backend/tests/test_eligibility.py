@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import eligibility
+from driver import Driver
+from fleet_columns import FleetColumns
+from eligibility import failed_rules, MEDICAL_CERT_NOT_CURRENT, DRUG_TEST_NOT_CURRENT, NOT_AVAILABLE
+
+
+def create_eligible_driver(driver_id):
+    """Helper function to create a driver that passes every eligibility rule."""
+    driver = Driver(driver_id, "John", "Doe", "DL123")
+    driver.license_expiry = "2030-01-01"
+    driver.medical_cert_current = True
+    driver.drug_test_current = True
+    driver.background_check_valid = True
+    return driver
+
+
+# ============================================================================
+# SINGLE DRIVER TESTS
+# ============================================================================
+
+def test_failed_rules_stop_at_first_failure_unless_all_reasons():
+    """Test rules short-circuit by default and report every failure on request."""
+    # Setup
+    driver = create_eligible_driver("D1")
+    driver.medical_cert_current = False
+    driver.drug_test_current = False
+
+    # Exercise
+    first = failed_rules(driver)
+    every = failed_rules(driver, all_reasons=True)
+
+    # Verify
+    assert first == [MEDICAL_CERT_NOT_CURRENT]
+    assert every == [MEDICAL_CERT_NOT_CURRENT, DRUG_TEST_NOT_CURRENT]
+    assert failed_rules(create_eligible_driver("D2")) == []
+
+
+def test_driver_eligibility_cached_until_driver_changes():
+    """Test repeated eligibility checks reuse the result until an attribute changes."""
+    # Setup
+    driver = create_eligible_driver("D1")
+    assert driver.check_driving_eligibility() is True
+
+    # Exercise
+    with patch('driver.failed_rules') as rules:
+        repeat = driver.check_driving_eligibility()
+        rules.assert_not_called()
+    driver.set_availability(False)
+    changed = driver.eligibility_failures()
+
+    # Verify
+    assert repeat is True
+    assert changed == [NOT_AVAILABLE]
+    assert driver.get_compliance_report()['eligibility_reasons'] == [NOT_AVAILABLE]
+
+
+# ============================================================================
+# BATCH TESTS
+# ============================================================================
+
+def test_batch_eligibility_matches_per_driver_rules_and_is_cached():
+    """Test the roster pass agrees with each driver's own check and is reused until a row changes."""
+    # Setup
+    columns = FleetColumns()
+    drivers = [create_eligible_driver(f"D{i}") for i in range(6)]
+    drivers[1].medical_cert_current = False
+    drivers[2].license_expiry = None
+    drivers[3].background_check_valid = False
+    drivers[3].is_available = False
+    for driver in drivers:
+        columns.drivers.upsert(driver)
+
+    expected_first = {d.driver_id: d.eligibility_failures() for d in drivers if d.eligibility_failures()}
+    expected_every = {d.driver_id: d.eligibility_failures(True) for d in drivers if d.eligibility_failures(True)}
+
+    # Exercise
+    first = columns.ineligible_drivers()
+    every = columns.ineligible_drivers(all_reasons=True)
+    cached = columns.driver_eligibility() is columns.driver_eligibility()
+    drivers[0].drug_test_current = False
+    columns.drivers.upsert(drivers[0])
+    after_change = columns.ineligible_drivers()
+
+    # Verify
+    assert first == expected_first
+    assert every == expected_every
+    assert every['D3'] == [eligibility.BACKGROUND_CHECK_INVALID, NOT_AVAILABLE]
+    assert cached is True
+    assert after_change['D0'] == [DRUG_TEST_NOT_CURRENT]
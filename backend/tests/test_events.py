@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import events
+from truck import Truck
+
+
+# ============================================================================
+# EVENT SINK TESTS
+# ============================================================================
+
+def test_custom_sink_receives_unformatted_events():
+    """Test state transitions reach the installed sink as templates plus args."""
+    # Setup
+    truck = Truck("T001", "Volvo", "VNL", 2023)
+    received = []
+    previous = events.set_event_sink(lambda *event: received.append(event))
+
+    # Exercise
+    try:
+        truck.update_location("Reno, NV")
+    finally:
+        events.set_event_sink(previous)
+
+    # Verify
+    level, message, args, console = received[-1]
+    assert message % args == "Truck T001 location updated from '' to 'Reno, NV'"
+    assert console is True
+
+
+def test_disabled_events_never_format_arguments():
+    """Test nothing is formatted or printed when events are off or silenced."""
+    # Setup
+    truck = Truck("T001", "Volvo", "VNL", 2023)
+    location = Mock()
+    location.__str__ = Mock(return_value="Reno, NV")
+    sink = Mock()
+
+    # Exercise
+    previous = events.set_event_sink(None)
+    try:
+        truck.update_location(location)
+    finally:
+        events.set_event_sink(previous)
+    events.set_event_sink(sink)
+    try:
+        with events.silenced():
+            truck.add_mileage(10)
+    finally:
+        events.set_event_sink(previous)
+
+    # Verify
+    location.__str__.assert_not_called()
+    sink.assert_not_called()
+    assert truck.mileage == 10
+
+
+def test_console_sink_prints_and_logs(capsys):
+    """Test the default sink keeps printing transitions and logging them."""
+    # Setup
+    with patch('events.logger') as logger:
+
+        # Exercise
+        events.console_sink(20, "Truck %s is now %s", ("T001", "drivable"), True)
+        events.console_sink(20, "Truck %s initialized", ("T002",), False)
+
+    # Verify
+    assert capsys.readouterr().out == "Truck T001 is now drivable\n"
+    assert logger.log.call_count == 2
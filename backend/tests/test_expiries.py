@@ -0,0 +1,106 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+from truck import Truck
+from trailer import Trailer
+from driver import Driver
+from expiries import ExpiryIndex, parse_expiry
+
+
+def create_truck(truck_id, registration_expiry=None):
+    """Helper function to create a truck with a registration expiry."""
+    truck = Truck(truck_id, "Volvo", "VNL", 2023)
+    truck.registration_expiry = registration_expiry
+    return truck
+
+
+# ============================================================================
+# PARSING TESTS
+# ============================================================================
+
+def test_parse_expiry_accepts_registration_formats():
+    """Test the formats Truck.check_registration accepts parse to the same day."""
+    # Verify
+    assert parse_expiry("2026-03-01") == date(2026, 3, 1)
+    assert parse_expiry("03/01/2026") == date(2026, 3, 1)
+    assert parse_expiry(datetime(2026, 3, 1, 17, 30)) == date(2026, 3, 1)
+    assert parse_expiry(date(2026, 3, 1)) == date(2026, 3, 1)
+    assert parse_expiry("next spring") is None
+    assert parse_expiry(None) is None
+
+
+
+def test_expiry_fields_are_parsed_once_at_assignment():
+    """Test expiries keep the assigned value, expose the parsed date, and are not re-parsed on checks."""
+    # Setup
+    truck = create_truck("T1", "12/31/2099")
+    truck.has_registration = True
+    trailer = Trailer("TR1", "Utility", "3000R", 2022)
+    trailer.registration_expiry = datetime(2026, 3, 1, 8, 0)
+    driver = Driver("D1", "Ana", "Lopez", "DL-1")
+    driver.renew_license("2027-05-01")
+
+    # Exercise
+    with patch('truck.datetime') as mock_datetime:
+        valid = truck.check_registration()
+
+    # Verify
+    assert valid is True
+    mock_datetime.strptime.assert_not_called()
+    assert truck.registration_expiry == "12/31/2099"
+    assert truck.registration_expiry_date == date(2099, 12, 31)
+    assert trailer.registration_expiry_date == date(2026, 3, 1)
+    assert driver.license_expiry == "2027-05-01"
+    assert driver.license_expiry_date == date(2027, 5, 1)
+    assert driver.medical_cert_expiry_date is None
+    assert Truck.from_record(truck.to_record()).registration_expiry_date == date(2099, 12, 31)
+
+# ============================================================================
+# RANGE QUERY TESTS
+# ============================================================================
+
+def test_between_returns_expiries_in_range_soonest_first():
+    """Test range queries are inclusive on both ends and ordered by day."""
+    # Setup
+    index = ExpiryIndex('truck_id', ['registration_expiry'])
+    index.rebuild([
+        create_truck('T1', "2026-03-20"),
+        create_truck('T2', date(2026, 3, 1)),
+        create_truck('T3', "03/14/2026"),
+        create_truck('T4', None),
+        create_truck('T5', "2026-02-28"),
+    ])
+
+    # Exercise
+    result = index.between(date(2026, 3, 1), date(2026, 3, 14))
+
+    # Verify
+    assert [entity_id for _, entity_id, _ in result] == ['T2', 'T3']
+    assert [entity_id for _, entity_id, _ in index.between(None, date(2026, 3, 1))] == ['T5', 'T2']
+    assert len(index) == 4
+
+
+def test_upsert_and_remove_keep_index_current():
+    """Test re-saving an entity moves its entry and removing it drops the entry."""
+    # Setup
+    index = ExpiryIndex('truck_id', ['registration_expiry'])
+    truck = create_truck('T1', "2026-03-05")
+    index.upsert(truck)
+
+    # Exercise
+    truck.registration_expiry = "2027-03-05"
+    index.upsert(truck)
+    moved = index.between(date(2026, 1, 1), date(2027, 12, 31))
+    index.remove('T1')
+
+    # Verify
+    assert moved == [(date(2027, 3, 5), 'T1', 'registration_expiry')]
+    assert index.expiry_of('T1', 'registration_expiry') is None
+    assert len(index) == 0
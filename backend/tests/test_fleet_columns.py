@@ -0,0 +1,147 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+from driver import Driver
+from truck import Truck
+from trailer import Trailer
+from fleet_columns import FleetColumns
+
+
+def create_eligible_driver(driver_id):
+    """Helper function to create a driver that passes every eligibility check."""
+    driver = Driver(driver_id, "John", "Doe", "DL123")
+    driver.license_expiry = "2030-01-01"
+    driver.medical_cert_current = True
+    driver.drug_test_current = True
+    driver.background_check_valid = True
+    return driver
+
+
+# ============================================================================
+# COLUMN MAINTENANCE TESTS
+# ============================================================================
+
+def test_upsert_updates_existing_row():
+    """Test upserting the same entity twice rewrites its row instead of adding one."""
+    # Setup
+    columns = FleetColumns()
+    driver = create_eligible_driver("D1")
+    columns.drivers.upsert(driver)
+
+    # Exercise
+    driver.is_available = False
+    columns.drivers.upsert(driver)
+
+    # Verify
+    assert len(columns.drivers) == 1
+    assert columns.drivers.ids(columns.available_drivers_mask()) == []
+
+
+def test_remove_moves_last_row_into_hole():
+    """Test removing a row keeps the remaining rows addressable."""
+    # Setup
+    columns = FleetColumns()
+    for trailer_id in ("TR1", "TR2", "TR3"):
+        columns.trailers.upsert(Trailer(trailer_id, "Wabash", "Reefer", 2022))
+
+    # Exercise
+    columns.trailers.remove("TR1")
+
+    # Verify
+    assert sorted(columns.trailers.ids(columns.available_trailers_mask())) == ["TR2", "TR3"]
+    assert "TR1" not in columns.trailers
+
+
+def test_columns_grow_past_initial_capacity():
+    """Test tables grow beyond their initial capacity."""
+    # Setup
+    columns = FleetColumns()
+
+    # Exercise
+    for i in range(3000):
+        columns.drivers.upsert(create_eligible_driver(f"D{i}"))
+
+    # Verify
+    assert len(columns.drivers) == 3000
+    assert len(columns.drivers.ids(columns.eligible_drivers_mask())) == 3000
+
+
+# ============================================================================
+# MASK RULE TESTS
+# ============================================================================
+
+def test_eligible_drivers_mask_matches_driver_rule():
+    """Test the eligibility mask agrees with Driver.check_driving_eligibility."""
+    # Setup
+    columns = FleetColumns()
+    eligible = create_eligible_driver("D1")
+    no_medical = create_eligible_driver("D2")
+    no_medical.medical_cert_current = False
+    no_license = create_eligible_driver("D3")
+    no_license.license_expiry = None
+    for driver in (eligible, no_medical, no_license):
+        columns.drivers.upsert(driver)
+
+    # Exercise
+    result = columns.drivers.ids(columns.eligible_drivers_mask())
+
+    # Verify
+    assert result == ["D1"]
+    assert [d.driver_id for d in (eligible, no_medical, no_license) if d.check_driving_eligibility()] == result
+
+
+def test_available_trucks_mask_matches_truck_rule():
+    """Test the availability mask agrees with is_roadworthy and driver assignment."""
+    # Setup
+    columns = FleetColumns()
+    as_of = date(2024, 6, 1)
+    trucks = []
+    for truck_id, registered, expiry, driver_id in (
+        ("T1", True, None, ""),
+        ("T2", True, "2024-12-31", ""),
+        ("T3", True, "01/01/2024", ""),
+        ("T4", True, "invalid-date", ""),
+        ("T5", False, None, ""),
+        ("T6", True, date(2025, 1, 1), "D1"),
+    ):
+        truck = Truck(truck_id, "Volvo", "VNL", 2022)
+        truck.has_registration = registered
+        truck.registration_expiry = expiry
+        truck.driver_id = driver_id
+        columns.trucks.upsert(truck)
+        trucks.append(truck)
+
+    # Exercise
+    result = columns.trucks.ids(columns.available_trucks_mask(as_of))
+
+    # Verify
+    assert result == ["T1", "T2"]
+
+
+def test_available_trailers_mask_with_free_capacity():
+    """Test trailers are filtered on working condition, attachment and free capacity."""
+    # Setup
+    columns = FleetColumns()
+    roomy = Trailer("TR1", "Great Dane", "Dry Van", 2021)
+    roomy.max_cargo_capacity = 48000.0
+    full = Trailer("TR2", "Great Dane", "Dry Van", 2021)
+    full.max_cargo_capacity = 48000.0
+    full.current_cargo_weight = 40000.0
+    attached = Trailer("TR3", "Great Dane", "Dry Van", 2021)
+    attached.max_cargo_capacity = 48000.0
+    attached.attached_truck_id = "T1"
+    for trailer in (roomy, full, attached):
+        columns.trailers.upsert(trailer)
+
+    # Exercise
+    result = columns.trailers.ids(columns.available_trailers_mask(min_free_capacity=10000.0))
+
+    # Verify
+    assert result == ["TR1"]
@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+import numpy as np
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import geo
+from driver import Driver
+from trailer import Trailer
+
+
+# ============================================================================
+# GEOCODING TESTS
+# ============================================================================
+
+def test_geocode_accepts_order_export_and_zip_formats():
+    """Test city/state spellings from the UI and the order exports, and ZIP codes, resolve to one place."""
+    # Setup
+    dallas = geo.geocode("Dallas, TX")
+
+    # Verify
+    assert dallas is not None
+    assert geo.geocode("DALLAS,TX/") == dallas
+    assert geo.geocode("dallas tx 75201") == dallas
+    assert geo.geocode("75201-0001") == dallas
+    assert geo.geocode("75299") == dallas  # Unknown ZIP falls back to its 3-digit prefix
+    assert geo.geocode("SAINT LOUIS,MO/") == geo.geocode("St. Louis, MO")
+    assert geo.geocode("CALERA,AL/") is not None
+    assert geo.geocode("Customer Site A") is None
+    assert geo.parse_place("COLUMBUS,MS/") == ("COLUMBUS", "MS", None)
+
+
+# ============================================================================
+# DISTANCE TESTS
+# ============================================================================
+
+def test_distances_are_great_circle_miles_and_vectorized_matches_scalar():
+    """Test known city pairs and that the array version agrees with the single-pair one."""
+    # Setup
+    origin = geo.geocode("New York, NY")
+    places = ["Los Angeles, CA", "Chicago, IL", "Nowhere, ZZ"]
+
+    # Exercise
+    points = geo.coordinates(places)
+    many = geo.haversine_miles_many(origin, points[:, 0], points[:, 1])
+
+    # Verify
+    assert abs(geo.distance_miles("New York, NY", "Los Angeles, CA") - 2445) < 10
+    assert abs(geo.distance_miles("CALERA,AL/", "COLUMBUS,MS/") - 100) < 5
+    assert np.allclose(many[:2], [geo.haversine_miles(origin, geo.geocode(p)) for p in places[:2]])
+    assert np.isnan(many[2])
+    assert geo.distance_miles("Dallas, TX", "Customer Site A") is None
+
+
+def test_unmeasured_distances_are_never_in_range():
+    """Test None and NaN distances fail every range check, with or without explicit limits."""
+    # Exercise
+    scalar = [geo.within_range(None), geo.within_range(float('nan')), geo.within_range(None, max_hours=100)]
+    mask = geo.within_range(np.array([10.0, np.nan, 900.0]), max_miles=250)
+
+    # Verify
+    assert scalar == [False, False, False]
+    assert mask.tolist() == [True, False, False]
+
+
+def test_entities_use_gazetteer_and_report_none_for_unknown_places():
+    """Test driver and trailer distances come from the gazetteer and are None for unknown places."""
+    # Setup
+    driver = Driver("D001", "John", "Doe", "DL123456789")
+    driver.current_location = "Dallas, TX"
+    trailer = Trailer("TR001", "Great Dane", "Dry Van", 2023)
+    trailer.location = "Houston, TX"
+
+    # Exercise
+    to_houston = driver.calculate_distance_to("Houston, TX")
+    to_dallas = trailer.calculate_distance_to("DALLAS,TX/")
+
+    # Verify
+    assert 220 < to_houston < 230
+    assert to_dallas == to_houston
+    assert driver.calculate_distance_to("Customer Site A") is None
+    assert trailer.calculate_distance_to("Customer Site B") is None
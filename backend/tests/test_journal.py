@@ -0,0 +1,182 @@
+import unittest
+import sys
+import os
+import time
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import storage
+from journal import Journal, read_journal
+
+
+# ============================================================================
+# JOURNAL FILE TESTS
+# ============================================================================
+
+def test_journal_read_from_offset(tmp_path):
+    """Test subscribers can tail the journal from an offset without earlier entries."""
+    # Setup
+    journal = Journal(str(tmp_path / "fleet.journal"), sync_every=2)
+    seen = []
+    journal.subscribers.append(seen.append)
+    for n in range(5):
+        journal.append('update_truck_location', [f'T{n}', 'Reno, NV'])
+
+    # Exercise
+    entries = journal.read(offset=3)
+
+    # Verify
+    assert [e['seq'] for e in entries] == [3, 4]
+    assert entries[0]['args'] == ['T3', 'Reno, NV']
+    assert [e['seq'] for e in seen] == [0, 1, 2, 3, 4]
+    assert journal.read(offset=5) == []
+
+    # Teardown
+    journal.close()
+
+
+def test_journal_syncs_idle_entries_on_timer(tmp_path):
+    """Test entries short of a sync group reach the file without another append."""
+    # Setup
+    path = str(tmp_path / "fleet.journal")
+    journal = Journal(path, sync_every=64, sync_interval=0.05)
+    try:
+        for n in range(3):
+            journal.append('update_truck_location', [f'T{n}', 'Reno, NV'])
+
+        # Exercise
+        time.sleep(0.3)
+
+        # Verify
+        assert [e['seq'] for e in read_journal(path)] == [0, 1, 2]
+    finally:
+        journal.close()
+
+
+def test_journal_drops_torn_tail_on_reopen(tmp_path):
+    """Test a half-written last entry is ignored and cut off when the journal is reopened."""
+    # Setup
+    path = str(tmp_path / "fleet.journal")
+    journal = Journal(path)
+    journal.append('add_orders', [[{'Order #': 'J-O1', 'Start Dt/Tm': datetime(2025, 5, 26, 11, 1)}]])
+    journal.close()
+    with open(path, 'ab') as f:
+        f.write(b'{"seq": 1, "op": "upd')
+
+    # Exercise
+    reopened = Journal(path)
+    entry = reopened.append('update_order', ['J-O1', {'Status': 'Delivered'}])
+    reopened.close()
+
+    # Verify
+    assert entry['seq'] == 1
+    entries = list(read_journal(path))
+    assert [e['seq'] for e in entries] == [0, 1]
+    assert entries[0]['args'][0][0]['Start Dt/Tm'] == datetime(2025, 5, 26, 11, 1)
+
+
+# ============================================================================
+# STORAGE REPLAY TESTS
+# ============================================================================
+
+def test_replay_journal_rebuilds_storage(tmp_path):
+    """Test replaying the journal after losing in-memory state restores every mutation."""
+    # Setup
+    path = str(tmp_path / "fleet.journal")
+    storage.open_journal(path)
+    try:
+        storage.create_truck({'truck_id': 'J-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023})
+        storage.create_trailer({'trailer_id': 'J-TR1', 'make': 'Wabash', 'model': 'Reefer', 'year': 2022})
+        storage.attach_trailer_to_truck('J-TR1', 'J-T1')
+        storage.update_truck_location('J-T1', 'Reno, NV')
+        storage.create_order({'Order #': 'J-O1', 'Status': 'Available'})
+        created_at = storage.get_order_by_id('J-O1')['created_at']
+        storage.update_order_status('J-O1', 'Dispatched')
+        storage.update_truck_location('MISSING', 'Reno, NV')  # Failed mutations are not journaled
+    finally:
+        storage.close_journal()
+    storage.configure_storage("memory")
+
+    # Exercise
+    applied = storage.replay_journal(path)
+
+    # Verify
+    assert applied == 6
+    truck = storage._trucks['J-T1']
+    assert truck.location == 'Reno, NV'
+    assert truck.attached_trailer is storage._trailers['J-TR1']
+    order = storage.get_order_by_id('J-O1')
+    assert order['Status'] == 'Dispatched'
+    assert order['created_at'] == created_at
+    assert storage.get_journal() is None
+
+
+def test_replay_skips_orders_already_stored(tmp_path):
+    """Test replaying an order batch does not add a second copy of orders that are already there."""
+    # Setup
+    path = str(tmp_path / "fleet.journal")
+    storage.open_journal(path)
+    try:
+        storage.create_orders([{'Order #': 'J-O2', 'Status': 'Available'},
+                               {'Order #': 'J-O3', 'Status': 'Available'}])
+    finally:
+        storage.close_journal()
+
+    # Exercise
+    storage.replay_journal(path)
+
+    # Verify
+    assert [o['Order #'] for o in storage.get_orders_by_status('available') if o['Order #'] in ('J-O2', 'J-O3')] \
+        == ['J-O2', 'J-O3']
+
+
+def test_sqlite_restart_resumes_journal_after_stored_offset(tmp_path):
+    """Test restarting on SQLite with a journal replays only entries the file does not hold."""
+    # Setup
+    settings = {'STORAGE_BACKEND': 'sqlite', 'SQLITE_PATH': str(tmp_path / "fleet.db"),
+                'JOURNAL_PATH': str(tmp_path / "fleet.journal"), 'SNAPSHOT_PATH': None}
+    with patch.multiple(storage, **settings):
+        try:
+            storage.initialize_storage(force=True)
+            storage.create_order({'Order #': 'J-O4', 'Status': 'Available'})
+            storage.update_truck_location('T001', 'Reno, NV')
+            storage.shutdown_storage()
+
+            # Exercise
+            with patch.object(storage, 'replay_journal', wraps=storage.replay_journal) as replay:
+                storage.initialize_storage(force=True)
+
+            # Verify
+            replay.assert_called_once_with(settings['JOURNAL_PATH'], 2)
+            assert storage._backend.journal_offset() == storage.get_journal().next_offset == 2
+            assert [o['Order #'] for o in storage._orders.all()] == ['J-O4']
+            assert storage._trucks['T001'].location == 'Reno, NV'
+        finally:
+            storage.shutdown_storage()
+            storage.configure_storage("memory")
+
+
+def test_subscribers_hear_of_mutations_after_they_apply(tmp_path):
+    """Test journal subscribers see the new state, and hear nothing of a mutation that fails."""
+    # Setup
+    storage.create_truck({'truck_id': 'J-T2', 'make': 'Volvo', 'model': 'VNL', 'year': 2023, 'location': 'Reno, NV'})
+    journal = storage.open_journal(str(tmp_path / "fleet.journal"))
+    seen = []
+    journal.subscribers.append(lambda entry: seen.append((entry['op'], storage._trucks['J-T2'].location)))
+    try:
+        # Exercise
+        storage.update_truck_location('J-T2', 'Elko, NV')
+        try:
+            with storage._journaled('update_truck_location', 'J-T2', 'Ely, NV'):
+                raise RuntimeError("store failed")
+        except RuntimeError:
+            pass
+    finally:
+        storage.close_journal()
+
+    # Verify
+    assert seen == [('update_truck_location', 'Elko, NV')]
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import logging
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import logger as dispatch_logging
+
+
+# ============================================================================
+# LOGGING PIPELINE TESTS
+# ============================================================================
+
+def test_setup_logger_writes_through_queue_to_rotating_file(tmp_path):
+    """Test records go through a queue and land in a size-rotated session file."""
+    # Setup
+    with patch.object(dispatch_logging, 'LOG_DIR', str(tmp_path)), \
+            patch.object(dispatch_logging, 'LOG_MAX_BYTES', 2000):
+        log = dispatch_logging.setup_logger()
+
+        # Exercise
+        try:
+            for n in range(100):
+                dispatch_logging.log_tool_result("trip_schedule", {'leg': n})
+            handler_types = [type(h).__name__ for h in log.handlers]
+        finally:
+            dispatch_logging.shutdown_logger()
+
+    # Verify
+    assert handler_types == ['_DeferredQueueHandler']
+    files = sorted(os.listdir(tmp_path))
+    assert len(files) > 1  # Rotated at least once
+    with open(tmp_path / [f for f in files if f.endswith('.log')][0], encoding='utf-8') as f:
+        assert "TOOL RESULT [trip_schedule]: {'leg': 99}" in f.read()
+    assert dispatch_logging.logger.handlers == []
+
+
+def test_disabled_levels_never_format_arguments():
+    """Test results are not rendered when their level is disabled."""
+    # Setup
+    result = Mock()
+    result.__str__ = Mock(return_value="big result")
+    original_level = dispatch_logging.logger.level
+    dispatch_logging.logger.setLevel(logging.WARNING)
+
+    # Exercise
+    try:
+        dispatch_logging.log_tool_result("hrs_min_sec", result)
+        dispatch_logging.log_agent_response(result)
+        dispatch_logging.log_function_call(lambda: result)()
+    finally:
+        dispatch_logging.logger.setLevel(original_level)
+
+    # Verify
+    result.__str__.assert_not_called()
+
+
+def test_queue_defers_rendering_of_immutable_arguments_only():
+    """Test records with immutable arguments are queued unrendered and mutable ones are rendered at the call."""
+    # Setup
+    handler = dispatch_logging._DeferredQueueHandler(Mock())
+    def record(*args):
+        return logging.LogRecord('dispatch_logger', logging.INFO, __file__, 1, "TOOL RESULT [%s]: %s", args, None)
+    result = {'legs': [1, 2]}
+
+    # Exercise
+    deferred = handler.prepare(record("trip_schedule", "3 legs"))
+    rendered = handler.prepare(record("trip_schedule", result))
+    result['legs'].append(3)
+
+    # Verify
+    assert (deferred.msg, deferred.args) == ("TOOL RESULT [%s]: %s", ("trip_schedule", "3 legs"))
+    assert deferred.getMessage() == "TOOL RESULT [trip_schedule]: 3 legs"
+    assert (rendered.msg, rendered.args) == ("TOOL RESULT [trip_schedule]: {'legs': [1, 2]}", None)
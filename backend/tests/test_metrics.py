@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+from truck import Truck
+from trailer import Trailer
+from metrics import LatencyRecorder, approximate_size, estimate_memory
+
+
+# ============================================================================
+# LATENCY RECORDER TESTS
+# ============================================================================
+
+def test_timed_records_calls_and_percentiles():
+    """Test wrapped functions keep their behaviour and report p50/p99 per operation."""
+    # Setup
+    recorder = LatencyRecorder(window=100)
+    fake_clock = iter(range(0, 10 ** 9, 1000))  # Every call appears to take 1us
+
+    @recorder.timed
+    def lookup(key):
+        return key.upper()
+
+    # Exercise
+    with patch('metrics.perf_counter_ns', lambda: next(fake_clock)):
+        results = [lookup('t1') for _ in range(150)]
+    stats = recorder.stats()
+
+    # Verify
+    assert results[0] == 'T1'
+    assert lookup.__name__ == 'lookup'
+    assert stats['lookup'] == {'calls': 150, 'p50_us': 1.0, 'p99_us': 1.0, 'max_us': 1.0}
+    recorder.reset()
+    assert recorder.stats() == {}
+
+
+def test_timed_records_failed_calls():
+    """Test calls that raise are still counted."""
+    # Setup
+    recorder = LatencyRecorder()
+    failing = recorder.timed(Mock(side_effect=KeyError('T9'), __name__='fetch'))
+
+    # Exercise
+    try:
+        failing('T9')
+    except KeyError:
+        pass
+
+    # Verify
+    assert recorder.stats()['fetch']['calls'] == 1
+
+
+# ============================================================================
+# MEMORY ESTIMATE TESTS
+# ============================================================================
+
+def test_memory_estimate_skips_linked_entities():
+    """Test a truck's size does not include the trailer it is linked to."""
+    # Setup
+    truck = Truck('T1', "Volvo", "VNL", 2023)
+    alone = approximate_size(truck)
+    truck.attached_trailer = Trailer('TR1', "Wabash", "Reefer", 2022)
+
+    # Exercise
+    linked = approximate_size(truck)
+    estimate = estimate_memory(iter([truck] * 10), count=1000, sample=5)
+
+    # Verify
+    assert linked < alone + 200
+    assert estimate == {'count': 1000, 'bytes_per_entity': linked, 'approx_bytes': linked * 1000}
@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import storage
+from order_loader import (
+    parse_timestamp,
+    normalize_order_number,
+    normalize_city,
+    iter_order_batches,
+    load_orders_csv
+)
+
+ORDERS_CSV = os.path.join(os.path.dirname(__file__), '..', 'orders.csv')
+
+
+# ============================================================================
+# VALUE NORMALIZATION TESTS
+# ============================================================================
+
+def test_parse_timestamp_tms_format():
+    """Test TMS timestamps parse into datetime values."""
+    assert parse_timestamp("5/26/2025 11:01") == datetime(2025, 5, 26, 11, 1)
+    assert parse_timestamp("") is None
+
+
+def test_parse_timestamp_invalid():
+    """Test malformed timestamps raise ValueError."""
+    try:
+        parse_timestamp("2025-05-26T11:01")
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_normalize_order_number_strips_marker():
+    """Test the trailing '*' marker is removed and reported."""
+    assert normalize_order_number("12574454*") == ("12574454", True)
+    assert normalize_order_number("12626313") == ("12626313", False)
+
+
+def test_normalize_city():
+    """Test TMS city cells are normalized to 'City, ST'."""
+    assert normalize_city("CALERA,AL/") == "CALERA, AL"
+    assert normalize_city("") is None
+
+
+# ============================================================================
+# BULK LOAD TESTS
+# ============================================================================
+
+def test_iter_order_batches_respects_chunk_size():
+    """Test the export is streamed in batches no larger than chunk_size."""
+    # Exercise
+    batches = list(iter_order_batches(ORDERS_CSV, chunk_size=3))
+
+    # Verify
+    assert all(len(batch) <= 3 for batch in batches)
+    assert sum(len(batch) for batch in batches) == 5
+    assert batches[0][0]['Start Dt/Tm'] == datetime(2025, 5, 26, 11, 1)
+
+
+def test_load_orders_csv_inserts_into_storage():
+    """Test a bulk load makes orders reachable through storage lookups."""
+    # Exercise
+    report = load_orders_csv(ORDERS_CSV, chunk_size=2)
+
+    # Verify
+    assert report['rows_loaded'] == 5
+    assert report['rows_rejected'] == 0
+    assert report['batches'] == 3
+    assert report['rows_per_second'] > 0
+    order = storage.get_order_by_id('12574454')
+    assert order['Shipper City'] == "CALERA, AL"
+    assert order['Order # Marked'] == True
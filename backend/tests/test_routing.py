@@ -0,0 +1,127 @@
+import unittest
+import sys
+import os
+import random
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import geo
+from routing import RoadGraph, Router
+
+
+def write_graph(path, nodes, edges):
+    """Helper function to write nodes.csv and edges.csv into a graph directory."""
+    with open(path / 'nodes.csv', 'w', encoding='utf-8') as f:
+        f.write("id,lat,lon\n")
+        f.writelines(f"{node_id},{lat},{lon}\n" for node_id, lat, lon in nodes)
+    with open(path / 'edges.csv', 'w', encoding='utf-8') as f:
+        f.write("from,to,miles,minutes,oneway\n")
+        f.writelines(f"{start},{end},{miles},{minutes},{oneway}\n" for start, end, miles, minutes, oneway in edges)
+    return str(path)
+
+
+# Dallas (D), Fort Worth (F) and Waco (W), with a slow direct D-W road and a faster one through a junction (J)
+NODES = [('D', 32.7767, -96.7970), ('F', 32.7555, -97.3308), ('W', 31.5493, -97.1467), ('J', 32.1, -97.0)]
+EDGES = [('D', 'W', 95, 180, ''), ('D', 'J', 55, 50, ''), ('J', 'W', 50, 45, ''), ('D', 'F', 33, 35, ''),
+         ('F', 'W', 90, 120, '1')]
+
+
+# ============================================================================
+# GRAPH TESTS
+# ============================================================================
+
+def test_shortest_picks_fastest_route_and_respects_oneway(tmp_path):
+    """Test A* settles on the quickest route, not the shortest, and only follows one-way edges forwards."""
+    # Setup
+    graph = RoadGraph.load(write_graph(tmp_path, NODES, EDGES))
+    node = {node_id: i for i, node_id in enumerate(graph.node_ids)}
+
+    # Exercise
+    dallas_waco = graph.shortest(node['D'], node['W'])
+    fort_worth_waco = graph.shortest(node['F'], node['W'])
+    waco_fort_worth = graph.shortest(node['W'], node['F'])
+
+    # Verify
+    assert dallas_waco == (95.0, 105.0)
+    assert fort_worth_waco == (120.0, 90.0)
+    assert waco_fort_worth == (95.0 + 35.0, 105.0 + 33.0)
+    assert graph.edge_count == 9
+
+
+def test_astar_matches_dijkstra_on_random_graph():
+    """Test the heuristic never changes the answer compared with a plain Dijkstra search."""
+    # Setup
+    rng = random.Random(3)
+    nodes = [{'id': str(i), 'lat': str(35 + rng.random() * 3), 'lon': str(-100 + rng.random() * 3)} for i in range(300)]
+    edges = []
+    for _ in range(1200):
+        a, b = rng.sample(nodes, 2)
+        straight = geo.haversine_miles((float(a['lat']), float(a['lon'])), (float(b['lat']), float(b['lon'])))
+        miles = straight * rng.uniform(1.0, 1.6)
+        edges.append({'from': a['id'], 'to': b['id'], 'miles': str(miles),
+                      'minutes': str(miles / rng.uniform(25, 70) * 60), 'oneway': rng.choice(['', '1'])})
+    graph = RoadGraph(nodes, edges)
+    dijkstra = RoadGraph(nodes, edges)
+    dijkstra.pace = 0.0
+
+    for _ in range(50):
+        source, target = rng.randrange(300), rng.randrange(300)
+
+        # Exercise
+        found = graph.shortest(source, target)
+        expected = dijkstra.shortest(source, target)
+
+        # Verify
+        assert (found is None) == (expected is None)
+        if found is not None:
+            assert abs(found[0] - expected[0]) < 1e-6
+
+
+# ============================================================================
+# ROUTER TESTS
+# ============================================================================
+
+def test_router_caches_pairs_and_falls_back_to_estimate(tmp_path):
+    """Test repeat routes come from the cache and unroutable stops get the great-circle estimate."""
+    # Setup
+    router = Router(RoadGraph.load(write_graph(tmp_path, NODES, EDGES)))
+
+    # Exercise
+    first = router.route("Dallas, TX", "Waco, TX")
+    with patch.object(router.graph, 'shortest') as shortest:
+        repeat = router.route("DALLAS,TX/", "Waco, TX")
+        shortest.assert_not_called()
+    far = router.route("Dallas, TX", "Denver, CO")
+    estimate = Router().route("Dallas, TX", "Waco, TX")
+
+    # Verify
+    assert first.routed is True
+    assert abs(first.hours - 95 / 60) < 0.01
+    assert first.miles > estimate.miles  # The fast road runs out of the way
+    assert repeat == first
+    assert far.routed is False
+    assert estimate.routed is False
+    assert router.stats()['route_hits'] == 1
+    assert Router().route("Dallas, TX", "Customer Site A") is None
+
+
+def test_trip_length_keeps_caller_figures_unless_graph_routes(tmp_path):
+    """Test trips use the road graph route when there is one and the caller's distance and speed otherwise."""
+    # Setup
+    routed = Router(RoadGraph.load(write_graph(tmp_path, NODES, EDGES)))
+    no_graph = Router()
+
+    # Exercise
+    by_graph = routed.trip_length(500, 50, "Dallas, TX", "Waco, TX")
+    unrouted = routed.trip_length(500, 50, "Dallas, TX", "Denver, CO")
+    estimated = no_graph.trip_length(500, 50, "Dallas, TX", "Waco, TX")
+    no_stops = no_graph.trip_length(500, 50)
+
+    # Verify
+    assert by_graph[2].routed is True
+    assert by_graph[:2] == (round(by_graph[2].miles, 1), by_graph[2].hours)
+    assert unrouted == estimated == no_stops == (500, 10.0, None)
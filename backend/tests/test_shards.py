@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+from truck import Truck
+from shards import ShardedTable
+
+
+def create_truck(truck_id, fleet, location="Depot"):
+    """Helper function to create a truck in a fleet."""
+    truck = Truck(truck_id, "Volvo", "VNL", 2023)
+    truck.assigned_fleet = fleet
+    truck.location = location
+    return truck
+
+
+# ============================================================================
+# SHARD PLACEMENT TESTS
+# ============================================================================
+
+def test_entities_land_in_their_fleet_shard():
+    """Test each entity is stored in, and only in, its fleet's shard."""
+    # Setup
+    table = ShardedTable('truck_id', 'location')
+
+    # Exercise
+    table['T1'] = create_truck('T1', 'ACME')
+    table['T2'] = create_truck('T2', 'ACME')
+    table['T3'] = create_truck('T3', None)
+
+    # Verify
+    assert table.fleets() == {'ACME': 2, '': 1}
+    assert sorted(table.in_fleet('ACME')) == ['T1', 'T2']
+    assert list(table.in_fleet(None)) == ['T3']
+    assert len(table.in_fleet('UNKNOWN')) == 0
+    assert table['T3'].truck_id == 'T3'
+    assert len(table) == 3
+
+
+def test_save_moves_entity_between_shards():
+    """Test changing an entity's fleet and saving it moves it to the new shard."""
+    # Setup
+    table = ShardedTable('truck_id', 'location')
+    truck = create_truck('T1', 'ACME', 'Reno, NV')
+    table['T1'] = truck
+
+    # Exercise
+    truck.assigned_fleet = 'BETA'
+    table.save(truck)
+
+    # Verify
+    assert table.fleets() == {'ACME': 0, 'BETA': 1}
+    assert table.in_fleet('BETA').by_location('reno, nv') == [truck]
+    assert table.in_fleet('ACME').by_location('reno, nv') == []
+    assert table['T1'] is truck
+
+
+# ============================================================================
+# CROSS-SHARD QUERY TESTS
+# ============================================================================
+
+def test_cross_shard_queries_fan_out():
+    """Test location, filter and page queries see every shard."""
+    # Setup
+    table = ShardedTable('truck_id', 'location')
+    for n, fleet in enumerate(['ACME', 'BETA', 'ACME', 'GAMMA', 'BETA']):
+        table[f'T{n}'] = create_truck(f'T{n}', fleet, 'Reno, NV' if n % 2 else 'Elko, NV')
+    table['T1'].is_drivable = False
+
+    # Exercise
+    in_reno = table.by_location('Reno, NV')
+    drivable = table.where(is_drivable=True)
+    first_page = table.page(None, 3)
+    second_page = table.page(first_page[-1][0], 3)
+
+    # Verify
+    assert sorted(t.truck_id for t in in_reno) == ['T1', 'T3']
+    assert sorted(t.truck_id for t in drivable) == ['T0', 'T2', 'T3', 'T4']
+    assert [row[0] for row in first_page + second_page] == ['T0', 'T1', 'T2', 'T3', 'T4']
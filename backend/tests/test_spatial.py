@@ -0,0 +1,108 @@
+import unittest
+import sys
+import os
+import csv
+import random
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import geo
+from spatial import SpatialIndex
+
+
+def create_asset(asset_id, location):
+    """Helper function to create a stand-in entity with an id and a location."""
+    return Mock(asset_id=asset_id, location=location)
+
+
+def create_index(assets):
+    """Helper function to index (id, location) pairs."""
+    index = SpatialIndex('asset_id', 'location')
+    index.rebuild(create_asset(asset_id, location) for asset_id, location in assets)
+    return index
+
+
+# ============================================================================
+# QUERY TESTS
+# ============================================================================
+
+def test_nearest_and_within_match_a_full_scan():
+    """Test grid queries return exactly what measuring every asset would, across the whole gazetteer."""
+    # Setup
+    with open(geo.GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+        places = [f"{row['city']}, {row['state']}" for row in csv.DictReader(f)]
+    rng = random.Random(7)
+    assets = [(f"A{i:04d}", rng.choice(places)) for i in range(2000)]
+    index = create_index(assets)
+    origins = [geo.geocode(place) for place in ("Dallas, TX", "Anchorage, AK", "Honolulu, HI", "Bangor, ME")]
+
+    for origin in origins:
+        scan = sorted((geo.haversine_miles(origin, geo.geocode(location)), asset_id) for asset_id, location in assets)
+
+        # Exercise
+        nearest = index.nearest(origin, 25)
+        within = index.within(origin, 300)
+
+        # Verify
+        assert [asset_id for asset_id, _ in nearest] == [asset_id for _, asset_id in scan[:25]]
+        assert [asset_id for asset_id, _ in within] == [asset_id for miles, asset_id in scan if miles <= 300]
+
+
+def test_nearest_applies_filter_and_distance_cap():
+    """Test unavailable assets are skipped and nothing past max_miles is returned."""
+    # Setup
+    index = create_index([('D1', 'Dallas, TX'), ('D2', 'Fort Worth, TX'), ('D3', 'Houston, TX'), ('D4', 'Home Base')])
+    dallas = geo.geocode("Dallas, TX")
+
+    # Exercise
+    available = index.nearest(dallas, 2, where=lambda asset_id: asset_id != 'D1')
+    capped = index.nearest(dallas, 5, max_miles=100)
+
+    # Verify
+    assert [asset_id for asset_id, _ in available] == ['D2', 'D3']
+    assert [asset_id for asset_id, _ in capped] == ['D1', 'D2']
+    assert capped[0][1] == 0.0
+    assert len(index) == 3
+
+
+def test_nearest_returns_nothing_for_non_positive_k():
+    """Test asking for zero or fewer assets returns an empty list instead of failing."""
+    # Setup
+    index = create_index([('D1', 'Dallas, TX'), ('D2', 'Fort Worth, TX')])
+    dallas = geo.geocode("Dallas, TX")
+
+    # Exercise / Verify
+    assert index.nearest(dallas, 0) == []
+    assert index.nearest(dallas, -3) == []
+
+
+# ============================================================================
+# UPDATE TESTS
+# ============================================================================
+
+def test_index_follows_moves_and_removals():
+    """Test upserts move assets between cells and unchanged locations are not geocoded again."""
+    # Setup
+    asset = create_asset('T1', 'Chicago, IL')
+    index = create_index([('T2', 'Houston, TX')])
+    index.upsert(asset)
+    dallas = geo.geocode("Dallas, TX")
+
+    # Exercise
+    asset.location = 'Austin, TX'
+    index.upsert(asset)
+    moved = index.nearest(dallas, 1)
+    with patch('spatial.geocode') as geocode:
+        index.upsert(asset)
+        geocode.assert_not_called()
+    index.remove('T1')
+    removed = index.nearest(dallas, 1)
+
+    # Verify
+    assert moved[0][0] == 'T1'
+    assert index.position_of('T1') is None
+    assert removed[0][0] == 'T2'
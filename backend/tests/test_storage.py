@@ -0,0 +1,925 @@
+import unittest
+import pytest
+import sqlite3
+import threading
+import time
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime, date
+
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
+
+import storage
+import snapshot
+import numpy as np
+
+
+# ============================================================================
+# LOCATION INDEX TESTS
+# ============================================================================
+
+def test_get_drivers_by_location_after_create():
+    """Test drivers are found by location right after creation."""
+    # Setup
+    storage.create_driver({
+        'driver_id': 'LOC-D1',
+        'first_name': 'Ana',
+        'last_name': 'Lopez',
+        'license_number': 'DL-LOC-1',
+        'current_location': 'Tulsa, OK'
+    })
+
+    # Exercise
+    result = storage.get_drivers_by_location('tulsa, ok')
+
+    # Verify
+    assert [d['driver_id'] for d in result] == ['LOC-D1']
+
+
+def test_update_truck_location_moves_index_entry():
+    """Test updating a truck location moves it between index buckets."""
+    # Setup
+    storage.create_truck({'truck_id': 'LOC-T1', 'make': 'Mack', 'model': 'Anthem', 'year': 2022, 'location': 'Waco, TX'})
+
+    # Exercise
+    storage.update_truck_location('LOC-T1', 'Austin, TX')
+
+    # Verify
+    assert 'LOC-T1' not in [t['truck_id'] for t in storage.get_trucks_by_location('Waco, TX')]
+    assert 'LOC-T1' in [t['truck_id'] for t in storage.get_trucks_by_location('AUSTIN, TX')]
+
+
+def test_entity_update_location_keeps_index_in_sync():
+    """Test calling update_location on a stored trailer updates the index."""
+    # Setup
+    storage.create_trailer({'trailer_id': 'LOC-TR1', 'make': 'Wabash', 'model': 'Reefer', 'year': 2021, 'location': 'Mobile, AL'})
+    trailer = storage._trailers['LOC-TR1']
+
+    # Exercise
+    trailer.update_location('Biloxi, MS')
+
+    # Verify
+    assert storage.get_trailers_by_location('Mobile, AL') == []
+    assert [t['trailer_id'] for t in storage.get_trailers_by_location('biloxi, ms')] == ['LOC-TR1']
+
+
+def test_get_trucks_by_location_unknown_location():
+    """Test looking up a location with no assets returns an empty list."""
+    # Exercise
+    result = storage.get_trucks_by_location('Nowhere, ZZ')
+
+    # Verify
+    assert result == []
+
+
+# ============================================================================
+# ORDER INDEX TESTS
+# ============================================================================
+
+def test_get_order_by_id_returns_created_order():
+    """Test an order can be fetched by its Order # after creation."""
+    # Setup
+    storage.create_order({'Order #': 'IDX-1', 'Status': 'Available', 'Driver1 ID': 'UNKNOWN'})
+
+    # Exercise
+    result = storage.get_order_by_id('IDX-1')
+
+    # Verify
+    assert result['Order #'] == 'IDX-1'
+    assert storage.get_order_by_id('IDX-MISSING') is None
+
+
+def test_update_order_status_moves_status_bucket():
+    """Test status lookups follow an order after its status changes."""
+    # Setup
+    storage.create_order({'Order #': 'IDX-2', 'Status': 'Pending-Idx', 'Driver1 ID': 'UNKNOWN'})
+
+    # Exercise
+    result = storage.update_order_status('IDX-2', 'Delivered-Idx')
+
+    # Verify
+    assert result == True
+    assert storage.get_orders_by_status('pending-idx') == []
+    assert [o['Order #'] for o in storage.get_orders_by_status('DELIVERED-IDX')] == ['IDX-2']
+
+
+def test_assign_order_to_driver_preserves_insertion_order():
+    """Test orders by driver come back in creation order, not assignment order."""
+    # Setup
+    storage.create_order({'Order #': 'IDX-3', 'Status': 'Available', 'Driver1 ID': 'UNKNOWN'})
+    storage.create_order({'Order #': 'IDX-4', 'Status': 'Available', 'Driver1 ID': 'UNKNOWN'})
+
+    # Exercise
+    storage.assign_order_to_driver('IDX-4', 'IDX-DRIVER')
+    storage.assign_order_to_driver('IDX-3', 'IDX-DRIVER')
+
+    # Verify
+    assert [o['Order #'] for o in storage.get_orders_by_driver('IDX-DRIVER')] == ['IDX-3', 'IDX-4']
+    assert storage.assign_order_to_driver('IDX-MISSING', 'IDX-DRIVER') == False
+
+
+# ============================================================================
+# SQLITE BACKEND TESTS
+# ============================================================================
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    """Test the fleet written to SQLite is still there after reopening the file."""
+    # Setup
+    db_path = str(tmp_path / "fleet.db")
+    storage.configure_storage("sqlite", db_path)
+    try:
+        storage.create_driver({'driver_id': 'SQL-D1', 'first_name': 'Kim', 'last_name': 'Lee',
+                               'license_number': 'DL-SQL-1', 'current_location': 'Memphis, TN'})
+        storage.create_truck({'truck_id': 'SQL-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023,
+                              'location': 'Memphis, TN'})
+        storage.create_trailer({'trailer_id': 'SQL-TR1', 'make': 'Utility', 'model': 'Flatbed', 'year': 2020})
+        storage.create_order({'Order #': 'SQL-O1', 'Status': 'Available', 'Driver1 ID': 'UNKNOWN',
+                              'Start Dt/Tm': datetime(2025, 5, 26, 11, 1)})
+        storage.update_truck_location('SQL-T1', 'Nashville, TN')
+        storage.update_order_status('SQL-O1', 'Dispatched')
+
+        # Exercise
+        storage.configure_storage("sqlite", db_path)
+
+        # Verify
+        assert storage.get_driver_by_id('SQL-D1')['full_name'] == "Kim Lee"
+        assert [t['truck_id'] for t in storage.get_trucks_by_location('nashville, tn')] == ['SQL-T1']
+        assert storage.get_trucks_by_location('Memphis, TN') == []
+        assert storage.get_trailer_by_id('SQL-TR1')['trailer_id'] == 'SQL-TR1'
+        order = storage.get_order_by_id('SQL-O1')
+        assert order['Status'] == 'Dispatched'
+        assert order['Start Dt/Tm'] == datetime(2025, 5, 26, 11, 1)
+        assert [o['Order #'] for o in storage.get_orders_by_status('dispatched')] == ['SQL-O1']
+    finally:
+        storage.configure_storage("memory")
+
+
+def test_sqlite_backend_relinks_truck_assignments(tmp_path):
+    """Test a truck reloaded from SQLite still knows its assigned driver."""
+    # Setup
+    db_path = str(tmp_path / "fleet.db")
+    storage.configure_storage("sqlite", db_path)
+    try:
+        storage.create_driver({'driver_id': 'SQL-D2', 'first_name': 'Sam', 'last_name': 'Ortiz',
+                               'license_number': 'DL-SQL-2'})
+        driver = storage._drivers['SQL-D2']
+        driver.license_expiry = "2030-01-01"
+        driver.medical_cert_current = True
+        driver.drug_test_current = True
+        driver.background_check_valid = True
+        storage.create_truck({'truck_id': 'SQL-T2', 'make': 'Mack', 'model': 'Anthem', 'year': 2022})
+        assert storage.assign_driver_to_truck('SQL-D2', 'SQL-T2') == True
+
+        # Exercise
+        storage.configure_storage("sqlite", db_path)
+        truck = storage._trucks['SQL-T2']
+
+        # Verify
+        assert truck.assigned_driver is storage._drivers['SQL-D2']
+        assert storage.get_driver_by_id('SQL-D2')['assigned_truck_id'] == 'SQL-T2'
+        assert storage.assign_driver_to_truck('SQL-D2', 'SQL-T2') == False
+    finally:
+        storage.configure_storage("memory")
+
+
+def test_sqlite_batch_write_is_all_or_nothing(tmp_path):
+    """Test a row failing mid-batch rolls back the rows written before it."""
+    # Setup
+    db_path = str(tmp_path / "fleet.db")
+    storage.configure_storage("sqlite", db_path)
+    try:
+        table = storage._drivers
+        drivers = [storage.Driver(f'SQL-B{n}', 'Bo', 'Li', f'DL-B{n}') for n in range(3)]
+        row = table._row
+        broken = lambda driver: row(driver)[:-1] + (None,) if driver.driver_id == 'SQL-B2' else row(driver)
+
+        # Exercise
+        with patch.object(table, '_row', broken), pytest.raises(sqlite3.IntegrityError):
+            table.save_many(drivers)
+
+        # Verify
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM drivers WHERE id LIKE 'SQL-B%'").fetchone() == (0,)
+    finally:
+        storage.configure_storage("memory")
+
+
+def test_sqlite_backend_flushes_idle_writes_on_timer(tmp_path):
+    """Test buffered writes reach the file without a later write to trigger the flush."""
+    # Setup
+    db_path = str(tmp_path / "fleet.db")
+    storage.configure_storage("sqlite", db_path, flush_interval=0.05)
+    try:
+        storage.create_driver({'driver_id': 'SQL-D3', 'first_name': 'Ria', 'last_name': 'Shah',
+                               'license_number': 'DL-SQL-3'})
+
+        # Exercise
+        time.sleep(0.3)
+
+        # Verify
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT id FROM drivers WHERE id = 'SQL-D3'").fetchall() == [('SQL-D3',)]
+    finally:
+        storage.configure_storage("memory")
+
+
+def test_sqlite_backend_relinks_truck_after_driver_eviction(tmp_path):
+    """Test a driver reloaded after leaving the cache is the object its in-memory truck points at."""
+    # Setup
+    storage.configure_storage("sqlite", str(tmp_path / "fleet.db"), cache_size=2)
+    try:
+        storage.create_driver({'driver_id': 'SQL-D4', 'first_name': 'Ted', 'last_name': 'Ngo',
+                               'license_number': 'DL-SQL-4'})
+        driver = storage._drivers['SQL-D4']
+        driver.license_expiry = "2030-01-01"
+        driver.medical_cert_current = True
+        driver.drug_test_current = True
+        driver.background_check_valid = True
+        storage.create_truck({'truck_id': 'SQL-T4', 'make': 'Mack', 'model': 'Anthem', 'year': 2022})
+        assert storage.assign_driver_to_truck('SQL-D4', 'SQL-T4') == True
+        truck = storage._trucks['SQL-T4']
+        for n in range(3):  # Push the driver out of its two-entry cache
+            storage.create_driver({'driver_id': f'SQL-X{n}', 'first_name': 'Al', 'last_name': 'Fox',
+                                   'license_number': f'DL-X{n}'})
+        storage.flush_storage()
+
+        # Exercise
+        reloaded = storage._drivers['SQL-D4']
+
+        # Verify
+        assert reloaded is not driver
+        assert truck.assigned_driver is reloaded
+    finally:
+        storage.configure_storage("memory")
+
+
+# ============================================================================
+# SNAPSHOT TESTS
+# ============================================================================
+
+def test_snapshot_round_trip_restores_fleet(tmp_path):
+    """Test a saved snapshot restores entities, links and orders."""
+    # Setup
+    path = str(tmp_path / "fleet.snap")
+    storage.create_truck({'truck_id': 'SNAP-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023, 'location': 'Reno, NV'})
+    storage.create_trailer({'trailer_id': 'SNAP-TR1', 'make': 'Wabash', 'model': 'Reefer', 'year': 2022})
+    storage.attach_trailer_to_truck('SNAP-TR1', 'SNAP-T1')
+    storage.create_order({'Order #': 'SNAP-O1', 'Status': 'Available', 'Driver1 ID': 'UNKNOWN'})
+    storage.save_snapshot(path)
+    storage.update_truck_location('SNAP-T1', 'Elko, NV')
+
+    # Exercise
+    result = storage.load_snapshot(path)
+
+    # Verify
+    assert result == True
+    truck = storage._trucks['SNAP-T1']
+    assert truck.location == 'Reno, NV'
+    assert truck.attached_trailer is storage._trailers['SNAP-TR1']
+    assert [t['truck_id'] for t in storage.get_trucks_by_location('reno, nv')] == ['SNAP-T1']
+    assert storage.get_order_by_id('SNAP-O1')['Status'] == 'Available'
+
+
+def test_load_snapshot_rejects_unknown_version(tmp_path):
+    """Test snapshots from another format version are refused and storage is untouched."""
+    # Setup
+    path = str(tmp_path / "fleet.snap")
+    storage.create_driver({'driver_id': 'SNAP-D1', 'first_name': 'Lee', 'last_name': 'Park', 'license_number': 'DL-SNAP-1'})
+    storage.save_snapshot(path)
+    with open(path, 'r+b') as f:
+        f.seek(len(snapshot.MAGIC))
+        f.write((snapshot.FORMAT_VERSION + 1).to_bytes(2, 'little'))
+
+    # Exercise
+    result = storage.load_snapshot(path)
+
+    # Verify
+    assert result == False
+    assert storage.get_driver_by_id('SNAP-D1') is not None
+
+
+def test_snapshot_offset_matches_copied_tables(tmp_path):
+    """Test a snapshot taken mid-write waits for it, so its offset and contents agree."""
+    # Setup
+    path = str(tmp_path / "fleet.snap")
+    storage.create_truck({'truck_id': 'SNAP-T2', 'make': 'Mack', 'model': 'Anthem', 'year': 2022, 'location': 'Reno, NV'})
+    storage.open_journal(str(tmp_path / "fleet.journal"))
+    writing = threading.Event()
+    update_location = storage.Truck.update_location
+
+    # Exercise - the move is journaled before it is applied, and the snapshot starts in between
+    def slow_update(self, location):
+        writing.set()
+        time.sleep(0.05)
+        update_location(self, location)
+    try:
+        with patch.object(storage.Truck, 'update_location', slow_update):
+            writer = threading.Thread(target=storage.update_truck_location, args=('SNAP-T2', 'Elko, NV'))
+            writer.start()
+            writing.wait()
+            storage.save_snapshot(path)
+            writer.join()
+    finally:
+        storage.close_journal()
+
+    # Verify
+    content = snapshot.read_snapshot(path)
+    assert content['journal_offset'] == 1
+    assert [truck.location for truck in content['trucks'] if truck.truck_id == 'SNAP-T2'] == ['Elko, NV']
+
+
+# ============================================================================
+# INITIALIZATION LIFECYCLE TESTS
+# ============================================================================
+
+def test_initialize_storage_is_idempotent():
+    """Test initialization runs once and later calls are no-ops."""
+    # Exercise
+    storage.initialize_storage()
+    drivers_after_first = len(storage._drivers)
+    second = storage.initialize_storage()
+
+    # Verify
+    assert storage.is_storage_initialized() == True
+    assert second == False
+    assert len(storage._drivers) == drivers_after_first
+
+
+# ============================================================================
+# COLUMNAR FILTER TESTS
+# ============================================================================
+
+def test_available_truck_ids_follow_storage_mutations():
+    """Test the columnar view sees trucks created and changed through storage."""
+    # Setup
+    storage.create_truck({'truck_id': 'COL-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023})
+    storage._trucks['COL-T1'].has_registration = True
+    storage.refresh_fleet_columns()
+    assert 'COL-T1' in storage.get_available_truck_ids()
+
+    # Exercise
+    storage.update_truck_drivable_status('COL-T1', False)
+
+    # Verify
+    assert 'COL-T1' not in storage.get_available_truck_ids()
+
+
+def test_available_trailer_ids_after_attach():
+    """Test attaching a trailer through storage removes it from the available ids."""
+    # Setup
+    storage.create_trailer({'trailer_id': 'COL-TR1', 'make': 'Utility', 'model': 'Flatbed', 'year': 2020,
+                            'max_cargo_capacity': 48000.0})
+    storage.create_truck({'truck_id': 'COL-T2', 'make': 'Mack', 'model': 'Anthem', 'year': 2022})
+    assert 'COL-TR1' in storage.get_available_trailer_ids(min_free_capacity=20000.0)
+
+    # Exercise
+    storage.attach_trailer_to_truck('COL-TR1', 'COL-T2')
+
+    # Verify
+    assert 'COL-TR1' not in storage.get_available_trailer_ids()
+
+
+# ============================================================================
+# CONCURRENCY TESTS
+# ============================================================================
+
+def _race(calls):
+    """Run each call on its own thread, released together, and return their results."""
+    barrier = threading.Barrier(len(calls))
+    results = [None] * len(calls)
+
+    def run(i, call):
+        barrier.wait()
+        results[i] = call()
+
+    threads = [threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_assignments_never_double_book_driver():
+    """Test racing assignments of one driver to many trucks succeed exactly once."""
+    # Setup
+    storage.create_driver({'driver_id': 'RACE-D1', 'first_name': 'Ana', 'last_name': 'Ruiz',
+                           'license_number': 'DL-RACE-1'})
+    driver = storage._drivers['RACE-D1']
+    driver.license_expiry = "2030-01-01"
+    driver.medical_cert_current = True
+    driver.drug_test_current = True
+    driver.background_check_valid = True
+    truck_ids = [f'RACE-T{n}' for n in range(8)]
+    for truck_id in truck_ids:
+        storage.create_truck({'truck_id': truck_id, 'make': 'Volvo', 'model': 'VNL', 'year': 2023})
+
+    # Exercise - a slow eligibility check widens the window between checking and booking the driver
+    slow_check = lambda self: time.sleep(0.01) or True
+    with patch.object(storage.Driver, 'check_driving_eligibility', slow_check):
+        results = _race([lambda t=truck_id: storage.assign_driver_to_truck('RACE-D1', t) for truck_id in truck_ids])
+
+    # Verify
+    assert results.count(True) == 1
+    winner = truck_ids[results.index(True)]
+    assert driver.assigned_truck_id == winner
+    assert [t for t in truck_ids if storage._trucks[t].driver_id] == [winner]
+
+
+def test_concurrent_attachments_never_double_book_trailer():
+    """Test racing attachments of one trailer to many trucks succeed exactly once."""
+    # Setup
+    storage.create_trailer({'trailer_id': 'RACE-TR1', 'make': 'Utility', 'model': 'Flatbed', 'year': 2020})
+    truck_ids = [f'RACE-TT{n}' for n in range(8)]
+    for truck_id in truck_ids:
+        storage.create_truck({'truck_id': truck_id, 'make': 'Mack', 'model': 'Anthem', 'year': 2022})
+
+    # Exercise - slow condition reads widen the window between checking and attaching the trailer
+    condition = patch.object(storage.Trailer, 'is_working_condition',
+                             property(lambda self: time.sleep(0.01) or True, lambda self, value: None),
+                             create=True)
+    with condition:
+        results = _race([lambda t=truck_id: storage.attach_trailer_to_truck('RACE-TR1', t) for truck_id in truck_ids])
+
+    # Verify
+    assert results.count(True) == 1
+    assert [t for t in truck_ids if storage._trucks[t].attached_trailer_id] == [truck_ids[results.index(True)]]
+
+
+def test_concurrent_creates_keep_column_view_complete():
+    """Test drivers created from many threads all land in the columnar view."""
+    # Setup - build the column view first so every create grows it
+    columns = storage._fleet_columns()
+    resize = np.resize
+    resized = []
+
+    # Exercise - pause the first column resize, after the id array has already grown
+    def slow_resize(array, capacity):
+        resized.append(capacity)
+        if len(resized) == 2:
+            time.sleep(0.05)
+        return resize(array, capacity)
+
+    def create_batch(worker):
+        return [storage.create_driver({'driver_id': f'GROW-{worker}-{n}', 'first_name': 'Lee',
+                                       'last_name': 'Park', 'license_number': f'DL-GROW-{worker}-{n}'})
+                for n in range(1000)]
+    with patch.object(np, 'resize', slow_resize):
+        results = _race([lambda w=worker: create_batch(w) for worker in range(4)])
+
+    # Verify
+    assert all(all(batch) for batch in results)
+    created = {f'GROW-{worker}-{n}' for worker in range(4) for n in range(1000)}
+    assert created <= set(columns.drivers.ids())
+
+
+def test_entity_locks_are_dropped_once_released():
+    """Test writes, including ones for missing ids, leave no per-entity locks behind."""
+    # Setup
+    storage.create_driver({'driver_id': 'LOCK-D1', 'first_name': 'Ana', 'last_name': 'Ruiz',
+                           'license_number': 'DL-LOCK-1'})
+
+    # Exercise
+    results = _race([lambda n=n: storage.update_driver_availability(f'LOCK-D{n % 2}', True) for n in range(8)])
+    for n in range(100):
+        storage.update_driver_availability(f'LOCK-MISSING-{n}', True)
+
+    # Verify
+    assert results.count(True) == 4
+    assert len(storage._locks) == 0
+
+
+# ============================================================================
+# PAGINATION TESTS
+# ============================================================================
+
+def test_driver_pages_cover_fleet_in_id_order():
+    """Test walking driver pages returns every driver once, in id order, despite inserts mid-walk."""
+    # Setup
+    for n in range(5):
+        storage.create_driver({'driver_id': f'PG-D{n}', 'first_name': 'Page', 'last_name': str(n),
+                               'license_number': f'DL-PG-{n}'})
+    seen = []
+
+    # Exercise
+    page = storage.get_drivers_page(limit=2)
+    seen.extend(d['driver_id'] for d in page['items'])
+    storage.create_driver({'driver_id': '0-before-cursor', 'first_name': 'Late', 'last_name': 'Entry',
+                           'license_number': 'DL-PG-X'})
+    while page['next_cursor']:
+        page = storage.get_drivers_page(page['next_cursor'], limit=2)
+        seen.extend(d['driver_id'] for d in page['items'])
+
+    # Verify
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen))
+    assert {f'PG-D{n}' for n in range(5)} <= set(seen)
+    assert [d['driver_id'] for d in storage.iter_all_drivers(batch_size=3)] == sorted(storage._drivers)
+
+
+def test_page_rejects_bad_cursor_and_limit():
+    """Test malformed or wrong-type cursors and out-of-range limits raise ValueError."""
+    # Exercise / Verify
+    with pytest.raises(ValueError):
+        storage.get_trucks_page("not-a-cursor!", limit=10)
+    with pytest.raises(ValueError):
+        storage.get_trucks_page(storage.encode_cursor(5), limit=10)
+    with pytest.raises(ValueError):
+        storage.get_orders_page(storage.encode_cursor('T001'), limit=10)
+    with pytest.raises(ValueError):
+        storage.get_orders_page(storage.encode_cursor(True), limit=10)
+    with pytest.raises(ValueError):
+        storage.get_orders_page(limit=0)
+
+
+def test_sqlite_pages_trucks_and_orders(tmp_path):
+    """Test keyset pagination against the SQLite backend."""
+    # Setup
+    storage.configure_storage("sqlite", str(tmp_path / "fleet.db"))
+    try:
+        for n in (3, 1, 2):
+            storage.create_truck({'truck_id': f'SQL-PG-T{n}', 'make': 'Volvo', 'model': 'VNL', 'year': 2023})
+        storage.create_orders([{'Order #': f'SQL-PG-O{n}', 'Status': 'Available'} for n in range(3)])
+
+        # Exercise
+        first = storage.get_trucks_page(limit=2)
+        second = storage.get_trucks_page(first['next_cursor'], limit=2)
+        orders = list(storage.iter_all_orders(batch_size=2))
+
+        # Verify
+        assert [t['truck_id'] for t in first['items']] == ['SQL-PG-T1', 'SQL-PG-T2']
+        assert [t['truck_id'] for t in second['items']] == ['SQL-PG-T3']
+        assert second['next_cursor'] is None
+        assert [o['Order #'] for o in orders] == ['SQL-PG-O0', 'SQL-PG-O1', 'SQL-PG-O2']
+    finally:
+        storage.configure_storage("memory")
+
+
+# ============================================================================
+# FLEET SHARDING TESTS
+# ============================================================================
+
+def test_fleet_scoped_queries_only_see_their_fleet():
+    """Test fleet-scoped lookups ignore other fleets and follow fleet changes."""
+    # Setup
+    storage.create_truck({'truck_id': 'FL-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023,
+                          'location': 'Boise, ID', 'assigned_fleet': 'FL-ACME'})
+    storage.create_truck({'truck_id': 'FL-T2', 'make': 'Mack', 'model': 'Anthem', 'year': 2022,
+                          'location': 'Boise, ID', 'assigned_fleet': 'FL-BETA'})
+
+    # Exercise
+    acme_before = [t['truck_id'] for t in storage.get_trucks_by_location('Boise, ID', fleet='FL-ACME')]
+    storage.update_truck_fleet('FL-T2', 'FL-ACME')
+    acme_after = [t['truck_id'] for t in storage.get_trucks_by_location('Boise, ID', fleet='FL-ACME')]
+
+    # Verify
+    assert acme_before == ['FL-T1']
+    assert sorted(acme_after) == ['FL-T1', 'FL-T2']
+    assert storage.get_trucks_by_location('Boise, ID', fleet='FL-BETA') == []
+    assert sorted(t['truck_id'] for t in storage.get_trucks_by_location('Boise, ID')) == ['FL-T1', 'FL-T2']
+
+
+def test_sqlite_fleet_scope_and_old_files(tmp_path):
+    """Test fleet scoping on SQLite, including rows from files written before fleets existed."""
+    # Setup
+    db_path = str(tmp_path / "fleet.db")
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE trucks (id TEXT PRIMARY KEY, location_key TEXT, is_drivable INTEGER, "
+                 "driver_id TEXT, attached_trailer_id TEXT, data TEXT NOT NULL)")
+    conn.commit()
+    conn.close()
+    storage.configure_storage("sqlite", db_path)
+    try:
+        storage.create_truck({'truck_id': 'FL-SQL-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023,
+                              'location': 'Boise, ID', 'assigned_fleet': 'FL-ACME'})
+        storage.create_truck({'truck_id': 'FL-SQL-T2', 'make': 'Volvo', 'model': 'VNL', 'year': 2023,
+                              'location': 'Boise, ID'})
+
+        # Exercise
+        acme = storage.get_trucks_by_location('Boise, ID', fleet='FL-ACME')
+        unassigned = storage.get_available_trucks(fleet='')
+
+        # Verify
+        assert [t['truck_id'] for t in acme] == ['FL-SQL-T1']
+        assert [t['truck_id'] for t in storage.get_trucks_by_location('Boise, ID', fleet='')] == ['FL-SQL-T2']
+        assert unassigned == []  # Unregistered trucks are not roadworthy
+    finally:
+        storage.configure_storage("memory")
+
+
+# ============================================================================
+# BULK OPERATION TESTS
+# ============================================================================
+
+def test_bulk_create_rejects_whole_batch_with_row_errors():
+    """Test one bad row stops the whole batch and every bad row is reported."""
+    # Setup
+    storage.create_driver({'driver_id': 'BLK-D0', 'first_name': 'Ana', 'last_name': 'Lopez',
+                           'license_number': 'DL-BLK-0'})
+    rows = [
+        {'driver_id': 'BLK-D1', 'first_name': 'Ben', 'last_name': 'Hale', 'license_number': 'DL-BLK-1'},
+        {'driver_id': 'BLK-D0', 'first_name': 'Ana', 'last_name': 'Lopez', 'license_number': 'DL-BLK-0'},
+        {'driver_id': 'BLK-D2', 'first_name': 'Cy', 'last_name': 'Ng', 'license_number': 'DL-BLK-2',
+         'hours_worked_today': 'eight'},
+        {'driver_id': 'BLK-D1', 'first_name': 'Ben', 'last_name': 'Hale', 'license_number': 'DL-BLK-1'},
+        {'driver_id': 'BLK-D3', 'first_name': 'Di', 'last_name': 'Ro', 'license_number': 'DL-BLK-3',
+         'assigned_truck_id': 'T001'},
+    ]
+
+    # Exercise
+    report = storage.create_drivers(rows)
+
+    # Verify
+    assert report['created'] == 0
+    assert [e['row'] for e in report['errors']] == [1, 2, 3, 4]
+    assert 'already exists' in report['errors'][0]['error']
+    assert 'hours_worked_today' in report['errors'][1]['error']
+    assert 'duplicate' in report['errors'][2]['error']
+    assert 'BLK-D1' not in storage._drivers
+
+
+def test_bulk_create_and_update_trucks():
+    """Test a valid batch is created in one call and later updated in one call."""
+    # Setup
+    rows = [{'truck_id': f'BLK-T{n}', 'make': 'Volvo', 'model': 'VNL', 'year': 2023,
+             'has_registration': True, 'assigned_fleet': 'BLK-ACME'} for n in range(3)]
+
+    # Exercise
+    created = storage.create_trucks(rows)
+    updated = storage.update_trucks([{'truck_id': f'BLK-T{n}', 'location': 'Ely, NV', 'mileage': 1200}
+                                     for n in range(2)])
+    missing = storage.update_trucks([{'truck_id': 'BLK-T0', 'location': 'Reno, NV'},
+                                     {'truck_id': 'BLK-MISSING', 'location': 'Reno, NV'}])
+
+    # Verify
+    assert (created['created'], created['errors']) == (3, [])
+    assert (updated['updated'], updated['errors']) == (2, [])
+    assert missing['errors'] == [{'row': 1, 'truck_id': 'BLK-MISSING', 'error': 'truck BLK-MISSING not found'}]
+    assert sorted(t['truck_id'] for t in storage.get_trucks_by_location('ely, nv')) == ['BLK-T0', 'BLK-T1']
+    assert storage._trucks['BLK-T0'].mileage == 1200
+    assert storage._trucks.fleets()['BLK-ACME'] == 3
+
+
+def test_bulk_update_keeps_assignment_invariants():
+    """Test bulk updates cannot free an assigned driver or break an attached trailer, and go through setters."""
+    # Setup
+    storage.create_drivers([{'driver_id': f'INV-D{n}', 'first_name': 'Max', 'last_name': 'Hill',
+                             'license_number': f'DL-INV-{n}', 'license_expiry': '2030-01-01',
+                             'medical_cert_current': True, 'drug_test_current': True,
+                             'background_check_valid': True} for n in range(2)])
+    storage.create_trucks([{'truck_id': 'INV-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023}])
+    storage.create_trailers([{'trailer_id': 'INV-R1', 'make': 'Wabash', 'model': 'Reefer', 'year': 2022}])
+    assert storage.assign_driver_to_truck('INV-D0', 'INV-T1') == True
+    assert storage.attach_trailer_to_truck('INV-R1', 'INV-T1') == True
+
+    # Exercise
+    freed = storage.update_drivers([{'driver_id': 'INV-D1', 'current_location': 'Ely, NV'},
+                                    {'driver_id': 'INV-D0', 'is_available': True}])
+    broken = storage.update_trailers([{'trailer_id': 'INV-R1', 'is_working_condition': False}])
+    moved = storage.update_drivers([{'driver_id': 'INV-D1', 'current_location': 'Ely, NV', 'is_available': False}])
+
+    # Verify
+    assert freed['errors'] == [{'row': 1, 'driver_id': 'INV-D0',
+                                'error': 'cannot be available while assigned to truck INV-T1'}]
+    assert broken['errors'] == [{'row': 0, 'trailer_id': 'INV-R1',
+                                 'error': 'cannot leave working condition while attached to truck INV-T1'}]
+    assert storage._drivers['INV-D0'].is_available == False
+    assert storage._trailers['INV-R1'].is_working_condition == True
+    assert moved['updated'] == 1
+    assert [d['driver_id'] for d in storage.get_drivers_by_location('ely, nv')] == ['INV-D1']
+
+
+def test_sqlite_bulk_create_trailers(tmp_path):
+    """Test bulk creation against the SQLite backend writes every row."""
+    # Setup
+    storage.configure_storage("sqlite", str(tmp_path / "fleet.db"))
+    try:
+        rows = [{'trailer_id': f'BLK-TR{n}', 'make': 'Wabash', 'model': 'Reefer', 'year': 2022,
+                 'location': 'Ely, NV'} for n in range(3)]
+
+        # Exercise
+        report = storage.create_trailers(rows)
+        storage.configure_storage("sqlite", str(tmp_path / "fleet.db"))
+
+        # Verify
+        assert report['created'] == 3
+        assert sorted(t['trailer_id'] for t in storage.get_trailers_by_location('Ely, NV')) == \
+            ['BLK-TR0', 'BLK-TR1', 'BLK-TR2']
+    finally:
+        storage.configure_storage("memory")
+
+
+# ============================================================================
+# EXPIRY TRACKING TESTS
+# ============================================================================
+
+def test_upcoming_expiries_follow_renewals():
+    """Test the expiry window reflects renewals made through storage or the entity itself."""
+    # Setup
+    today = date(2026, 3, 1)
+    storage.create_truck({'truck_id': 'EXP-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023})
+    storage.create_driver({'driver_id': 'EXP-D1', 'first_name': 'Ana', 'last_name': 'Lopez',
+                           'license_number': 'DL-EXP-1'})
+    storage.renew_truck_registration('EXP-T1', "2026-03-10")
+    storage.renew_driver_medical_certificate('EXP-D1', date(2026, 3, 15))
+
+    # Exercise
+    before = [(e['id'], e['field']) for e in storage.get_upcoming_expiries(14, as_of=today)
+              if e['id'].startswith('EXP-')]
+    storage._trucks['EXP-T1'].renew_registration("2027-03-10")
+    after = [(e['id'], e['days_left']) for e in storage.get_upcoming_expiries(14, as_of=today)
+             if e['id'].startswith('EXP-')]
+
+    # Verify
+    assert before == [('EXP-T1', 'registration_expiry'), ('EXP-D1', 'medical_cert_expiry')]
+    assert after == [('EXP-D1', 14)]
+    assert storage.renew_driver_license('EXP-MISSING', "2027-01-01") is False
+
+
+
+def test_registration_sweep_classifies_trucks_and_trailers():
+    """Test the fleet-wide sweep sorts registrations by status as of the given day."""
+    # Setup
+    for truck_id in ('REG-T1', 'REG-T2', 'REG-T3', 'REG-T4'):
+        storage.create_truck({'truck_id': truck_id, 'make': 'Volvo', 'model': 'VNL', 'year': 2023})
+    storage.create_trailer({'trailer_id': 'REG-TR1', 'make': 'Utility', 'model': '3000R', 'year': 2022})
+    storage.renew_truck_registration('REG-T1', "2026-03-01")
+    storage.renew_truck_registration('REG-T2', "02/28/2026")
+    storage.renew_truck_registration('REG-T3', "someday")
+    storage.renew_trailer_registration('REG-TR1', date(2026, 2, 1))
+
+    # Exercise
+    sweep = storage.get_registration_sweep(date(2026, 3, 1))
+    later = storage.get_registration_sweep(date(2026, 3, 2))
+
+    # Verify
+    trucks = {status: [i for i in ids if i.startswith('REG-')] for status, ids in sweep['trucks'].items()}
+    assert sweep['as_of'] == '2026-03-01'
+    assert trucks == {'valid': ['REG-T1'], 'expired': ['REG-T2'], 'unreadable': ['REG-T3'],
+                      'unregistered': ['REG-T4']}
+    assert 'REG-TR1' in sweep['trailers']['expired']
+    assert 'REG-T1' in later['trucks']['expired']
+
+
+# ============================================================================
+# ELIGIBILITY TESTS
+# ============================================================================
+
+def test_driver_eligibility_reports_reasons_for_roster():
+    """Test the roster eligibility pass lists reason codes and follows driver changes."""
+    # Setup
+    storage.create_drivers([
+        {'driver_id': 'ELIG-D1', 'first_name': 'Ana', 'last_name': 'Lopez', 'license_number': 'DL-ELIG-1',
+         'license_expiry': "2030-01-01", 'medical_cert_current': True, 'drug_test_current': True,
+         'background_check_valid': True},
+        {'driver_id': 'ELIG-D2', 'first_name': 'Bo', 'last_name': 'Kim', 'license_number': 'DL-ELIG-2'}
+    ])
+
+    # Exercise
+    before = storage.get_driver_eligibility(all_reasons=True)
+    storage.update_drivers([{'driver_id': 'ELIG-D1', 'is_available': False}])
+    after = storage.get_driver_eligibility()
+
+    # Verify
+    assert 'ELIG-D1' in before['eligible']
+    assert before['ineligible']['ELIG-D2'] == ['LICENSE_NOT_SET', 'MEDICAL_CERT_NOT_CURRENT',
+                                               'DRUG_TEST_NOT_CURRENT', 'BACKGROUND_CHECK_INVALID']
+    assert after['ineligible']['ELIG-D1'] == ['NOT_AVAILABLE']
+    assert after['reason_counts']['NOT_AVAILABLE'] >= 1
+
+
+# ============================================================================
+# DISTANCE TESTS
+# ============================================================================
+
+def test_driver_distances_rank_located_drivers_nearest_first():
+    """Test the roster distance pass orders drivers by distance and skips unknown locations."""
+    # Setup
+    for driver_id, location in (('GEO-D1', 'Houston, TX'), ('GEO-D2', 'FORT WORTH,TX/'), ('GEO-D3', 'Home Base')):
+        storage.create_driver({'driver_id': driver_id, 'first_name': 'Ana', 'last_name': 'Lopez',
+                               'license_number': driver_id, 'current_location': location})
+
+    # Exercise
+    ranked = [d for d in storage.get_driver_distances("Dallas, TX") if d['driver_id'].startswith('GEO-')]
+
+    # Verify
+    assert [d['driver_id'] for d in ranked] == ['GEO-D2', 'GEO-D1']
+    assert ranked[0]['distance_miles'] < 40 < ranked[1]['distance_miles']
+    assert storage.get_driver_distances("Customer Site A") is None
+
+
+def test_load_candidates_follow_driver_moves():
+    """Test the closest drivers to each open load update when a driver moves."""
+    # Setup
+    for driver_id, location in (('LOAD-D1', 'Birmingham, AL'), ('LOAD-D2', 'Memphis, TN')):
+        storage.create_driver({'driver_id': driver_id, 'first_name': 'Ana', 'last_name': 'Lopez',
+                               'license_number': driver_id, 'current_location': location})
+    storage.create_order({'Order #': 'LOAD-O1', 'Status': 'Open', 'Shipper City': 'CALERA,AL/'})
+
+    # Exercise
+    before = storage.get_load_candidates(limit=2, status='Open')['LOAD-O1']
+    storage._drivers['LOAD-D2'].update_location('Montevallo, AL')
+    after = storage.get_load_candidates(limit=1, status='Open')['LOAD-O1']
+    matrix = storage.get_load_distance_matrix(status='Open')
+
+    # Verify
+    assert [c['driver_id'] for c in before] == ['LOAD-D1', 'LOAD-D2']
+    assert after[0]['driver_id'] == 'LOAD-D2'
+    assert after[0]['drive_hours'] < before[0]['drive_hours']
+    assert matrix['columns'] == ['LOAD-O1']
+    assert ['driver', 'LOAD-D2'] in matrix['rows']
+
+def test_load_candidates_reject_negative_limit():
+    """Test a negative limit is refused rather than slicing candidates from the far end."""
+    # Setup
+    for driver_id, location in (('LIM-D1', 'Tyler, TX'), ('LIM-D2', 'Waco, TX')):
+        storage.create_driver({'driver_id': driver_id, 'first_name': 'Ana', 'last_name': 'Lopez',
+                               'license_number': driver_id, 'current_location': location})
+    storage.create_order({'Order #': 'LIM-O1', 'Status': 'Quoted', 'Shipper City': 'Dallas, TX'})
+
+    # Exercise
+    none_wanted = storage.get_load_candidates(limit=0, status='Quoted')
+
+    # Verify
+    assert none_wanted == {'LIM-O1': []}
+    with pytest.raises(ValueError):
+        storage.get_load_candidates(limit=-1, status='Quoted')
+
+def test_in_range_flags_match_per_object_checks():
+    """Test the bulk in-range pass agrees with each driver's and trailer's own range check."""
+    # Setup
+    for driver_id, location in (('RNG-D1', 'Tyler, TX'), ('RNG-D2', 'Lubbock, TX'), ('RNG-D3', 'Ranch 9'),
+                                ('RNG-D4', '')):
+        storage.create_driver({'driver_id': driver_id, 'first_name': 'Ana', 'last_name': 'Lopez',
+                               'license_number': driver_id, 'current_location': location})
+    for trailer_id, location in (('RNG-R1', 'Tyler, TX'), ('RNG-R2', '')):
+        storage.create_trailer({'trailer_id': trailer_id, 'make': 'Utility', 'model': '4000D', 'year': 2021,
+                                'location': location})
+
+    # Exercise
+    flags = storage.get_in_range("Dallas, TX", max_miles=200)
+
+    # Verify
+    drivers = {d['driver_id']: d for d in flags['drivers']}
+    trailers = {t['trailer_id']: t for t in flags['trailers']}
+    assert [drivers[d]['in_range'] for d in ('RNG-D1', 'RNG-D2', 'RNG-D3', 'RNG-D4')] == [True, False, False, False]
+    assert drivers['RNG-D3']['distance_miles'] is None and drivers['RNG-D4']['distance_miles'] is None
+    assert trailers['RNG-R2'] == {'trailer_id': 'RNG-R2', 'distance_miles': None, 'in_range': False}
+    for record in flags['drivers'] + flags['trailers']:
+        assert record['distance_miles'] is not None or record['in_range'] == False
+    for driver_id, record in drivers.items():
+        assert record['in_range'] == storage._drivers[driver_id].check_in_range_to("Dallas, TX", max_miles=200)
+    for trailer_id, record in trailers.items():
+        assert record['in_range'] == storage._trailers[trailer_id].check_in_range_to_first_step("Dallas, TX", max_miles=200)
+    assert storage.get_in_range("Customer Site A") is None
+
+# ============================================================================
+# NEAREST ASSET TESTS
+# ============================================================================
+
+def test_nearest_assets_skip_unavailable_and_follow_moves():
+    """Test nearest lookups filter on availability and see location updates."""
+    # Setup
+    for trailer_id, location in (('NEAR-R1', 'Waco, TX'), ('NEAR-R2', 'Austin, TX'), ('NEAR-R3', 'El Paso, TX')):
+        storage.create_trailer({'trailer_id': trailer_id, 'make': 'Utility', 'model': '4000D', 'year': 2021,
+                                'location': location})
+    storage.create_truck({'truck_id': 'NEAR-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023, 'location': 'Waco, TX'})
+    storage.attach_trailer_to_truck('NEAR-R1', 'NEAR-T1')
+
+    # Exercise
+    nearest = [t['trailer_id'] for t in storage.get_nearest_assets('trailer', 'Waco, TX', k=50, max_miles=600)
+               if t['trailer_id'].startswith('NEAR-')]
+    storage._trailers['NEAR-R3'].update_location('Fort Worth, TX')
+    within = [t['trailer_id'] for t in storage.get_assets_within('trailer', 'Waco, TX', 100, available_only=False)
+              if t['trailer_id'].startswith('NEAR-')]
+
+    # Verify
+    assert nearest == ['NEAR-R2', 'NEAR-R3']
+    assert within == ['NEAR-R1', 'NEAR-R3', 'NEAR-R2']
+    assert storage.get_nearest_assets('trailer', 'Customer Site A') is None
+
+# ============================================================================
+# STORAGE STATS TESTS
+# ============================================================================
+
+def test_storage_stats_report_memory_indexes_and_latency():
+    """Test the stats cover every entity type and the operations that have run."""
+    # Setup
+    storage.create_truck({'truck_id': 'STAT-T1', 'make': 'Volvo', 'model': 'VNL', 'year': 2023,
+                          'location': 'Ely, NV'})
+    storage.get_trucks_by_location('Ely, NV')
+
+    # Exercise
+    stats = storage.get_storage_stats()
+
+    # Verify
+    assert set(stats['memory']) == {'drivers', 'trucks', 'trailers', 'orders'}
+    assert stats['memory']['trucks']['count'] == len(storage._trucks)
+    assert stats['memory']['trucks']['bytes_per_entity'] > 0
+    assert stats['indexes']['trucks']['location'] == len(storage._trucks)
+    assert stats['latency']['create_truck']['calls'] >= 1
+    assert stats['latency']['get_trucks_by_location']['p99_us'] >= stats['latency']['get_trucks_by_location']['p50_us']
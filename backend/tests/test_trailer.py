@@ -352,7 +352,30 @@ def test_check_in_range_to_first_step_with_location():
     result = trailer.check_in_range_to_first_step(destination)
     
     # Verify
-    assert result == True
+    assert result == False  # Neither place is in the gazetteer, so the distance is unknown
+    assert trailer.in_range_first_step == False
+    
+    # Teardown
+    trailer = None
+
+
+def test_check_in_range_to_first_step_uses_distance_and_drive_time():
+    """Test range follows the real distance, against a radius or a drive time."""
+    # Setup
+    trailer = Trailer("TR001", "Great Dane", "Dry Van", 2023)
+    trailer.location = "Dallas, TX"
+    
+    # Exercise
+    near = trailer.check_in_range_to_first_step("Fort Worth, TX")
+    far = trailer.check_in_range_to_first_step("El Paso, TX")
+    by_radius = trailer.check_in_range_to_first_step("Houston, TX", max_miles=200)
+    by_hours = trailer.check_in_range_to_first_step("Houston, TX", max_hours=6)
+    
+    # Verify
+    assert near == True
+    assert far == False
+    assert by_radius == False
+    assert by_hours == True
     assert trailer.in_range_first_step == True
     
     # Teardown
@@ -387,8 +410,7 @@ def test_check_in_range_to_first_step_empty_destination():
     result = trailer.check_in_range_to_first_step(destination)
     
     # Verify
-    assert result == True  # Method assumes in range for now
-    
+    assert result == False  # An empty destination cannot be measured    
     # Teardown
     trailer = None
 
@@ -748,8 +770,7 @@ def test_calculate_distance_to():
     distance = trailer.calculate_distance_to(destination)
     
     # Verify
-    assert isinstance(distance, float)
-    assert distance == 100.0  # Placeholder implementation returns 100.0
+    assert distance is None  # Neither place is in the gazetteer
     
     # Teardown
     trailer = None
@@ -766,8 +787,7 @@ def test_calculate_distance_to_empty_destination():
     distance = trailer.calculate_distance_to(destination)
     
     # Verify
-    assert isinstance(distance, float)
-    assert distance == 100.0  # Placeholder implementation
+    assert distance is None
     
     # Teardown
     trailer = None
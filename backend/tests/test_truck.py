@@ -9,6 +9,7 @@ from datetime import datetime, date
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))  # Relative path
 
 from truck import Truck
+from driver import Driver
 
 def create_mock_driver():
     """Helper function to create a mock driver object."""
@@ -324,7 +325,7 @@ def test_check_registration_valid_future_expiry(mock_date):
     result = truck.check_registration()
     
     # Verify
-    assert result == False
+    assert result == True
     
     # Teardown
     truck = None
@@ -1052,6 +1053,34 @@ def test_get_truck_info_with_driver():
     mock_driver = None
 
 
+@patch('truck.date')
+def test_get_truck_info_cache_follows_date_and_driver(mock_date):
+    """Test cached truck info is rebuilt when the day changes or the assigned driver changes."""
+    # Setup
+    mock_date.today.return_value = date(2024, 6, 30)
+    truck = Truck("T001", "Ford", "F-150", 2022)
+    truck.has_registration = True
+    truck.registration_expiry = "2024-06-30"
+    driver = Driver("D001", "John", "Doe", "DL123456789")
+    truck.assigned_driver = driver
+    assert truck.get_truck_info()['registration_valid'] == True
+    
+    # Exercise
+    mock_date.today.return_value = date(2024, 7, 1)
+    after_expiry = truck.get_truck_info()
+    driver.is_available = False
+    after_driver_change = truck.get_truck_info()
+    
+    # Verify
+    assert after_expiry['registration_valid'] == False
+    assert after_expiry['driver_available'] == True
+    assert after_driver_change['driver_available'] == False
+    
+    # Teardown
+    truck = None
+    driver = None
+
+
 def test_get_truck_info_with_trailer():
     """Test getting truck info with attached trailer."""
     # Setup
@@ -1223,6 +1252,30 @@ def test_repr_representation():
     truck = None
 
 
+
+# ============================================================================
+# TRUCK RECORD LAYOUT TESTS
+# ============================================================================
+
+def test_truck_is_slotted_and_matches_api_schema():
+    """Test trucks carry no per-instance dict and convert to the API schema."""
+    # Setup
+    from schemas import TruckSchema
+    truck = Truck("T001", "Ford", "F-150", 2022)
+    truck.registration_expiry = date(2026, 3, 1)
+
+    # Exercise
+    schema = TruckSchema.model_validate(truck)
+
+    # Verify
+    assert not hasattr(truck, '__dict__')
+    try:
+        truck.colour = "red"
+        assert False, "Unknown attributes should be rejected"
+    except AttributeError:
+        pass
+    assert schema.model_dump() == truck.to_record()
+
 if __name__ == '__main__':
     # Run tests using pytest if available, otherwise basic assertions
     import pytest
@@ -6,6 +6,7 @@ from typing import Optional, Dict, Any
 import math
 from datetime import datetime, timedelta
 import pandas as pd
+import routing
 
 
 
@@ -31,16 +32,20 @@ def hrs_min_sec(hour_of_day: float) -> str:
         return error_msg
 
 @function_tool
-def trip_schedule(start_time: float, distance: float, ave_speed: float) -> Dict[str, Any]:
-    """Calculate trip schedule with DOT compliance breaks for a given distance and speed."""
+def trip_schedule(start_time: float, distance: float, ave_speed: float,
+                  origin: Optional[str] = None, destination: Optional[str] = None) -> Dict[str, Any]:
+    """Calculate trip schedule with DOT compliance breaks for a given distance and speed.
+    When origin and destination are given and the road graph routes between them, its road distance and drive time are used instead."""
     log_tool_call("trip_schedule", {
         "start_time": start_time, 
         "distance": distance, 
-        "ave_speed": ave_speed
+        "ave_speed": ave_speed,
+        "origin": origin,
+        "destination": destination
     })
     
     try:
-        total_road_hours = distance / ave_speed
+        distance, total_road_hours, trip = routing.trip_length(distance, ave_speed, origin, destination)
 
         # Calculate the total number of full-day drive sections:
         total_full_drive_legs = math.floor(total_road_hours / 11)
@@ -94,13 +99,13 @@ def trip_schedule(start_time: float, distance: float, ave_speed: float) -> Dict[
             "schedule": schedule_data,
             "trip_summary": trip_summary
         }
+        if trip is not None:
+            result["route"] = {"miles": distance, "hours": round(trip.hours, 2), "road_graph": True}
         
-        log_tool_result("trip_schedule", f"Generated schedule for {distance} mile trip at {ave_speed} mph")
+        log_tool_result("trip_schedule", f"Generated schedule for {distance} mile trip over {total_road_hours:.2f} road hours")
         return result
         
     except Exception as e:
         error_msg = f"Error calculating trip schedule: {str(e)}"
         log_error(e, "trip_schedule")
         return {"error": error_msg}
-
-
@@ -1,13 +1,16 @@
-from datetime import datetime
-from typing import Optional, Dict, Any
-from pydantic import BaseModel
+from datetime import date, datetime
+from typing import Optional, Dict, Any, List, Callable, ClassVar
 import logging
+from versioning import Versioned
+from events import emit
+from expiries import ParsedDate
+from geo import distance_miles, within_range
 
 # Get logger
 logger = logging.getLogger('dispatch_logger')
 
 
-class Trailer(BaseModel):
+class Trailer(Versioned):
     trailer_id: str
     attached_truck_id: str
     location: str
@@ -26,6 +29,33 @@ class Trailer(BaseModel):
     next_inspection_due: Optional[datetime]
     insurance_carrier: str
     insurance_valid: bool
+    assigned_fleet: Optional[str]
+
+    # Callbacks fired as (trailer, old_location, new_location) after update_location
+    location_listeners: ClassVar[List[Callable[["Trailer", str, str], None]]] = []
+
+    # Callbacks fired as (trailer, field_name) after the registration is renewed
+    expiry_listeners: ClassVar[List[Callable[["Trailer", str], None]]] = []
+
+    # Attributes persisted by to_record/from_record
+    RECORD_FIELDS: ClassVar[tuple] = (
+        'trailer_id', 'attached_truck_id', 'location', 'is_working_condition', 'has_registration',
+        'bureaucratically_sound', 'is_currently_working', 'in_range_first_step', 'make', 'model',
+        'max_cargo_capacity', 'current_cargo_weight', 'year', 'registration_expiry',
+        'last_inspection', 'next_inspection_due', 'insurance_carrier', 'insurance_valid',
+        'assigned_fleet'
+    )
+
+    # Defaults for fields added after records were first persisted
+    RECORD_DEFAULTS: ClassVar[dict] = {'assigned_fleet': None}
+
+    # Fixed attribute layout instead of a per-instance __dict__; the pydantic
+    # schema used at the API boundary lives in schemas.TrailerSchema. The
+    # registration expiry lives in _registration_expiry with its parsed day
+    __slots__ = tuple(field for field in RECORD_FIELDS if field != 'registration_expiry') + ('_registration_expiry',)
+
+    # Parsed once on assignment; read the date with registration_expiry_date
+    registration_expiry = ParsedDate()
     
     def __init__(self, trailer_id: str, make: str, model: str, year: int):
         """
@@ -55,8 +85,9 @@ class Trailer(BaseModel):
         self.next_inspection_due = None
         self.insurance_carrier = ""
         self.insurance_valid = False  # Default to False
+        self.assigned_fleet = None  # Fleet this trailer belongs to; None when unassigned
         
-        logger.info(f"Trailer {self.trailer_id} initialized: {self.year} {self.make} {self.model}")
+        emit(logging.INFO, "Trailer %s initialized: %s %s %s", self.trailer_id, self.year, self.make, self.model, console=False)
     
     def attach_to_truck(self, truck_id: str) -> bool:
         """
@@ -69,18 +100,17 @@ class Trailer(BaseModel):
             bool: True if successful, False otherwise
         """
         if self.attached_truck_id:
-            print(f"Trailer {self.trailer_id} is already attached to truck {self.attached_truck_id}")
+            emit(None, "Trailer %s is already attached to truck %s", self.trailer_id, self.attached_truck_id)
             return False
         
         if not self.is_working_condition:
-            print(f"Trailer {self.trailer_id} is not in working condition")
+            emit(None, "Trailer %s is not in working condition", self.trailer_id)
             return False
         
         # TODO: Validate truck_id exists when Truck class integration is complete
         self.attached_truck_id = truck_id
         self.is_currently_working = True
-        logger.info(f"Trailer {self.trailer_id} attached to truck {truck_id}")
-        print(f"Trailer {self.trailer_id} attached to truck {truck_id}")
+        emit(logging.INFO, "Trailer %s attached to truck %s", self.trailer_id, truck_id)
         return True
     
     def detach_from_truck(self) -> bool:
@@ -91,14 +121,13 @@ class Trailer(BaseModel):
             bool: True if successful, False otherwise
         """
         if not self.attached_truck_id:
-            print(f"Trailer {self.trailer_id} is not attached to any truck")
+            emit(None, "Trailer %s is not attached to any truck", self.trailer_id)
             return False
         
         old_truck = self.attached_truck_id
         self.attached_truck_id = ""
         self.is_currently_working = False
-        logger.info(f"Trailer {self.trailer_id} detached from truck {old_truck}")
-        print(f"Trailer {self.trailer_id} detached from truck {old_truck}")
+        emit(logging.INFO, "Trailer %s detached from truck %s", self.trailer_id, old_truck)
         return True
     
     def set_working_condition(self, condition: bool) -> None:
@@ -110,11 +139,11 @@ class Trailer(BaseModel):
         """
         self.is_working_condition = condition
         condition_text = "working condition" if condition else "out of order"
-        print(f"Trailer {self.trailer_id} is now in {condition_text}")
+        emit(None, "Trailer %s is now in %s", self.trailer_id, condition_text)
         
         # If trailer becomes non-working and is attached, detach it
         if not condition and self.attached_truck_id:
-            print(f"Detaching trailer {self.trailer_id} due to working condition issues")
+            emit(None, "Detaching trailer %s due to working condition issues", self.trailer_id)
             self.detach_from_truck()
     
     def check_bureaucratic_status(self) -> bool:
@@ -145,25 +174,27 @@ class Trailer(BaseModel):
         # This would include brakes, lights, tires, structural integrity, etc.
         return self.is_working_condition
     
-    def check_in_range_to_first_step(self, destination: str) -> bool:
+    def check_in_range_to_first_step(self, destination: str, max_miles: Optional[float] = None,
+                                     max_hours: Optional[float] = None) -> bool:
         """
         Check if trailer is in range to reach the first step of a journey.
         
         Args:
             destination (str): The destination to check range for
+            max_miles (float): Greatest distance in range (default geo.RANGE_MILES)
+            max_hours (float): Greatest estimated drive time in range
             
         Returns:
-            bool: True if in range, False otherwise
+            bool: True if in range, False otherwise, including when either
+            place is not in the gazetteer
         """
-        # TODO: Implement actual distance/range calculation logic
-        # This would involve GPS coordinates, fuel capacity, etc.
         if not self.location:
-            print(f"Cannot determine range - trailer {self.trailer_id} location unknown")
+            emit(None, "Cannot determine range - trailer %s location unknown", self.trailer_id)
             return False
         
-        # Placeholder logic
-        self.in_range_first_step = True  # Assume in range for now
-        print(f"Trailer {self.trailer_id} is in range to reach {destination}")
+        self.in_range_first_step = bool(within_range(distance_miles(self.location, destination), max_miles, max_hours))
+        emit(None, "Trailer %s is %s range to reach %s", self.trailer_id,
+             "in" if self.in_range_first_step else "out of", destination)
         return self.in_range_first_step
     
     def update_location(self, new_location: str) -> None:
@@ -175,8 +206,9 @@ class Trailer(BaseModel):
         """
         old_location = self.location
         self.location = new_location
-        logger.info(f"Trailer {self.trailer_id} location updated from '{old_location}' to '{new_location}'")
-        print(f"Trailer {self.trailer_id} location updated from '{old_location}' to '{new_location}'")
+        for listener in self.location_listeners:
+            listener(self, old_location, new_location)
+        emit(logging.INFO, "Trailer %s location updated from '%s' to '%s'", self.trailer_id, old_location, new_location)
     
     def load_cargo(self, weight: float, cargo_type: str = "") -> bool:
         """
@@ -190,18 +222,16 @@ class Trailer(BaseModel):
             bool: True if successful, False if exceeds capacity
         """
         if weight <= 0:
-            print("Invalid cargo weight")
+            emit(None, "Invalid cargo weight")
             return False
         
         if self.current_cargo_weight + weight > self.max_cargo_capacity:
             available_capacity = self.max_cargo_capacity - self.current_cargo_weight
-            print(f"Cannot load {weight} units. Available capacity: {available_capacity}")
+            emit(None, "Cannot load %s units. Available capacity: %s", weight, available_capacity)
             return False
         
         self.current_cargo_weight += weight
-        logger.info(f"Loaded {weight} units of {cargo_type} onto trailer {self.trailer_id}. Current: {self.current_cargo_weight}/{self.max_cargo_capacity}")
-        print(f"Loaded {weight} units of {cargo_type} onto trailer {self.trailer_id}")
-        print(f"Current cargo weight: {self.current_cargo_weight}/{self.max_cargo_capacity}")
+        emit(logging.INFO, "Loaded %s units of %s onto trailer %s. Current: %s/%s", weight, cargo_type, self.trailer_id, self.current_cargo_weight, self.max_cargo_capacity)
         return True
     
     def unload_cargo(self) -> None:
@@ -210,7 +240,7 @@ class Trailer(BaseModel):
         """
         unloaded_weight = self.current_cargo_weight
         self.current_cargo_weight = 0.0
-        print(f"Unloaded {unloaded_weight} units of cargo from trailer {self.trailer_id}")
+        emit(None, "Unloaded %s units of cargo from trailer %s", unloaded_weight, self.trailer_id)
     
     def renew_registration(self, expiry_date) -> None:
         """
@@ -219,19 +249,30 @@ class Trailer(BaseModel):
         Args:
             expiry_date: New expiry date for registration
         """
-        # TODO: Implement proper date handling
         self.has_registration = True
         self.registration_expiry = expiry_date
-        print(f"Registration renewed for trailer {self.trailer_id}")
+        emit(None, "Registration renewed for trailer %s", self.trailer_id)
         self.check_bureaucratic_status()
+        for listener in self.expiry_listeners:
+            listener(self, 'registration_expiry')
+    
+    @property
+    def registration_expiry_date(self) -> Optional[date]:
+        """Registration expiry as parsed when it was assigned; None if unset or unparseable."""
+        return Trailer.registration_expiry.parsed(self)
     
     def get_trailer_status(self) -> dict:
         """
         Get comprehensive status information about the trailer.
         
+        The result is cached until one of the trailer's attributes changes.
+        
         Returns:
             dict: Dictionary containing trailer status information
         """
+        return self._memoized((), self._build_trailer_status)
+    
+    def _build_trailer_status(self) -> dict:
         return {
             'trailer_id': self.trailer_id,
             'attached_truck_id': self.attached_truck_id,
@@ -249,9 +290,9 @@ class Trailer(BaseModel):
         Schedule maintenance for the trailer.
         """
         # TODO: Implement maintenance scheduling system
-        print(f"Maintenance scheduled for trailer {self.trailer_id}")
+        emit(None, "Maintenance scheduled for trailer %s", self.trailer_id)
     
-    def calculate_distance_to(self, destination: str) -> float:
+    def calculate_distance_to(self, destination: str) -> Optional[float]:
         """
         Calculate distance to a destination.
         
@@ -259,13 +300,15 @@ class Trailer(BaseModel):
             destination (str): Destination location
             
         Returns:
-            float: Distance in miles (placeholder implementation)
-        """
-        # TODO: Implement actual GPS/mapping calculation
-        # This is a placeholder that returns a dummy distance
-        placeholder_distance = 100.0  # Default placeholder distance
-        print(f"Distance from {self.location} to {destination}: {placeholder_distance} miles")
-        return placeholder_distance
+            float: Great-circle distance in miles, or None when either place
+            cannot be geocoded
+        """
+        distance = distance_miles(self.location, destination)
+        if distance is None:
+            emit(None, "Cannot calculate distance - %s or %s not in gazetteer", self.location, destination)
+            return None
+        emit(None, "Distance from %s to %s: %.1f miles", self.location, destination, distance)
+        return distance
     
     def get_compliance_report(self) -> dict:
         """
@@ -286,6 +329,31 @@ class Trailer(BaseModel):
             'overall_compliance': self.check_bureaucratic_status()
         }
     
+    def to_record(self) -> dict:
+        """
+        Get the trailer's persisted attributes as a plain dict.
+        
+        Returns:
+            dict: Attribute name to value for every field in RECORD_FIELDS
+        """
+        return {field: getattr(self, field) for field in self.RECORD_FIELDS}
+    
+    @classmethod
+    def from_record(cls, record: dict) -> "Trailer":
+        """
+        Rebuild a trailer from a dict produced by to_record, without re-running __init__.
+        
+        Args:
+            record (dict): Persisted trailer attributes
+            
+        Returns:
+            Trailer: The restored trailer
+        """
+        trailer = cls.__new__(cls)
+        for field in cls.RECORD_FIELDS:
+            setattr(trailer, field, record[field] if field in record else cls.RECORD_DEFAULTS[field])
+        return trailer
+    
     def __str__(self) -> str:
         """
         String representation of the trailer.
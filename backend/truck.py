@@ -1,17 +1,62 @@
 from datetime import datetime, date
-from typing import Optional
-from pydantic import BaseModel
+from typing import Optional, List, Callable, ClassVar, TYPE_CHECKING
 import logging
+from versioning import Versioned, linked_version
+from events import emit
+from expiries import ParsedDate
+
+if TYPE_CHECKING:
+    from driver import Driver
+    from trailer import Trailer
 
 # Get logger
 logger = logging.getLogger('dispatch_logger')
 
 
-class Truck(BaseModel):
-    id: str
+class Truck(Versioned):
+    truck_id: str
+    is_drivable: bool
+    has_registration: bool
+    location: str
+    mileage: int
+    has_container: bool
     make: str
     model: str
     year: int
+    license_plate: str
+    registration_expiry: Optional[str]
+    driver_id: str
+    max_capacity: float
+    attached_trailer_id: str
+    assigned_fleet: Optional[str]
+    assigned_driver: Optional["Driver"]
+    attached_trailer: Optional["Trailer"]
+
+    # Callbacks fired as (truck, old_location, new_location) whenever the truck moves
+    location_listeners: ClassVar[List[Callable[["Truck", str, str], None]]] = []
+
+    # Callbacks fired as (truck, field_name) after the registration is renewed
+    expiry_listeners: ClassVar[List[Callable[["Truck", str], None]]] = []
+
+    # Attributes persisted by to_record/from_record; object links are rebuilt by storage
+    RECORD_FIELDS: ClassVar[tuple] = (
+        'truck_id', 'is_drivable', 'has_registration', 'location', 'mileage', 'has_container',
+        'make', 'model', 'year', 'license_plate', 'registration_expiry', 'driver_id',
+        'max_capacity', 'attached_trailer_id',
+        'assigned_fleet'
+    )
+
+    # Defaults for fields added after records were first persisted
+    RECORD_DEFAULTS: ClassVar[dict] = {'assigned_fleet': None}
+
+    # Fixed attribute layout instead of a per-instance __dict__; the pydantic
+    # schema used at the API boundary lives in schemas.TruckSchema. The
+    # registration expiry lives in _registration_expiry with its parsed day
+    __slots__ = tuple(field for field in RECORD_FIELDS if field != 'registration_expiry') + (
+        '_registration_expiry', 'assigned_driver', 'attached_trailer')
+
+    # Parsed once on assignment; check_registration reads registration_expiry_date
+    registration_expiry = ParsedDate()
     
     def __init__(self, truck_id: str, make: str, model: str, year: int):
         """
@@ -37,12 +82,13 @@ class Truck(BaseModel):
         self.driver_id = ""
         self.max_capacity = 0.0
         self.attached_trailer_id = ""
+        self.assigned_fleet = None  # Fleet this truck belongs to; None when unassigned
         
         # Object associations - store actual objects for better integration
         self.assigned_driver = None  # Will store Driver object
         self.attached_trailer = None  # Will store Trailer object
         
-        logger.info(f"Truck {self.truck_id} initialized: {self.year} {self.make} {self.model}")
+        emit(logging.INFO, "Truck %s initialized: %s %s %s", self.truck_id, self.year, self.make, self.model, console=False)
     
     def drive_to(self, destination: str) -> bool:
         """
@@ -54,23 +100,22 @@ class Truck(BaseModel):
         Returns:
             bool: True if successful, False otherwise
         """
-        logger.debug(f"Truck {self.truck_id} attempting to drive to {destination}")
+        emit(logging.DEBUG, "Truck %s attempting to drive to %s", self.truck_id, destination, console=False)
         
         if not self.is_drivable:
-            logger.warning(f"Truck {self.truck_id} is not drivable")
-            print(f"Truck {self.truck_id} is not drivable")
+            emit(logging.WARNING, "Truck %s is not drivable", self.truck_id)
             return False
         
         if not self.driver_id:
-            logger.warning(f"No driver assigned to truck {self.truck_id}")
-            print(f"No driver assigned to truck {self.truck_id}")
+            emit(logging.WARNING, "No driver assigned to truck %s", self.truck_id)
             return False
         
         # Update location if drive is successful
         old_location = self.location
         self.location = destination
-        logger.info(f"Truck {self.truck_id} drove from '{old_location}' to '{destination}'")
-        print(f"Truck {self.truck_id} drove from {old_location} to {destination}")
+        for listener in self.location_listeners:
+            listener(self, old_location, destination)
+        emit(logging.INFO, "Truck %s drove from '%s' to '%s'", self.truck_id, old_location, destination)
         return True
     
     def add_mileage(self, miles: int) -> None:
@@ -82,8 +127,7 @@ class Truck(BaseModel):
         """
         if miles > 0:
             self.mileage += miles
-            logger.info(f"Added {miles} miles to truck {self.truck_id}. Total mileage: {self.mileage}")
-            print(f"Added {miles} miles to truck {self.truck_id}. Total mileage: {self.mileage}")
+            emit(logging.INFO, "Added %s miles to truck %s. Total mileage: %s", miles, self.truck_id, self.mileage)
     
     def set_drivable_status(self, status: bool) -> None:
         """
@@ -94,8 +138,7 @@ class Truck(BaseModel):
         """
         self.is_drivable = status
         status_text = "drivable" if status else "not drivable"
-        logger.info(f"Truck {self.truck_id} drivable status changed to: {status_text}")
-        print(f"Truck {self.truck_id} is now {status_text}")
+        emit(logging.INFO, "Truck %s drivable status changed to: %s", self.truck_id, status_text)
     
     def check_registration(self) -> bool:
         """
@@ -110,44 +153,37 @@ class Truck(BaseModel):
         
         # If no expiry date is set, assume registration is valid
         if not self.registration_expiry:
-            print(f"Warning: No registration expiry date set for truck {self.truck_id}")
+            emit(None, "Warning: No registration expiry date set for truck %s", self.truck_id)
             return self.has_registration
         
-        # Check if registration is still valid (not expired)
-        try:
-            current_date = date.today()
-            
-            # Handle different date formats that might be stored
+        # The expiry was parsed when it was assigned; None here means it could not be
+        expiry_date = self.registration_expiry_date
+        if expiry_date is None:
             if isinstance(self.registration_expiry, str):
-                # Try parsing common date formats
-                try:
-                    expiry_date = datetime.strptime(self.registration_expiry, "%Y-%m-%d").date()
-                except ValueError:
-                    try:
-                        expiry_date = datetime.strptime(self.registration_expiry, "%m/%d/%Y").date()
-                    except ValueError:
-                        print(f"Error: Invalid date format for truck {self.truck_id} registration expiry")
-                        return False
-            elif isinstance(self.registration_expiry, (date, datetime)):
-                expiry_date = self.registration_expiry.date() if isinstance(self.registration_expiry, datetime) else self.registration_expiry
+                emit(None, "Error: Invalid date format for truck %s registration expiry", self.truck_id)
             else:
-                print(f"Error: Unsupported registration expiry date type for truck {self.truck_id}")
-                return False
-            
-            # Check if registration is still valid
-            is_valid = current_date <= expiry_date
+                emit(None, "Error: Unsupported registration expiry date type for truck %s", self.truck_id)
+            return False
+        
+        # Check if registration is still valid (not expired)
+        try:
+            is_valid = date.today() <= expiry_date
             if not is_valid:
-                logger.warning(f"Registration expired for truck {self.truck_id}. Expired on: {expiry_date}")
-                print(f"Registration expired for truck {self.truck_id}. Expired on: {expiry_date}")
+                emit(logging.WARNING, "Registration expired for truck %s. Expired on: %s", self.truck_id, expiry_date)
             else:
-                logger.debug(f"Registration valid for truck {self.truck_id}. Expires on: {expiry_date}")
+                emit(logging.DEBUG, "Registration valid for truck %s. Expires on: %s", self.truck_id, expiry_date, console=False)
             
             return is_valid
             
         except Exception as e:
-            print(f"Error checking registration for truck {self.truck_id}: {e}")
+            emit(None, "Error checking registration for truck %s: %s", self.truck_id, e)
             return False
     
+    @property
+    def registration_expiry_date(self) -> Optional[date]:
+        """Registration expiry as parsed when it was assigned; None if unset or unparseable."""
+        return Truck.registration_expiry.parsed(self)
+    
     def renew_registration(self, expiry_date) -> None:
         """
         Renew the truck's registration.
@@ -155,10 +191,11 @@ class Truck(BaseModel):
         Args:
             expiry_date: New expiry date for registration
         """
-        # TODO: Implement proper date handling
         self.has_registration = True
         self.registration_expiry = expiry_date
-        print(f"Registration renewed for truck {self.truck_id}")
+        for listener in self.expiry_listeners:
+            listener(self, 'registration_expiry')
+        emit(None, "Registration renewed for truck %s", self.truck_id)
     
     def assign_driver(self, driver) -> bool:
         """
@@ -174,24 +211,24 @@ class Truck(BaseModel):
         if isinstance(driver, str):
             # Legacy support - just store the driver_id
             if self.driver_id:
-                print(f"Truck {self.truck_id} already has driver {self.driver_id} assigned")
+                emit(None, "Truck %s already has driver %s assigned", self.truck_id, self.driver_id)
                 return False
             self.driver_id = driver
-            print(f"Driver {driver} assigned to truck {self.truck_id}")
+            emit(None, "Driver %s assigned to truck %s", driver, self.truck_id)
             return True
         
         # Handle Driver object
         if self.assigned_driver:
-            print(f"Truck {self.truck_id} already has driver {self.assigned_driver.driver_id} assigned")
+            emit(None, "Truck %s already has driver %s assigned", self.truck_id, self.assigned_driver.driver_id)
             return False
         
         # Check if driver is eligible and available
         if not driver.check_driving_eligibility():
-            print(f"Driver {driver.driver_id} is not eligible to drive")
+            emit(None, "Driver %s is not eligible to drive", driver.driver_id)
             return False
         
         if not driver.is_available:
-            print(f"Driver {driver.driver_id} is not available")
+            emit(None, "Driver %s is not available", driver.driver_id)
             return False
         
         # Assign driver to truck and truck to driver
@@ -206,8 +243,7 @@ class Truck(BaseModel):
             self.driver_id = ""
             return False
         
-        logger.info(f"Driver {driver.driver_id} ({driver.first_name} {driver.last_name}) assigned to truck {self.truck_id}")
-        print(f"Driver {driver.driver_id} ({driver.first_name} {driver.last_name}) assigned to truck {self.truck_id}")
+        emit(logging.INFO, "Driver %s (%s %s) assigned to truck %s", driver.driver_id, driver.first_name, driver.last_name, self.truck_id)
         return True
     
     def remove_driver(self) -> bool:
@@ -218,7 +254,7 @@ class Truck(BaseModel):
             bool: True if successful, False otherwise
         """
         if not self.driver_id and not self.assigned_driver:
-            print(f"No driver assigned to truck {self.truck_id}")
+            emit(None, "No driver assigned to truck %s", self.truck_id)
             return False
         
         old_driver_id = self.driver_id
@@ -233,8 +269,7 @@ class Truck(BaseModel):
         # Clear truck-side assignment
         self.driver_id = ""
         
-        logger.info(f"Driver {old_driver_id}{old_driver_name} removed from truck {self.truck_id}")
-        print(f"Driver {old_driver_id}{old_driver_name} removed from truck {self.truck_id}")
+        emit(logging.INFO, "Driver %s%s removed from truck %s", old_driver_id, old_driver_name, self.truck_id)
         return True
     
     def attach_trailer(self, trailer) -> bool:
@@ -251,25 +286,25 @@ class Truck(BaseModel):
         if isinstance(trailer, str):
             # Legacy support - just store the trailer_id
             if self.attached_trailer_id:
-                print(f"Truck {self.truck_id} already has trailer {self.attached_trailer_id} attached")
+                emit(None, "Truck %s already has trailer %s attached", self.truck_id, self.attached_trailer_id)
                 return False
             self.attached_trailer_id = trailer
-            print(f"Trailer {trailer} attached to truck {self.truck_id}")
+            emit(None, "Trailer %s attached to truck %s", trailer, self.truck_id)
             return True
         
         # Handle Trailer object
         if self.attached_trailer:
-            print(f"Truck {self.truck_id} already has trailer {self.attached_trailer.trailer_id} attached")
+            emit(None, "Truck %s already has trailer %s attached", self.truck_id, self.attached_trailer.trailer_id)
             return False
         
         # Check if trailer is in working condition
         if not trailer.is_working_condition:
-            print(f"Trailer {trailer.trailer_id} is not in working condition")
+            emit(None, "Trailer %s is not in working condition", trailer.trailer_id)
             return False
         
         # Check if trailer is already attached to another truck
         if trailer.attached_truck_id:
-            print(f"Trailer {trailer.trailer_id} is already attached to truck {trailer.attached_truck_id}")
+            emit(None, "Trailer %s is already attached to truck %s", trailer.trailer_id, trailer.attached_truck_id)
             return False
         
         # Attach trailer to truck and truck to trailer
@@ -284,8 +319,7 @@ class Truck(BaseModel):
             self.attached_trailer_id = ""
             return False
         
-        logger.info(f"Trailer {trailer.trailer_id} ({trailer.year} {trailer.make} {trailer.model}) attached to truck {self.truck_id}")
-        print(f"Trailer {trailer.trailer_id} ({trailer.year} {trailer.make} {trailer.model}) attached to truck {self.truck_id}")
+        emit(logging.INFO, "Trailer %s (%s %s %s) attached to truck %s", trailer.trailer_id, trailer.year, trailer.make, trailer.model, self.truck_id)
         return True
     
     def attach_container(self) -> bool:
@@ -296,16 +330,15 @@ class Truck(BaseModel):
             bool: True if successful, False otherwise
         """
         if not self.attached_trailer:
-            print(f"Cannot attach container - no trailer attached to truck {self.truck_id}")
+            emit(None, "Cannot attach container - no trailer attached to truck %s", self.truck_id)
             return False
         
         if self.has_container:
-            print(f"Truck {self.truck_id} already has a container attached")
+            emit(None, "Truck %s already has a container attached", self.truck_id)
             return False
         
         self.has_container = True
-        logger.info(f"Container attached to truck {self.truck_id} via trailer {self.attached_trailer.trailer_id}")
-        print(f"Container attached to truck {self.truck_id} via trailer {self.attached_trailer.trailer_id}")
+        emit(logging.INFO, "Container attached to truck %s via trailer %s", self.truck_id, self.attached_trailer.trailer_id)
         return True
     
     def detach_trailer(self) -> bool:
@@ -316,7 +349,7 @@ class Truck(BaseModel):
             bool: True if successful, False otherwise
         """
         if not self.attached_trailer_id and not self.attached_trailer:
-            print(f"No trailer attached to truck {self.truck_id}")
+            emit(None, "No trailer attached to truck %s", self.truck_id)
             return False
         
         old_trailer_id = self.attached_trailer_id
@@ -334,9 +367,9 @@ class Truck(BaseModel):
         # Remove container if one was attached
         if self.has_container:
             self.has_container = False
-            print(f"Container removed due to trailer detachment")
+            emit(None, "Container removed due to trailer detachment")
         
-        print(f"Trailer {old_trailer_id}{old_trailer_name} detached from truck {self.truck_id}")
+        emit(None, "Trailer %s%s detached from truck %s", old_trailer_id, old_trailer_name, self.truck_id)
         return True
     
     def remove_container(self) -> bool:
@@ -347,12 +380,12 @@ class Truck(BaseModel):
             bool: True if successful, False otherwise
         """
         if not self.has_container:
-            print(f"Truck {self.truck_id} has no container to remove")
+            emit(None, "Truck %s has no container to remove", self.truck_id)
             return False
         
         self.has_container = False
         trailer_info = f" from trailer {self.attached_trailer.trailer_id}" if self.attached_trailer else ""
-        print(f"Container removed from truck {self.truck_id}{trailer_info}")
+        emit(None, "Container removed from truck %s%s", self.truck_id, trailer_info)
         return True
     
     def load_cargo(self, weight: float) -> bool:
@@ -366,15 +399,15 @@ class Truck(BaseModel):
             bool: True if successful, False if exceeds capacity
         """
         if weight < 0:
-            print(f"Cannot load {weight} units. Weight cannot be negative")
+            emit(None, "Cannot load %s units. Weight cannot be negative", weight)
             return False
         
         if weight > self.max_capacity:
-            print(f"Cannot load {weight} units. Exceeds max capacity of {self.max_capacity}")
+            emit(None, "Cannot load %s units. Exceeds max capacity of %s", weight, self.max_capacity)
             return False
         
         # TODO: Implement current cargo tracking
-        print(f"Loaded {weight} units of cargo onto truck {self.truck_id}")
+        emit(None, "Loaded %s units of cargo onto truck %s", weight, self.truck_id)
         return True
     
     def unload_cargo(self) -> None:
@@ -382,15 +415,25 @@ class Truck(BaseModel):
         Unload all cargo from the truck.
         """
         # TODO: Implement current cargo tracking
-        print(f"All cargo unloaded from truck {self.truck_id}")
+        emit(None, "All cargo unloaded from truck %s", self.truck_id)
     
     def get_truck_info(self) -> dict:
         """
         Get comprehensive information about the truck.
         
+        The result is cached until the truck, its assigned driver or attached
+        trailer changes, or the date rolls over (registration validity).
+        
         Returns:
             dict: Dictionary containing all truck information
         """
+        driver_key = linked_version(self.assigned_driver)
+        trailer_key = linked_version(self.attached_trailer)
+        if driver_key is None or trailer_key is None:
+            return self._build_truck_info()
+        return self._memoized((date.today(), driver_key, trailer_key), self._build_truck_info)
+    
+    def _build_truck_info(self) -> dict:
         # Get driver info
         driver_info = {}
         if self.assigned_driver:
@@ -444,7 +487,7 @@ class Truck(BaseModel):
         Schedule maintenance for the truck.
         """
         # TODO: Implement maintenance scheduling system
-        print(f"Maintenance scheduled for truck {self.truck_id}")
+        emit(None, "Maintenance scheduled for truck %s", self.truck_id)
     
     def update_location(self, new_location: str) -> None:
         """
@@ -455,8 +498,40 @@ class Truck(BaseModel):
         """
         old_location = self.location
         self.location = new_location
-        logger.info(f"Truck {self.truck_id} location updated from '{old_location}' to '{new_location}'")
-        print(f"Truck {self.truck_id} location updated from '{old_location}' to '{new_location}'")
+        for listener in self.location_listeners:
+            listener(self, old_location, new_location)
+        emit(logging.INFO, "Truck %s location updated from '%s' to '%s'", self.truck_id, old_location, new_location)
+    
+    def to_record(self) -> dict:
+        """
+        Get the truck's persisted attributes as a plain dict.
+        
+        Returns:
+            dict: Attribute name to value for every field in RECORD_FIELDS
+        """
+        return {field: getattr(self, field) for field in self.RECORD_FIELDS}
+    
+    @classmethod
+    def from_record(cls, record: dict) -> "Truck":
+        """
+        Rebuild a truck from a dict produced by to_record, without re-running __init__.
+        
+        The assigned_driver and attached_trailer object links start out empty;
+        the caller is responsible for relinking them from driver_id and
+        attached_trailer_id.
+        
+        Args:
+            record (dict): Persisted truck attributes
+            
+        Returns:
+            Truck: The restored truck
+        """
+        truck = cls.__new__(cls)
+        for field in cls.RECORD_FIELDS:
+            setattr(truck, field, record[field] if field in record else cls.RECORD_DEFAULTS[field])
+        truck.assigned_driver = None
+        truck.attached_trailer = None
+        return truck
     
     def __str__(self) -> str:
         """
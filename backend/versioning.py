@@ -0,0 +1,63 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class Versioned:
+    """
+    Mixin that counts attribute assignments on an entity.
+
+    Every assignment to a public attribute bumps the instance's mutation
+    version, so derived views (status dicts, reports) can be cached and reused
+    until the entity actually changes. Private attributes (leading underscore)
+    are bookkeeping and do not count as mutations.
+
+    Declares its bookkeeping as slots so subclasses can be fully slotted.
+    """
+
+    __slots__ = ('_version', '_derived_cache')
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+
+    @property
+    def version(self) -> int:
+        """Number of attribute assignments made on this entity so far."""
+        return getattr(self, '_version', 0)
+
+    def _memoized(self, dependencies: Tuple[Any, ...], compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return a copy of a cached derived dict, recomputing it when the
+        entity's version or any of the extra dependencies has changed.
+
+        Args:
+            dependencies (tuple): Extra cache key parts (e.g. today's date)
+            compute: Builds the derived dict
+
+        Returns:
+            dict: The derived dict
+        """
+        key = (self.version,) + dependencies
+        cached = getattr(self, '_derived_cache', None)
+        if cached is None or cached[0] != key:
+            cached = (key, compute())
+            object.__setattr__(self, '_derived_cache', cached)
+        return dict(cached[1])
+
+
+def linked_version(obj: Any) -> Optional[Tuple[int, int]]:
+    """
+    Get a cache key part for an object linked to an entity (e.g. a truck's driver).
+
+    Args:
+        obj: Linked object, or None
+
+    Returns:
+        tuple: (identity, version) for a Versioned object, () when there is no
+        link, or None when the object cannot be tracked and callers must not cache
+    """
+    if obj is None:
+        return ()
+    if isinstance(obj, Versioned):
+        return (id(obj), obj.version)
+    return None